@@ -1,10 +1,11 @@
 # src/application/services/excel_service.py
 # # -*- coding: utf-8 -*-
 
+from application.services.output_service import OutputService
 from domain.repositories.i_excel_repository import IExcelRepository
 
 
-class ExcelService:
+class ExcelService(OutputService):
     """
     ExcelService is a service class that provides functionality to save DataFrames to Excel files.
     It uses an instance of IExcelRepository to perform the actual saving.
@@ -16,6 +17,7 @@ class ExcelService:
 
         :param excel_repository: An instance of IExcelRepository.
         """
+        super().__init__(excel_repository)
         self._excel_repository = excel_repository
 
     def save_df_to_excel(self, df, sheet_name: str, index: bool) -> None:
@@ -26,4 +28,4 @@ class ExcelService:
         :param sheet_name: The name of the sheet in the Excel file.
         :param index: Whether to include the DataFrame index in the Excel file.
         """
-        self._excel_repository.save_df_to_excel(df, sheet_name, index)
\ No newline at end of file
+        self._excel_repository.save_df_to_excel(df, sheet_name, index)
@@ -0,0 +1,57 @@
+# src/application/services/output_service.py
+# # -*- coding: utf-8 -*-
+
+from domain.repositories.i_output_repository import IOutputRepository
+
+
+class OutputService:
+    """
+    OutputService is a service class that provides functionality to save DataFrames to an output sink.
+    It uses an instance of IOutputRepository (Excel, Parquet, Arrow IPC, CSV, ...) to perform the actual saving.
+    """
+
+    def __init__(self, output_repository: IOutputRepository) -> None:
+        """
+        Initialize the OutputService with an instance of IOutputRepository.
+
+        :param output_repository: An instance of IOutputRepository.
+        """
+        self._output_repository = output_repository
+        self._closed = False
+
+    @property
+    def durable_writes(self) -> bool:
+        """
+        Whether saved DataFrames are on disk before close() is called.
+        """
+        return self._output_repository.durable_writes
+
+    def save_df(self, df, name: str, index: bool) -> None:
+        """
+        Save a DataFrame to the partition of the given name.
+
+        :param df: The DataFrame to save.
+        :param name: The name of the partition (sheet, file) to write to.
+        :param index: Whether to include the DataFrame index in the output.
+        """
+        self._output_repository.save_df(df, name, index)
+
+    def close(self) -> None:
+        """
+        Flush and close the output. Calling it again does nothing, so that ScrapingService can flush the output
+        before recording a checkpoint and main() can still close it unconditionally.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._output_repository.close()
+
+    def discard(self) -> None:
+        """
+        Close the output without flushing what has not been written yet, see IOutputRepository.discard.
+        Calling close() afterwards does nothing.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._output_repository.discard()
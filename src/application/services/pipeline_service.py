@@ -0,0 +1,286 @@
+# src/application/services/pipeline_service.py
+# -*- coding: utf-8 -*-
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from application.services.output_service import OutputService
+from domain.entities.category import Category
+from domain.entities.product import Product
+from infrastructure.metrics.metrics_registry import METRICS
+from infrastructure.pipeline.stage_pipeline import Emit, PipelineCancelled, Stage, StagePipeline
+from settings import logger, CHECKPOINT_PATH, INCREMENTAL_STATE_PATH, OUTPUT_BATCH_SIZE, PIPELINE_FETCH_WORKERS, PIPELINE_FRAME_WORKERS, PIPELINE_MAX_PENDING_CATEGORIES, PIPELINE_PARSE_WORKERS, PIPELINE_QUEUE_SIZE, SCRAPER_ADAPTIVE_RATE, SCRAPER_HTTP2, SCRAPER_ENGINE, SCRAPER_PARSE_PROCESSES, SCRAPER_PARSER, SCRAPER_REQUESTS_PER_SECOND, SCRAPER_SHARED_PRODUCTS
+
+
+@dataclass
+class _DetailPage:
+    """
+    A product detail page travelling through the fetch and parse stages.
+    """
+    url: str
+    content: bytes | None = None
+
+
+@dataclass
+class _ParsedProduct:
+    url: str
+    product: Product
+
+
+@dataclass
+class _CategoryItem:
+    """
+    A category whose listing pages have been read, with the detail URLs of its products in listing order.
+    It passes the fetch and parse stages untouched, and is completed by the collect stage once all its products are parsed.
+    """
+    index: int
+    category: Category
+    urls: list[str] = field(default_factory=list)
+    frame: Any = None
+
+
+class _PipelineRun:
+    """
+    The state of one PipelineService.scrape_and_save() run, and the functions of its stages.
+    """
+    def __init__(self, service: "PipelineService", context: Any) -> None:
+        self._service = service
+        self._context = context
+        self.pending = threading.Semaphore(max(1, service.max_pending_categories))
+        self.pipeline: StagePipeline | None = None
+        # listingとcollectの両ステージが触る状態（複数のカテゴリに載っている商品は一度だけ取得する）
+        self._lock = threading.Lock()
+        # 一覧に載ったが、まだ書き出すカテゴリに加えていない回数
+        self._needed: dict[str, int] = {}
+        # 取得を依頼して、まだcollectに届いていない詳細ページ
+        self._fetching: set[str] = set()
+        # 待っているカテゴリがある商品
+        self._products: dict[str, Product] = {}
+        # どのカテゴリも待っていない商品（後のカテゴリのために、最近のものだけ上限まで残す）
+        self._recent: OrderedDict[str, Product] = OrderedDict()
+        # collectステージだけが触る状態
+        self._waiting: dict[str, list[_CategoryItem]] = {}
+        self._missing: dict[int, int] = {}
+        # writeステージだけが触る状態
+        self._ready: dict[int, _CategoryItem] = {}
+        self._next_index = 0
+
+
+    def listing(self, item: tuple[int, Category], emit: Emit) -> None:
+        from infrastructure.scraping import scraper
+
+        index, category = item
+        # 書き込まれていないカテゴリが多すぎる間は次のカテゴリに進まない
+        self.pipeline.acquire(self.pending)  # type: ignore
+        category_item = _CategoryItem(index, category)
+        try:
+            for page in scraper._iter_listing_pages(self._context, category.link):
+                category.set_link(page.url)
+                logger.debug(f"Listing page: {page.url}")
+                for url in page.detail_urls:
+                    category_item.urls.append(url)
+                    if self._need(url):
+                        emit(_DetailPage(url))
+        except PipelineCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"Error occurred while getting product data: {e}", exc_info=True)
+        emit(category_item)
+
+
+    def _need(self, url: str) -> bool:
+        """
+        Record that a listed category needs the product of `url`, and return whether its page must be fetched.
+        """
+        with self._lock:
+            self._needed[url] = self._needed.get(url, 0) + 1
+            if url in self._products or url in self._fetching:
+                return False
+            if (product := self._recent.pop(url, None)) is not None:
+                self._products[url] = product
+                return False
+            self._fetching.add(url)
+            return True
+
+
+    def fetch(self, item: Any, emit: Emit) -> None:
+        from infrastructure.scraping.get_soup import fetch_content
+
+        if isinstance(item, _DetailPage):
+            context = self._context
+            try:
+                if context.retry_scheduler is not None:
+                    item.content = context.retry_scheduler.submit(fetch_content, item.url, context.session, 5, context.rate_limiter).result()
+                else:
+                    item.content = fetch_content(item.url, context.session, timeout=5, rate_limiter=context.rate_limiter)
+            except Exception as e:
+                logger.error(f"Error occurred while getting product details: {e}", exc_info=True)
+        emit(item)
+
+
+    def parse(self, item: Any, emit: Emit) -> None:
+        from infrastructure.scraping.scraper import parse_product_fields
+
+        if isinstance(item, _DetailPage):
+            context = self._context
+            if context.parse_pool is not None and item.content is not None:
+                fields = context.parse_pool.submit(parse_product_fields, item.content, item.url, context.parser).result()
+            else:
+                fields = parse_product_fields(item.content, item.url, context.parser)
+            item = _ParsedProduct(item.url, Product.from_fields(fields))
+        emit(item)
+
+
+    def collect(self, item: Any, emit: Emit) -> None:
+        # 商品とカテゴリは別々の順で届くので、カテゴリの全商品が揃ったところで次へ渡す
+        if isinstance(item, _ParsedProduct):
+            with self._lock:
+                self._fetching.discard(item.url)
+                self._products[item.url] = item.product
+            for category_item in self._waiting.pop(item.url, []):
+                self._missing[category_item.index] -= 1
+                if self._missing[category_item.index] == 0:
+                    del self._missing[category_item.index]
+                    self._complete(category_item, emit)
+            return
+
+        with self._lock:
+            remaining = {url for url in item.urls if url not in self._products}
+        if not remaining:
+            self._complete(item, emit)
+            return
+        self._missing[item.index] = len(remaining)
+        for url in remaining:
+            self._waiting.setdefault(url, []).append(item)
+
+
+    def _complete(self, item: _CategoryItem, emit: Emit) -> None:
+        with self._lock:
+            for url in item.urls:
+                item.category.add_product(self._products[url])
+            # どのカテゴリも待っていない商品は手放し、最近のものだけ残す
+            for url in item.urls:
+                self._needed[url] -= 1
+                if self._needed[url] == 0:
+                    del self._needed[url]
+                    self._recent[url] = self._products.pop(url)
+            while len(self._recent) > self._service.shared_products:
+                self._recent.popitem(last=False)
+        METRICS.count("products", len(item.urls), category=item.category.name)
+        emit(item)
+
+
+    def frame(self, item: _CategoryItem, emit: Emit) -> None:
+        from domain.services.category2df import create_dataframe_from_category
+
+        with METRICS.timer("dataframe", category=item.category.name):
+            item.frame = create_dataframe_from_category(item.category)
+        emit(item)
+
+
+    def write(self, item: _CategoryItem, emit: Emit) -> None:
+        # DataFrameは作られた順ではなく、カテゴリの順に書き込む
+        self._ready[item.index] = item
+        while (ready := self._ready.pop(self._next_index, None)) is not None:
+            with METRICS.timer("write", category=ready.category.name):
+                self._service.output_service.save_df(ready.frame, ready.category.name, index=False)
+            ready.frame = None
+            self._next_index += 1
+            self.pending.release()
+
+
+class PipelineService:
+    """
+    PipelineService scrapes the categories and saves one DataFrame per category like ScrapingService,
+    but as a pipeline of stages connected by bounded queues, each running on its own threads:
+    listing pages, fetching detail pages, parsing them, collecting the products of each category,
+    building the DataFrames and writing them. The network keeps fetching while earlier categories are built and written,
+    so the total time approaches that of the slowest stage instead of the sum of all of them.
+    The categories are written in the order of the site, and a failure in any stage stops the others and is raised.
+    A product is kept only while a listed category still waits for it, plus the `shared_products` most recent ones,
+    so that books listed in several categories are usually fetched once without keeping every product of the run.
+    Only the sync engine is supported, without checkpoints, the incremental mode or streaming output (OUTPUT_BATCH_SIZE);
+    the page archive (PAGE_ARCHIVE_PATH) records and replays through the shared session like ScrapingService.
+    """
+
+    def __init__(
+        self,
+        output_service: OutputService,
+        fetch_workers: int = PIPELINE_FETCH_WORKERS,
+        parse_workers: int = PIPELINE_PARSE_WORKERS,
+        frame_workers: int = PIPELINE_FRAME_WORKERS,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        max_pending_categories: int = PIPELINE_MAX_PENDING_CATEGORIES,
+        requests_per_second: float = SCRAPER_REQUESTS_PER_SECOND,
+        parse_processes: int = SCRAPER_PARSE_PROCESSES,
+        shared_products: int = SCRAPER_SHARED_PRODUCTS,
+        engine: str = SCRAPER_ENGINE,
+        checkpoint_path: str = CHECKPOINT_PATH,
+        state_path: str = INCREMENTAL_STATE_PATH,
+        batch_size: int = OUTPUT_BATCH_SIZE,
+    ) -> None:
+        """
+        Initialize the PipelineService with an instance of OutputService.
+
+        :param output_service: An instance of OutputService, e.g. ExcelService.
+        :param fetch_workers: Number of threads fetching product detail pages.
+        :param parse_workers: Number of threads parsing them. With `parse_processes`, each thread hands its pages to the process pool.
+        :param frame_workers: Number of threads building the DataFrames.
+        :param queue_size: The maximum number of items waiting between two stages.
+            A full queue blocks the stage in front of it, so that a slow stage holds back the others.
+        :param max_pending_categories: The maximum number of categories read from the listing pages but not written yet.
+        :param requests_per_second: Politeness budget per host in requests per second. 0 or less disables it.
+        :param parse_processes: Number of worker processes parsing product detail pages. 0 parses them on the parse threads.
+        :param shared_products: Number of products no listed category waits for that are kept, most recent first,
+            for categories listed later. 0 fetches a book again unless a pending category already waits for it.
+        :param engine, checkpoint_path, state_path, batch_size: The settings of ScrapingService that the pipeline
+            does not support. They are checked so that a run does not silently ignore them.
+        """
+        if min(fetch_workers, parse_workers, frame_workers, queue_size, max_pending_categories) < 1:
+            raise ValueError("The pipeline needs at least one worker, one queue slot and one pending category.")
+        if engine != "sync":
+            raise ValueError(f"The pipeline only supports the sync engine, not {engine}.")
+        if checkpoint_path:
+            raise ValueError("Checkpoints are not supported by the pipeline.")
+        if state_path:
+            raise ValueError("The incremental mode is not supported by the pipeline.")
+        if batch_size > 0:
+            raise ValueError("Streaming output is not supported by the pipeline.")
+        self.output_service = output_service
+        self.fetch_workers = fetch_workers
+        self.parse_workers = parse_workers
+        self.frame_workers = frame_workers
+        self.queue_size = queue_size
+        self.max_pending_categories = max_pending_categories
+        self.requests_per_second = requests_per_second
+        self.parse_processes = parse_processes
+        self.shared_products = max(0, shared_products)
+
+
+    def scrape_and_save(self) -> None:
+        """
+        Scrape data and save it to the output sink, running the stages concurrently.
+
+        :raises: The first error raised by a stage, once every stage has stopped.
+        """
+        from infrastructure.scraping import scraper
+
+        context = scraper._create_context(self.fetch_workers, self.requests_per_second, self.parse_processes, SCRAPER_PARSER, "", None, SCRAPER_ADAPTIVE_RATE, SCRAPER_HTTP2)
+        # 取得済みの商品はパイプラインのcollectステージが保持する
+        context.products = None
+        try:
+            categories = scraper._get_category_data(context.session, scraper.BASE_URL + "index.html", context.rate_limiter, context.retry_scheduler)
+            run = _PipelineRun(self, context)
+            run.pipeline = StagePipeline([
+                Stage("listing", run.listing, 1),
+                Stage("fetch", run.fetch, self.fetch_workers),
+                Stage("parse", run.parse, self.parse_workers),
+                Stage("collect", run.collect, 1),
+                Stage("frame", run.frame, self.frame_workers),
+                Stage("write", run.write, 1),
+            ], queue_size=self.queue_size)
+            run.pipeline.run(enumerate(categories))
+        finally:
+            scraper._close_context(context)
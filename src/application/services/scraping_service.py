@@ -1,32 +1,150 @@
 # src/application/services/scraping_service.py
 # -*- coding: utf-8 -*-
 
-from application.services.excel_service import ExcelService
-from domain.services.category2df import create_dataframe_from_category
-from infrastructure.scraping.scraper import scrape_data
+import time
+
+from application.services.output_service import OutputService
+from domain.entities.category import Category
+from infrastructure.metrics.metrics_registry import METRICS
+from infrastructure.scraping.crawl_checkpoint import CrawlCheckpoint
+from settings import CHECKPOINT_PATH, OUTPUT_BATCH_SIZE, PAGE_ARCHIVE_PATH, SCRAPER_ENGINE
 
 
 class ScrapingService:
     """
-    ScrapingService is responsible for scraping data and saving it to an Excel file.
-    It uses the ExcelService to save DataFrames to Excel files.
+    ScrapingService is responsible for scraping data and saving it to an output sink.
+    It uses the OutputService (or ExcelService) to save one DataFrame per category.
+    The scraping engines and pandas are imported when scraping starts, so that creating the service is cheap.
     """
 
-    def __init__(self, excel_service: ExcelService) -> None:
+    def __init__(self, output_service: OutputService, engine: str = SCRAPER_ENGINE, checkpoint_path: str = CHECKPOINT_PATH, batch_size: int = OUTPUT_BATCH_SIZE) -> None:
         """
-        Initialize the ScrapingService with an instance of ExcelService.
+        Initialize the ScrapingService with an instance of OutputService.
 
-        :param excel_service: An instance of ExcelService.
+        :param output_service: An instance of OutputService, e.g. ExcelService.
+        :param engine: The scraping engine to use, "sync" (requests), "async" (asyncio),
+            "frontier" (crawl frontier, fetches books listed in several categories once)
+            or "sharded" (categories scraped by several worker processes, see SCRAPER_SHARD_PROCESSES).
+        :param checkpoint_path: The checkpoint journal that makes an interrupted run resumable. Empty disables it.
+        :param batch_size: Write the products in chunks of this size as they are scraped, so that memory use does not
+            grow with the size of a category. 0 writes one DataFrame per category. Only supported by the sync engine.
         """
-        self._excel_service = excel_service
+        if engine not in ("sync", "async", "frontier", "sharded"):
+            raise ValueError(f"Unknown scraping engine: {engine}")
+        if engine != "sync" and checkpoint_path:
+            raise ValueError("Checkpoints are only supported by the sync engine.")
+        if engine == "async" and PAGE_ARCHIVE_PATH:
+            raise ValueError("The page archive is not supported by the async engine.")
+        if batch_size > 0 and (engine != "sync" or checkpoint_path):
+            raise ValueError("Streaming output is only supported by the sync engine without a checkpoint.")
+        self._output_service = output_service
+        self._engine = engine
+        self._checkpoint_path = checkpoint_path
+        self._batch_size = batch_size
 
 
     def scrape_and_save(self) -> None:
         """
-        Scrape data and save it to an Excel file.
+        Scrape data and save it to the output sink.
+        With a checkpoint journal, each category is marked as done once it is on disk,
+        and the journal is cleared after the whole run has completed.
+        Outputs that are only written by close() are closed when the run ends or is interrupted, see _close_checkpoint.
+        The scrape, DataFrame and write time of every category is recorded in METRICS.
+        """
+        if self._batch_size > 0:
+            self._stream_and_save()
+            return
+
+        from domain.services.category2df import create_dataframe_from_category
+
+        checkpoint = CrawlCheckpoint(self._checkpoint_path) if self._checkpoint_path else None
+        if self._engine == "async":
+            # aiohttpはasyncエンジンを使う場合のみ必要
+            from infrastructure.scraping.async_scraper import scrape_data_async
+            categories = scrape_data_async()
+        elif self._engine == "frontier":
+            from infrastructure.scraping.frontier_scraper import scrape_data_frontier
+            categories = scrape_data_frontier()
+        elif self._engine == "sharded":
+            from infrastructure.scraping.sharded_scraper import scrape_data_sharded
+            categories = scrape_data_sharded()
+        else:
+            from infrastructure.scraping.scraper import scrape_data
+            categories = scrape_data(checkpoint=checkpoint)
+
+        # close()するまで書き込まれない出力先では、完了の記録をclose()の後まで保留する
+        pending: list[Category] = []
+        completed = False
+        # save_df()の途中で中断されたか（書きかけのカテゴリを出力に残さないため）
+        writing = False
+        try:
+            while True:
+                started = time.perf_counter()
+                if (category := next(categories, None)) is None:
+                    break
+                METRICS.observe("scrape_category", time.perf_counter() - started, category=category.name)
+                METRICS.count("products", len(category.products), category=category.name)
+
+                with METRICS.timer("dataframe", category=category.name):
+                    df = create_dataframe_from_category(category)
+                writing = True
+                with METRICS.timer("write", category=category.name):
+                    self._output_service.save_df(df, category.name, index=False)
+                writing = False
+                if checkpoint is not None:
+                    if self._output_service.durable_writes:
+                        checkpoint.mark_category_done(category)
+                    else:
+                        pending.append(category)
+            completed = True
+        finally:
+            if checkpoint is not None:
+                self._close_checkpoint(checkpoint, pending, completed, writing)
+
+
+    def _close_checkpoint(self, checkpoint: CrawlCheckpoint, pending: list[Category], completed: bool, writing: bool = False) -> None:
+        """
+        Flush the categories saved to a non-durable output and mark them as done, then clear the journal after a completed run,
+        or keep it for the next run after an interrupted one.
+        An interrupted run is flushed too, because main() closes the output anyway: the categories in the flushed file
+        must be marked as done, or the next run would scrape them again and append them a second time.
+        When the run was interrupted inside save_df(), the output holds part of a category that is not marked as done,
+        so nothing is flushed: the output is discarded, and the next run scrapes the pending categories again.
         """
-        categories = scrape_data()
-        while (category := next(categories, None)) is not None:
-            df = create_dataframe_from_category(category)
-            sheet_name = category.name
-            self._excel_service.save_df_to_excel(df, sheet_name, index=False)
+        try:
+            if writing and not self._output_service.durable_writes:
+                # 書きかけのカテゴリを含む出力は書き出さない（再開時に同じ行が重複する）
+                self._output_service.discard()
+            elif pending:
+                self._output_service.close()
+                for category in pending:
+                    checkpoint.mark_category_done(category)
+        except BaseException:
+            checkpoint.close()
+            raise
+        if completed:
+            checkpoint.finish()
+        else:
+            checkpoint.close()
+
+
+    def _stream_and_save(self) -> None:
+        """
+        Scrape the products in batches and append each batch to the sheet (or file) of its category.
+        A category without any product is still written once, as an empty DataFrame.
+        """
+        from domain.services.category2df import create_dataframe_from_products
+        from infrastructure.scraping.scraper import scrape_product_batches
+
+        written = False
+        for batch in scrape_product_batches(self._batch_size):
+            name = batch.category.name
+            if batch.products or (batch.last and not written):
+                with METRICS.timer("dataframe", category=name):
+                    df = create_dataframe_from_products(batch.products)
+                with METRICS.timer("write", category=name):
+                    self._output_service.save_df(df, name, index=False)
+                written = True
+            METRICS.count("products", len(batch.products), category=name)
+            if batch.last:
+                written = False
@@ -0,0 +1,67 @@
+# src/benchmark/bench_dataframe.py
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark of the DataFrame construction of a category.
+
+Compares building the DataFrame from one to_dict() per product with building it from the Product objects
+column by column, as create_dataframe_from_category does. Run it from the src directory:
+
+    python -m benchmark.bench_dataframe --sizes 10000 100000
+"""
+
+import argparse
+import time
+from typing import Callable
+
+import pandas as pd
+
+from domain.entities.category import Category
+from domain.entities.product import Product
+from domain.services.category2df import create_dataframe_from_category, create_dataframe_from_products
+
+
+def _make_products(count: int) -> list[Product]:
+    ratings = ("One", "Two", "Three", "Four", "Five")
+    products = []
+    for i in range(count):
+        stock = f"In stock ({i % 23} available)" if i % 23 else "Out of stock"
+        products.append(Product.new(
+            str(i), f"Book {i}", f"{i:016x}", "Books", f"£{i / 20:.2f}", f"£{i / 20:.2f}", "£0.00",
+            stock, str(i % 7), ratings[i % 5], f"Description of book {i}", f"https://books.toscrape.com/catalogue/book_{i}/index.html"
+        ))
+    return products
+
+
+def _best_of(repeat: int, function: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000], help="numbers of products")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, the best is reported")
+    args = parser.parse_args(argv)
+
+    for size in args.sizes:
+        products = _make_products(size)
+        category = Category.new(id=1, name="bench", link="")
+        for product in products:
+            category.add_product(product)
+
+        to_dict = _best_of(args.repeat, lambda: pd.DataFrame([product.to_dict() for product in products]))
+        per_column = _best_of(args.repeat, lambda: create_dataframe_from_products(products))
+        categorical = _best_of(args.repeat, lambda: create_dataframe_from_category(category))
+
+        print(f"{size} products:")
+        print(f"  to_dict() per row        {to_dict * 1000:9.1f} ms")
+        print(f"  columns from Products    {per_column * 1000:9.1f} ms  ({to_dict / per_column:.1f}x)")
+        print(f"  with categorical columns {categorical * 1000:9.1f} ms  ({to_dict / categorical:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# src/benchmark/bench_startup.py
+# -*- coding: utf-8 -*-
+"""
+Startup benchmark: measure the import time of a module (main by default) in fresh interpreters with -X importtime,
+and check that the heavy dependencies are not imported at startup. Run it from the src directory:
+
+    python -m benchmark.bench_startup --repeat 5 --max-ms 150
+
+It exits with status 1 if the best import time exceeds --max-ms or if a module of --forbid has been imported,
+so that it can guard against startup regressions in CI.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+
+# 起動時に読み込まれるべきでない重い依存ライブラリ
+HEAVY_MODULES: tuple[str, ...] = ("pandas", "numpy", "openpyxl", "pyarrow", "lxml", "bs4", "requests", "aiohttp", "httpx", "yaml")
+
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def measure(module: str) -> dict[str, int]:
+    """
+    Import `module` in a new interpreter and return the cumulative import time (us) of every module imported by it.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+    cumulative: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        cumulative[name] = int(match.group(2))
+        if not match.group(3):
+            if name == module:
+                break
+            # インタプリタ自体の起動（siteなど）の分は除く
+            cumulative.clear()
+    return cumulative
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main", help="module to import")
+    parser.add_argument("--repeat", type=int, default=5, help="runs, the best is reported")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument("--max-ms", type=float, default=0.0, help="fail if the import takes longer, 0 to disable")
+    parser.add_argument("--forbid", nargs="*", default=list(HEAVY_MODULES), help="modules that must not be imported")
+    args = parser.parse_args(argv)
+
+    runs = [measure(args.module) for _ in range(max(1, args.repeat))]
+    best = min(runs, key=lambda run: run.get(args.module, 0))
+    total_ms = best.get(args.module, 0) / 1000
+
+    print(f"import {args.module}: {total_ms:.1f} ms (best of {len(runs)})")
+    for name, us in sorted(best.items(), key=lambda item: item[1], reverse=True)[1:args.top + 1]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    imported = [name for name in args.forbid if name in best]
+    if imported:
+        print(f"Heavy modules imported at startup: {', '.join(imported)}")
+        failed = True
+    if args.max_ms > 0 and total_ms > args.max_ms:
+        print(f"Startup budget exceeded: {total_ms:.1f} ms > {args.max_ms:.1f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+# src/benchmark/replica_server.py
+# -*- coding: utf-8 -*-
+
+import hashlib
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+STAR_WORDS: tuple[str, ...] = ("One", "Two", "Three", "Four", "Five")
+
+
+@dataclass
+class ReplicaSite:
+    """
+    A generated copy of books.toscrape.com with the same page structure, served by ReplicaServer.
+    Every category has `pages` listing pages of `page_size` products.
+    """
+    categories: int = 5
+    pages: int = 3
+    page_size: int = 20
+    description_length: int = 800
+
+    def __post_init__(self) -> None:
+        self._category_names = [f"Category {i + 1}" for i in range(self.categories)]
+        self._products_per_category = self.pages * self.page_size
+
+    @property
+    def product_count(self) -> int:
+        return self.categories * self._products_per_category
+
+    @staticmethod
+    def _slug(name: str) -> str:
+        return name.lower().replace(" ", "-")
+
+    def _category_id(self, index: int) -> int:
+        # 本物のサイトと同様、"Books"が1なのでカテゴリは2から
+        return index + 2
+
+    def _product_id(self, category_index: int, position: int) -> int:
+        return 1000 + category_index * self._products_per_category + position
+
+    def index_page(self) -> str:
+        items = "".join(
+            f'<li>\n<a href="catalogue/category/books/{self._slug(name)}_{self._category_id(i)}/index.html">\n    {name}\n</a>\n</li>'
+            for i, name in enumerate(self._category_names)
+        )
+        return (
+            '<html><head><title>All products | Books to Scrape - Sandbox</title></head><body>'
+            '<div class="side_categories"><ul class="nav nav-list"><li>'
+            f'<a href="catalogue/category/books_1/index.html">Books</a><ul>{items}</ul>'
+            '</li></ul></div></body></html>'
+        )
+
+    def listing_page(self, category_id: int, page: int) -> str | None:
+        category_index = category_id - 2
+        if not 0 <= category_index < self.categories or not 1 <= page <= self.pages:
+            return None
+        articles = []
+        for position in range((page - 1) * self.page_size, page * self.page_size):
+            product_id = self._product_id(category_index, position)
+            articles.append(
+                '<li class="col-xs-6 col-sm-4 col-md-3 col-lg-3"><article class="product_pod">'
+                f'<div class="image_container"><a href="../../../book-{product_id}_{product_id}/index.html"><img src="x.jpg" alt="Book {product_id}"></a></div>'
+                f'<p class="star-rating {STAR_WORDS[product_id % 5]}"><i class="icon-star"></i></p>'
+                f'<h3><a href="../../../book-{product_id}_{product_id}/index.html" title="Book {product_id}">Book {product_id}</a></h3>'
+                f'<div class="product_price"><p class="price_color">£{product_id / 20:.2f}</p>'
+                '<p class="instock availability"><i class="icon-ok"></i> In stock</p></div>'
+                '</article></li>'
+            )
+        next_link = f'<li class="next"><a href="page-{page + 1}.html">next</a></li>' if page < self.pages else ''
+        return (
+            f'<html><body><ol class="row">{"".join(articles)}</ol>'
+            f'<div><ul class="pager"><li class="current">Page {page} of {self.pages}</li>{next_link}</ul></div>'
+            '</body></html>'
+        )
+
+    def detail_page(self, product_id: int) -> str | None:
+        position = product_id - 1000
+        if not 0 <= position < self.product_count:
+            return None
+        price = f"£{product_id / 20:.2f}"
+        stock = product_id % 23
+        availability = f"In stock ({stock} available)" if stock else "Out of stock"
+        words = (f"Description of book {product_id} " * math.ceil(self.description_length / 30))[:self.description_length]
+        return (
+            '<html><body><div class="content"><div class="row">'
+            '<div class="col-sm-6 product_main">'
+            f'<h1>Book {product_id}</h1><p class="price_color">{price}</p>'
+            f'<p class="instock availability"><i class="icon-ok"></i> {availability}</p>'
+            f'<p class="star-rating {STAR_WORDS[product_id % 5]}"><i class="icon-star"></i></p>'
+            '</div></div>'
+            '<div id="product_description" class="sub-header"><h2>Product Description</h2></div>'
+            f'<p>{words}</p>'
+            '<div class="sub-header"><h2>Product Information</h2></div>'
+            '<table class="table table-striped">'
+            f'<tr><th>UPC</th><td>{product_id:016x}</td></tr>'
+            '<tr><th>Product Type</th><td>Books</td></tr>'
+            f'<tr><th>Price (excl. tax)</th><td>{price}</td></tr>'
+            f'<tr><th>Price (incl. tax)</th><td>{price}</td></tr>'
+            '<tr><th>Tax</th><td>£0.00</td></tr>'
+            f'<tr><th>Availability</th><td>{availability}</td></tr>'
+            f'<tr><th>Number of reviews</th><td>{product_id % 7}</td></tr>'
+            '</table></div></body></html>'
+        )
+
+    def detail_pages(self) -> list[tuple[str, bytes]]:
+        """
+        Return (URL path, body) of every product detail page, for benchmarks that do not go through HTTP.
+        """
+        pages = []
+        for position in range(self.product_count):
+            product_id = 1000 + position
+            pages.append((f"catalogue/book-{product_id}_{product_id}/index.html", self.detail_page(product_id).encode('utf-8')))  # type: ignore
+        return pages
+
+    def render(self, path: str) -> str | None:
+        """
+        Return the page at the given URL path, or None if there is none.
+        """
+        if path in ("/", "/index.html"):
+            return self.index_page()
+        match = re.match(r"^/catalogue/category/books/[\w-]+_(\d+)/(?:index|page-(\d+))\.html$", path)
+        if match:
+            return self.listing_page(int(match.group(1)), int(match.group(2) or 1))
+        match = re.match(r"^/catalogue/[\w-]+_(\d+)/index\.html$", path)
+        if match:
+            return self.detail_page(int(match.group(1)))
+        return None
+
+
+@dataclass
+class ServerStats:
+    """
+    Counters of the requests served by a ReplicaServer.
+    """
+    requests: int = 0
+    errors: int = 0
+    not_modified: int = 0
+    bytes_sent: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class ReplicaServer:
+    """
+    Local HTTP server for a ReplicaSite, run on a background thread.
+    It supports keep-alive and ETag revalidation like the real site, and can inject latency and errors.
+    """
+    def __init__(self, site: ReplicaSite, latency: float = 0.0, error_rate: float = 0.0, port: int = 0, seed: int = 0) -> None:
+        """
+        :param site: The site to serve.
+        :param latency: Seconds added to every response.
+        :param error_rate: Fraction of requests answered with 503 Service Unavailable.
+        :param port: The port to listen on. 0 picks a free port.
+        :param seed: Seed of the error injection, so that runs are repeatable.
+        """
+        self.site = site
+        self.latency = latency
+        self.error_rate = error_rate
+        self.stats = ServerStats()
+        self._random = random.Random(seed)
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="replica-server", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def _should_fail(self) -> bool:
+        with self.stats.lock:
+            return self.error_rate > 0 and self._random.random() < self.error_rate
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        replica = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+            def _send(self, status: int, body: bytes = b"", headers: dict[str, str] | None = None) -> None:
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with replica.stats.lock:
+                    replica.stats.requests += 1
+                    replica.stats.bytes_sent += len(body)
+                    replica.stats.errors += status >= 500
+                    replica.stats.not_modified += status == 304
+
+            def do_GET(self) -> None:
+                if replica.latency > 0:
+                    time.sleep(replica.latency)
+                if replica._should_fail():
+                    self._send(503, headers={"Retry-After": "0"})
+                    return
+                page = replica.site.render(self.path)
+                if page is None:
+                    self._send(404)
+                    return
+                body = page.encode('utf-8')
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self._send(304, headers={"ETag": etag})
+                    return
+                self._send(200, body, {"Content-Type": "text/html; charset=utf-8", "ETag": etag})
+
+        return Handler
+
+    def start(self) -> "ReplicaServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "ReplicaServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,214 @@
+# src/benchmark/run_benchmark.py
+# -*- coding: utf-8 -*-
+"""
+Benchmark the scraper and the output sinks against a local replica of books.toscrape.com.
+
+Run it from the src directory, e.g.:
+
+    python -m benchmark.run_benchmark --categories 10 --pages 5 --latency 0.02 --workers 8
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Iterable
+
+from benchmark.replica_server import ReplicaServer, ReplicaSite
+from domain.entities.category import Category
+from domain.services.category2df import create_dataframe_from_category
+from infrastructure.output.output_repository_factory import create_output_repository
+from infrastructure.scraping import scraper
+
+
+# 出力先ごとの (形式, Excelの書き込み方式)
+SINKS: dict[str, tuple[str, str]] = {
+    "excel": ("excel", "streaming"),
+    "excel-append": ("excel", "append"),
+    "excel-parallel": ("excel", "parallel"),
+    "csv": ("csv", "streaming"),
+    "parquet": ("parquet", "streaming"),
+    "arrow": ("arrow", "streaming"),
+    "sqlite": ("sqlite", "streaming"),
+}
+
+
+def peak_rss_mb() -> float | None:
+    """
+    Return the peak resident set size of this process in MiB, or None where it is not available.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOSはバイト、Linuxはキロバイト単位
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _scrape_function(engine: str, args: argparse.Namespace) -> Callable[[], Iterable[Category]]:
+    if engine == "sync":
+        return lambda: scraper.scrape_data(max_workers=args.workers, requests_per_second=args.rps, parse_processes=args.parse_processes, parser=args.parser, state_path="")
+    if engine == "frontier":
+        from infrastructure.scraping.frontier_scraper import scrape_data_frontier
+        return lambda: scrape_data_frontier(max_workers=args.workers, requests_per_second=args.rps, parser=args.parser)
+    if engine == "sharded":
+        from infrastructure.scraping.sharded_scraper import scrape_data_sharded
+        return lambda: scrape_data_sharded(processes=args.processes, max_workers=args.workers, requests_per_second=args.rps, parser=args.parser, state_path="")
+    if engine == "async":
+        from infrastructure.scraping.async_scraper import scrape_data_async
+        return lambda: scrape_data_async(max_concurrency=args.workers, requests_per_second=args.rps, parse_processes=args.parse_processes, parser=args.parser)
+    raise ValueError(f"Unknown scraping engine: {engine}")
+
+
+def benchmark_scrape(server: ReplicaServer, engine: str, args: argparse.Namespace) -> tuple[list[Category], dict[str, Any]]:
+    """
+    Scrape the replica site and measure the throughput.
+    """
+    scraper.BASE_URL = server.base_url
+    requests_before, errors_before = server.stats.requests, server.stats.errors
+    started = time.perf_counter()
+    categories = list(_scrape_function(engine, args)())
+    elapsed = time.perf_counter() - started
+    requests = server.stats.requests - requests_before
+    products = sum(len(category.products) for category in categories)
+    return categories, {
+        "engine": engine,
+        "seconds": round(elapsed, 3),
+        "requests": requests,
+        "pages_per_second": round(requests / elapsed, 1) if elapsed > 0 else None,
+        "products": products,
+        "expected_products": server.site.product_count,
+        "server_errors": server.stats.errors - errors_before,
+    }
+
+
+def benchmark_parse(site: ReplicaSite, sample: int) -> dict[str, float]:
+    """
+    Measure the parse time of product detail pages per parser, without any network.
+    """
+    pages = site.detail_pages()[:sample]
+    results: dict[str, float] = {}
+    for parser in scraper.PARSERS:
+        started = time.perf_counter()
+        for path, content in pages:
+            scraper.parse_product_fields(content, "http://replica/" + path, parser)
+        results[parser] = round((time.perf_counter() - started) * 1000 / max(1, len(pages)), 3)
+    return results
+
+
+def benchmark_write(categories: list[Category], sinks: list[str]) -> dict[str, Any]:
+    """
+    Write one sheet (or file) per category to every sink and measure the time per sheet, including the final close().
+    """
+    frames = [(category.name, create_dataframe_from_category(category)) for category in categories]
+    results: dict[str, Any] = {}
+    for sink in sinks:
+        output_format, excel_writer = SINKS[sink]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "benchmark.xlsx" if output_format == "excel" else "benchmark")
+            try:
+                started = time.perf_counter()
+                repository = create_output_repository(output_format, path, excel_writer)
+                for name, df in frames:
+                    repository.save_df(df, name, index=False)
+                repository.close()
+                elapsed = time.perf_counter() - started
+            except ImportError as e:
+                results[sink] = f"skipped ({e})"
+                continue
+        results[sink] = round(elapsed * 1000 / max(1, len(frames)), 2)
+    return results
+
+
+def benchmark_pipeline(server: ReplicaServer, sink: str, args: argparse.Namespace) -> dict[str, float]:
+    """
+    Scrape the replica site and write it to a sink end to end, once with ScrapingService (one stage after the other)
+    and once with PipelineService (all stages concurrently), and measure the total time of each.
+    """
+    from application.services.output_service import OutputService
+    from application.services.pipeline_service import PipelineService
+
+    scraper.BASE_URL = server.base_url
+    output_format, excel_writer = SINKS[sink]
+    results: dict[str, float] = {}
+    for mode in ("sequential", "pipeline"):
+        with tempfile.TemporaryDirectory() as directory:
+            output_service = OutputService(create_output_repository(output_format, os.path.join(directory, "benchmark.xlsx" if output_format == "excel" else "benchmark"), excel_writer))
+            started = time.perf_counter()
+            if mode == "pipeline":
+                PipelineService(output_service, fetch_workers=args.workers, requests_per_second=args.rps, parse_processes=args.parse_processes).scrape_and_save()
+            else:
+                # ScrapingService.scrape_and_save()と同じく、カテゴリごとに取得・DataFrame作成・書き込みを順に行う
+                for category in _scrape_function("sync", args)():
+                    output_service.save_df(create_dataframe_from_category(category), category.name, index=False)
+            output_service.close()
+            results[mode] = round(time.perf_counter() - started, 3)
+    return results
+
+
+def _print_report(report: dict[str, Any]) -> None:
+    print(f"Site: {report['site']}")
+    for run in report["scrape"]:
+        print(f"Scrape [{run['engine']}]: {run['requests']} pages in {run['seconds']}s = {run['pages_per_second']} pages/s, "
+              f"{run['products']}/{run['expected_products']} products")
+    for parser, ms in report["parse_ms_per_page"].items():
+        print(f"Parse [{parser}]: {ms} ms/page")
+    for sink, ms in report["write_ms_per_sheet"].items():
+        print(f"Write [{sink}]: {ms} ms/sheet" if isinstance(ms, float) else f"Write [{sink}]: {ms}")
+    for mode, seconds in report.get("end_to_end_seconds", {}).items():
+        print(f"End to end [{mode}]: {seconds}s")
+    print(f"Peak RSS: {report['peak_rss_mb']:.1f} MiB" if report["peak_rss_mb"] is not None else "Peak RSS: n/a")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--categories", type=int, default=5, help="number of categories")
+    parser.add_argument("--pages", type=int, default=3, help="listing pages per category")
+    parser.add_argument("--page-size", type=int, default=20, help="products per listing page")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of responses that are 503")
+    parser.add_argument("--engine", action="append", choices=("sync", "async", "frontier", "sharded"), help="scraping engine(s) to run (default: sync)")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent requests")
+    parser.add_argument("--rps", type=float, default=0.0, help="requests per second per host, 0 for unlimited")
+    parser.add_argument("--processes", type=int, default=4, help="worker processes of the sharded engine")
+    parser.add_argument("--parse-processes", type=int, default=0, help="parse worker processes")
+    parser.add_argument("--parser", default="lxml", choices=scraper.PARSERS, help="parser of product detail pages")
+    parser.add_argument("--parse-sample", type=int, default=200, help="detail pages used by the parse benchmark")
+    parser.add_argument("--sink", action="append", choices=tuple(SINKS), help="output sink(s) to benchmark (default: excel, csv)")
+    parser.add_argument("--pipeline", action="store_true", help="also compare ScrapingService and PipelineService end to end, writing to the first sink")
+    parser.add_argument("--json", dest="json_path", help="also write the report to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> dict[str, Any]:
+    args = parse_args(argv)
+    site = ReplicaSite(categories=args.categories, pages=args.pages, page_size=args.page_size)
+    report: dict[str, Any] = {
+        "site": {"categories": args.categories, "pages": args.pages, "page_size": args.page_size, "products": site.product_count, "latency": args.latency, "error_rate": args.error_rate},
+        "scrape": [],
+    }
+
+    categories: list[Category] = []
+    with ReplicaServer(site, latency=args.latency, error_rate=args.error_rate) as server:
+        for engine in args.engine or ["sync"]:
+            categories, result = benchmark_scrape(server, engine, args)
+            report["scrape"].append(result)
+        if args.pipeline:
+            report["end_to_end_seconds"] = benchmark_pipeline(server, (args.sink or ["excel"])[0], args)
+
+    report["parse_ms_per_page"] = benchmark_parse(site, args.parse_sample)
+    report["write_ms_per_sheet"] = benchmark_write(categories, args.sink or ["excel", "csv"])
+    report["peak_rss_mb"] = peak_rss_mb()
+
+    _print_report(report)
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
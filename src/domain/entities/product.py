@@ -2,24 +2,37 @@
 # -*- coding: utf-8 -*-
 
 from __future__ import annotations
+import sys
 from dataclasses import dataclass, field
+from decimal import Decimal
 
 from domain.helpers.dataclass import DataClassBase
+from domain.helpers.parse_values import parse_int, parse_price, parse_star_rating, parse_stock
 
 
-@dataclass(frozen=True, eq=True)
+# Product.new()の引数順に並べた生の文字列フィールド（プロセス間の受け渡しに使用）
+ProductFields = tuple[str, str, str, str, str, str, str, str, str, str, str, str]
+
+
+@dataclass(frozen=True, eq=True, slots=True)
 class Product(DataClassBase):
+    """
+    Represents a product in the system.
+    Prices, stock, number of reviews and star rating are stored as parsed values (None when missing).
+    The product type and availability are interned and equal prices share one Decimal, so these repeated values are not copied.
+    """
 
     _id: str
     _name: str
     _upc: str
     _product_type: str
-    _price_excl_tax: str
-    _price_incl_tax: str
-    _tax: str
+    _price_excl_tax: Decimal | None
+    _price_incl_tax: Decimal | None
+    _tax: Decimal | None
     _availability: str
-    _number_of_reviews: str
-    _star_rating: str
+    _stock: int | None
+    _number_of_reviews: int | None
+    _star_rating: int | None
     _description: str
     _link: str
 
@@ -32,24 +45,43 @@ class Product(DataClassBase):
     @classmethod
     def new(cls, id: str, name: str, upc: str, product_type: str, price_excl_tax: str, price_incl_tax: str, tax: str, availability: str, number_of_reviews: str, star_rating: str, description: str, link: str) -> Product:
         """
-        Factory method to create a new Product instance.
-        This method ensures that the product name is sanitized.
+        Factory method to create a new Product instance from the scraped strings.
+        This method ensures that the product name is sanitized and parses the numeric fields.
         """
 
         # Sanitize the names
         name = cls._sanitize_name(name)
         upc = cls._sanitize_name(upc)
-        product_type = cls._sanitize_name(product_type)
-        price_excl_tax = cls._sanitize_name(price_excl_tax)
-        price_incl_tax = cls._sanitize_name(price_incl_tax)
-        tax = cls._sanitize_name(tax)
-        availability = cls._sanitize_name(availability)
-        number_of_reviews = cls._sanitize_name(number_of_reviews)
-        star_rating = cls._sanitize_name(star_rating)
-        description = cls._sanitize_name(description)
         link = cls._sanitize_name(link)
 
-        return cls(_id=id, _name=name, _upc=upc, _product_type=product_type, _price_excl_tax=price_excl_tax, _price_incl_tax=price_incl_tax, _tax=tax, _availability=availability, _number_of_reviews=number_of_reviews, _star_rating=star_rating, _description=description, _link=link)
+        # 値の種類が少ない文字列はインターンして共有する
+        product_type = sys.intern(cls._sanitize_name(product_type))
+        availability = sys.intern(cls._sanitize_name(availability))
+        description = cls._sanitize_name(description)
+
+        return cls(
+            _id=id,
+            _name=name,
+            _upc=upc,
+            _product_type=product_type,
+            _price_excl_tax=parse_price(price_excl_tax),
+            _price_incl_tax=parse_price(price_incl_tax),
+            _tax=parse_price(tax),
+            _availability=availability,
+            _stock=parse_stock(availability),
+            _number_of_reviews=parse_int(number_of_reviews),
+            _star_rating=parse_star_rating(cls._sanitize_name(star_rating)),
+            _description=description,
+            _link=link
+        )
+
+
+    @classmethod
+    def from_fields(cls, fields: ProductFields) -> Product:
+        """
+        Create a new Product instance from a tuple of raw fields in the argument order of `new`.
+        """
+        return cls.new(*fields)
 
 
     @property
@@ -69,15 +101,15 @@ class Product(DataClassBase):
         return self._product_type
 
     @property
-    def price_excl_tax(self) -> str:
+    def price_excl_tax(self) -> Decimal | None:
         return self._price_excl_tax
 
     @property
-    def price_incl_tax(self) -> str:
+    def price_incl_tax(self) -> Decimal | None:
         return self._price_incl_tax
 
     @property
-    def tax(self) -> str:
+    def tax(self) -> Decimal | None:
         return self._tax
 
     @property
@@ -85,11 +117,15 @@ class Product(DataClassBase):
         return self._availability
 
     @property
-    def number_of_reviews(self) -> str:
+    def stock(self) -> int | None:
+        return self._stock
+
+    @property
+    def number_of_reviews(self) -> int | None:
         return self._number_of_reviews
 
     @property
-    def star_rating(self) -> str:
+    def star_rating(self) -> int | None:
         return self._star_rating
 
     @property
@@ -100,10 +136,10 @@ class Product(DataClassBase):
     def link(self) -> str:
         return self._link
 
-    def to_dict(self) -> dict[str, str]:
+    def to_dict(self) -> dict[str, object]:
         """
         Convert the Product instance to a dictionary.
-        This method is used to be transferred to the DataFrame.
+        For building DataFrames prefer domain.services.category2df, which converts products in bulk.
         """
         return {
             "id": self.id,
@@ -114,6 +150,7 @@ class Product(DataClassBase):
             "price_incl_tax": self.price_incl_tax,
             "tax": self.tax,
             "availability": self.availability,
+            "stock": self.stock,
             "number_of_reviews": self.number_of_reviews,
             "star_rating": self.star_rating,
             "description": self.description,
@@ -6,7 +6,10 @@ class DataClassBase(metaclass=ABCMeta):
     """
     Base class for all data classes in the application.
     This class is frozen and uses equality comparison.
+    It declares empty __slots__ so that subclasses defined with slots=True do not get a __dict__.
     """
+    __slots__ = ()
+
     def __post_init__(self):
         # Ensure that all fields are frozen and immutable
         for field in self.__dataclass_fields__:
@@ -0,0 +1,38 @@
+import re
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+
+
+STAR_RATINGS: dict[str, int] = {"Zero": 0, "One": 1, "Two": 2, "Three": 3, "Four": 4, "Five": 5}
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?')
+_STOCK = re.compile(r'\((\d+) available\)')
+
+
+@lru_cache(maxsize=4096)
+def parse_price(text: str) -> Decimal | None:
+    """価格文字列（例: '£51.77'）をDecimalに変換する。数値がなければNone（同じ文字列には同じDecimalを返す）"""
+    match = _NUMBER.search(text.replace(',', ''))
+    if not match:
+        return None
+    try:
+        return Decimal(match.group(0))
+    except InvalidOperation:
+        return None
+
+
+def parse_int(text: str) -> int | None:
+    """整数文字列を変換する。数値がなければNone"""
+    return int(text) if text.strip().isdigit() else None
+
+
+def parse_stock(availability: str) -> int | None:
+    """在庫文字列（例: 'In stock (22 available)'）から在庫数を取り出す"""
+    match = _STOCK.search(availability)
+    if match:
+        return int(match.group(1))
+    return 0 if availability.lower().startswith('out of stock') else None
+
+
+def parse_star_rating(star_rating: str) -> int | None:
+    """星評価のクラス名（例: 'Three'）を整数に変換する"""
+    return STAR_RATINGS.get(star_rating)
@@ -0,0 +1,5 @@
+def sanitize_file_name(name: str) -> str:
+    invalid_chars = ['/', '\\', '*', '?', ':', '"', '<', '>', '|']
+    for char in invalid_chars:
+        name = name.replace(char, '')
+    return name.strip() or 'data'  # 空のファイル名は避ける
@@ -1,14 +1,22 @@
 # src/domain/repositories/i_excel_repository.py
 # # -*- coding: utf-8 -*-
 
-from abc import ABC, abstractmethod
+from __future__ import annotations
 
-import pandas as pd
+from abc import abstractmethod
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    # pandasは型注釈のみに使う（起動時に読み込まない）
+    import pandas as pd
 
-class IExcelRepository(ABC):
+from domain.repositories.i_output_repository import IOutputRepository
+
+
+class IExcelRepository(IOutputRepository):
     """
     IExcelRepository is an abstract base class that defines the interface for saving DataFrames to Excel files.
+    Each partition of the output is a sheet of the workbook.
     """
     def __init__(self, output_file: str) -> None:
         """
@@ -27,4 +35,10 @@ class IExcelRepository(ABC):
         :param sheet_name: The name of the sheet in the Excel file.
         :param index: Whether to include the DataFrame index in the Excel file.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def save_df(self, df: pd.DataFrame, name: str, index: bool) -> None:
+        """
+        Save a DataFrame to the sheet of the given name.
+        """
+        self.save_df_to_excel(df, name, index)
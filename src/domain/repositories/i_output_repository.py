@@ -0,0 +1,55 @@
+# src/domain/repositories/i_output_repository.py
+# # -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # pandasは型注釈のみに使う（起動時に読み込まない）
+    import pandas as pd
+
+
+class IOutputRepository(ABC):
+    """
+    IOutputRepository is an abstract base class that defines the interface for saving DataFrames to an output sink.
+    Each call writes the rows of one category (or a chunk of it) to the partition named `name`.
+    `durable_writes` tells whether the rows are on disk when save_df() returns, or only after close().
+    """
+    durable_writes: bool = True
+
+    def __init__(self, output_path: str) -> None:
+        """
+        Initialize the OutputRepository.
+
+        :param output_path: The output file or directory.
+        """
+        pass
+
+    @abstractmethod
+    def save_df(self, df: pd.DataFrame, name: str, index: bool) -> None:
+        """
+        Save a DataFrame to the partition of the given name.
+        Calling this again with the same name appends the rows to that partition.
+
+        :param df: The DataFrame to save.
+        :param name: The name of the partition (sheet, file) to write to.
+        :param index: Whether to include the DataFrame index in the output.
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        Flush and release the output.
+        Implementations that write on every call do not need to override this.
+        """
+        pass
+
+    def discard(self) -> None:
+        """
+        Release the output without writing the rows that only close() would flush, leaving the previous file as it was.
+        Used when a run is interrupted in the middle of save_df(), so that a partly written partition never reaches the disk.
+        Outputs that write on every call have nothing to hold back, and simply close.
+        """
+        self.close()
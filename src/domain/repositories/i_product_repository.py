@@ -0,0 +1,42 @@
+# src/domain/repositories/i_product_repository.py
+# # -*- coding: utf-8 -*-
+
+from abc import ABC, abstractmethod
+from typing import Any
+
+
+class IProductRepository(ABC):
+    """
+    IProductRepository is an abstract base class that defines the queries of a product store
+    that keeps the latest state of every product (keyed by UPC) across crawls.
+    Every product is returned as a dict of its columns, with the category and the crawl bookkeeping.
+    """
+
+    @abstractmethod
+    def get_by_upc(self, upc: str) -> dict[str, Any] | None:
+        """
+        Return the product with the given UPC, or None if it is not in the store.
+        """
+        pass
+
+    @abstractmethod
+    def find_by_category(self, category: str) -> list[dict[str, Any]]:
+        """
+        Return the products listed in the given category, including those also listed in other categories.
+        """
+        pass
+
+    @abstractmethod
+    def find_by_price(self, min_price: float | None = None, max_price: float | None = None) -> list[dict[str, Any]]:
+        """
+        Return the products whose price (incl. tax) is in the given range, cheapest first.
+        """
+        pass
+
+    @abstractmethod
+    def find_price_changes(self, crawl_id: int | None = None) -> list[dict[str, Any]]:
+        """
+        Return the products whose price changed in the given crawl (the latest by default),
+        with their previous price.
+        """
+        pass
@@ -1,16 +1,64 @@
 # src/domain/services/category2df.py
 # # -*- coding: utf-8 -*-
 
+from operator import attrgetter
+from typing import Sequence
+
+import numpy as np
 import pandas as pd
+from pandas.api.extensions import ExtensionArray
 
 from domain.entities.category import Category
 from domain.entities.product import Product
 
 
+# 列名とDataFrameのdtype（Productの属性名は先頭に"_"が付く）
+PRODUCT_COLUMNS: dict[str, str] = {
+    "id": "string",
+    "name": "string",
+    "upc": "string",
+    "product_type": "string",
+    "price_excl_tax": "Float64",
+    "price_incl_tax": "Float64",
+    "tax": "Float64",
+    "availability": "string",
+    "stock": "Int64",
+    "number_of_reviews": "Int64",
+    "star_rating": "Int64",
+    "description": "string",
+    "link": "string",
+}
+# 値の種類が少ない列（create_dataframe_from_categoryでcategory型にする）
+CATEGORICAL_COLUMNS: tuple[str, ...] = ("product_type", "availability", "tax", "star_rating")
+_NAN = float("nan")
+
+
+def _build_column(products: Sequence[Product], name: str, dtype: str) -> ExtensionArray:
+    """
+    Build one typed column from the attribute `_<name>` of every product.
+    """
+    getter = attrgetter("_" + name)
+    if dtype == "Float64":
+        # Decimalはnumpyのfloat配列に変換してから渡す（NaNは欠損値になる）
+        values = np.fromiter((_NAN if (value := getter(product)) is None else float(value) for product in products), dtype=np.float64, count=len(products))
+        return pd.array(values, dtype=dtype)
+    return pd.array(list(map(getter, products)), dtype=dtype)
+
+
+def create_dataframe_from_products(products: Sequence[Product]) -> pd.DataFrame:
+    """
+    Create a typed DataFrame from Product objects.
+    Each column is built directly with its dtype, instead of going through a dict per row.
+    """
+    return pd.DataFrame({name: _build_column(products, name, dtype) for name, dtype in PRODUCT_COLUMNS.items()})
+
+
 def create_dataframe_from_category(category: Category) -> pd.DataFrame:
     """
     Create a DataFrame from a Category object.
+    The columns are built from its products only here, so the values are not kept a second time while scraping.
+    The low-cardinality columns are categorical, which keeps one copy of each value
+    and is written dictionary-encoded by the Parquet and Arrow sinks.
     """
-    data = [product.to_dict() for product in category.products]
-    df = pd.DataFrame(data)
-    return df
\ No newline at end of file
+    df = create_dataframe_from_products(category.products)
+    return df.astype({name: "category" for name in CATEGORICAL_COLUMNS})
@@ -1,12 +1,16 @@
 # src/infrastructure/excel/excel_repository.py
 # # -*- coding: utf-8 -*-
-import pandas as pd
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 
 from domain.helpers.sanitize_sheet import sanitize_sheet_name
 from domain.repositories.i_excel_repository import IExcelRepository
-from infrastructure.save_DataFrame2excel import save_df2excel
 from settings import logger
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class ExcelRepository(IExcelRepository):
     """
@@ -30,6 +34,9 @@ class ExcelRepository(IExcelRepository):
         :param sheet_name: The name of the sheet in the Excel file.
         :param index: Whether to include the DataFrame index in the Excel file.
         """
+        # pandasとopenpyxlは最初の書き込みまで読み込まない
+        from infrastructure.save_DataFrame2excel import save_df2excel
+
         sheet_name = sanitize_sheet_name(sheet_name)
         save_df2excel(df, self._output_file, sheet_name, index)
         logger.info(f"DataFrameをエクセルファイル:{self._output_file}のシート:{sheet_name}に保存しました。")
@@ -0,0 +1,258 @@
+# src/infrastructure/excel/parallel_excel_repository.py
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import math
+import multiprocessing
+import numbers
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Iterable
+from xml.sax.saxutils import escape
+
+from domain.helpers.sanitize_sheet import sanitize_sheet_name
+from domain.repositories.i_excel_repository import IExcelRepository
+from settings import logger, EXCEL_WRITER_PROCESSES
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# XMLで使えない制御文字（openpyxlと同様に取り除く）
+_ILLEGAL_CHARACTERS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '{sheets}'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+_SHEET_HEAD = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = b'</sheetData></worksheet>'
+
+
+def _cell_xml(value: Any) -> str:
+    # 行番号・列番号（r属性）は省略できるので、チャンクごとに独立して書き出せる
+    if value is None:
+        return '<c/>'
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, numbers.Integral):
+        return f'<c><v>{int(value)}</v></c>'
+    if isinstance(value, (numbers.Real, Decimal)):
+        number = float(value)
+        return '<c/>' if math.isnan(number) or math.isinf(number) else f'<c><v>{number!r}</v></c>'
+    text = _ILLEGAL_CHARACTERS.sub('', str(value))
+    space = ' xml:space="preserve"' if text[:1].isspace() or text[-1:].isspace() else ''
+    return f'<c t="inlineStr"><is><t{space}>{escape(text)}</t></is></c>'
+
+
+def _rows_xml(rows: Iterable[Iterable[Any]]) -> bytes:
+    return "".join('<row>' + "".join(_cell_xml(value) for value in row) + '</row>' for row in rows).encode('utf-8')
+
+
+def render_sheet_rows(df: pd.DataFrame, index: bool, header: bool, path: str) -> str:
+    """
+    Render the rows of a DataFrame as <row> elements of SpreadsheetML with inline strings, and write them to `path`.
+    Runs in a worker process of ParallelExcelRepository.
+
+    :returns: The path of the written fragment.
+    """
+    # 欠損値（NaN、pd.NA）はNoneにしてから書き出す
+    values = df.astype(object).where(df.notna(), None)
+    rows: list[Iterable[Any]] = []
+    if header:
+        rows.append(([df.index.name] if index else []) + list(df.columns))
+    with open(path, 'wb') as f:
+        f.write(_rows_xml(rows))
+        f.write(_rows_xml(values.itertuples(index=index, name=None)))
+    return path
+
+
+def render_existing_rows(rows: list[tuple[Any, ...]], path: str) -> str:
+    """
+    Render rows read from an existing workbook, see render_sheet_rows.
+    """
+    with open(path, 'wb') as f:
+        f.write(_rows_xml(rows))
+    return path
+
+
+class ParallelExcelRepository(IExcelRepository):
+    """
+    ParallelExcelRepository renders the sheet XML of every saved DataFrame in worker processes while the caller continues,
+    and assembles the fragments into one .xlsx package on close(), keeping the order in which the sheets were first saved.
+    Saving again to the same sheet appends its rows. Sheets that already exist in the output file are carried over.
+    """
+    durable_writes = False
+
+    def __init__(self, output_file: str, processes: int = EXCEL_WRITER_PROCESSES) -> None:
+        """
+        Initialize the ParallelExcelRepository.
+
+        :param output_file: The name of the output Excel file.
+        :param processes: Number of worker processes rendering sheets.
+        """
+        self._output_file = output_file
+        self._processes = max(1, processes)
+        self._pool: ProcessPoolExecutor | None = None
+        self._work_dir: str | None = None
+        # シート名 → 書き出し順のチャンク
+        self._sheets: dict[str, list[Future[str]]] = {}
+        self._chunk_count = 0
+
+
+    def _open(self) -> ProcessPoolExecutor:
+        """
+        Start the worker processes and schedule the sheets of an existing output file first.
+        """
+        directory = os.path.dirname(os.path.abspath(self._output_file))
+        self._work_dir = tempfile.mkdtemp(prefix=".sheets_", dir=directory)
+        # 書き込みはスレッドを持つプロセスから始まるので、forkせずにspawnで起動する
+        self._pool = ProcessPoolExecutor(max_workers=self._processes, mp_context=multiprocessing.get_context("spawn"))
+        if os.path.exists(self._output_file):
+            from openpyxl import load_workbook
+
+            existing = load_workbook(self._output_file, read_only=True)
+            try:
+                for worksheet in existing.worksheets:
+                    rows = list(worksheet.iter_rows(values_only=True))
+                    self._sheets[worksheet.title] = [self._pool.submit(render_existing_rows, rows, self._next_chunk_path())]
+            finally:
+                existing.close()
+            logger.info(f"既存のエクセルファイル:{self._output_file}のシートを読み込みました。")
+        return self._pool
+
+
+    def _next_chunk_path(self) -> str:
+        self._chunk_count += 1
+        return os.path.join(self._work_dir, f"chunk{self._chunk_count}.xml")  # type: ignore
+
+
+    def _raise_failed(self) -> None:
+        # ワーカーで失敗したチャンクがあれば、close()を待たずに呼び出し元へ伝える
+        for chunks in self._sheets.values():
+            for chunk in chunks:
+                if chunk.done() and chunk.exception() is not None:
+                    raise chunk.exception()  # type: ignore
+
+
+    def save_df_to_excel(self, df: pd.DataFrame, sheet_name: str, index: bool) -> None:
+        """
+        Schedule a DataFrame to be rendered into a sheet of the workbook and return without waiting for it.
+        The header is written only by the first call for a sheet; later calls for the same sheet append rows.
+
+        :param df: The DataFrame to save.
+        :param sheet_name: The name of the sheet in the Excel file.
+        :param index: Whether to include the DataFrame index in the Excel file.
+        """
+        self._raise_failed()
+        sheet_name = sanitize_sheet_name(sheet_name)
+        pool = self._pool or self._open()
+        chunks = self._sheets.setdefault(sheet_name, [])
+        chunks.append(pool.submit(render_sheet_rows, df, index, not chunks, self._next_chunk_path()))
+        logger.info(f"DataFrameをエクセルファイル:{self._output_file}のシート:{sheet_name}に書き込む準備をしました。")
+
+
+    def _write_package(self, path: str) -> None:
+        """
+        Assemble the rendered fragments into an .xlsx package, one sheet per name in the order they were first saved.
+        """
+        names = list(self._sheets)
+        sheets = "".join(f'<sheet name="{escape(name, {chr(34): "&quot;"})}" sheetId="{i}" r:id="rId{i}"/>' for i, name in enumerate(names, 1))
+        relationships = "".join(
+            f'<Relationship Id="rId{i}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, len(names) + 1)
+        )
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as package:
+            package.writestr('[Content_Types].xml', _CONTENT_TYPES.format(sheets="".join(
+                f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for i in range(1, len(names) + 1)
+            )))
+            package.writestr('_rels/.rels', _ROOT_RELS)
+            package.writestr('xl/workbook.xml', (
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+                f'<sheets>{sheets}</sheets></workbook>'
+            ))
+            package.writestr('xl/_rels/workbook.xml.rels', (
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                f'{relationships}'
+                f'<Relationship Id="rId{len(names) + 1}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+                '</Relationships>'
+            ))
+            package.writestr('xl/styles.xml', _STYLES)
+            for i, name in enumerate(names, 1):
+                # 断片をチャンクの順にそのままzipへ流し込む
+                with package.open(f'xl/worksheets/sheet{i}.xml', 'w', force_zip64=True) as sheet:
+                    sheet.write(_SHEET_HEAD)
+                    for chunk in self._sheets[name]:
+                        with open(chunk.result(), 'rb') as fragment:
+                            shutil.copyfileobj(fragment, sheet)
+                    sheet.write(_SHEET_TAIL)
+
+
+    def close(self) -> None:
+        """
+        Wait for the worker processes and write the workbook to the output file.
+        The file is written to a temporary path first and then replaced, so an interrupted run leaves the old file intact.
+        """
+        if self._pool is None:
+            return
+
+        try:
+            temp_file = self._output_file + ".tmp"
+            self._write_package(temp_file)
+            os.replace(temp_file, self._output_file)
+            logger.info(f"エクセルファイル:{self._output_file}を保存しました。")
+        finally:
+            self._release()
+
+
+    def discard(self) -> None:
+        """
+        Stop the worker processes without writing the workbook, so the output file keeps its previous content.
+        """
+        if self._pool is None:
+            return
+        self._release()
+        logger.warning(f"エクセルファイル:{self._output_file}への書き込みを破棄しました。")
+
+
+    def _release(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)  # type: ignore
+        shutil.rmtree(self._work_dir, ignore_errors=True)  # type: ignore
+        self._pool = None
+        self._work_dir = None
+        self._sheets = {}
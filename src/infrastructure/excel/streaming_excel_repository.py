@@ -0,0 +1,114 @@
+# src/infrastructure/excel/streaming_excel_repository.py
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+from domain.helpers.sanitize_sheet import sanitize_sheet_name
+from domain.repositories.i_excel_repository import IExcelRepository
+from settings import logger
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from openpyxl import Workbook
+    from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+
+
+class StreamingExcelRepository(IExcelRepository):
+    """
+    StreamingExcelRepository is an implementation of the IExcelRepository interface that opens the workbook only once.
+    Rows are streamed into write-only (constant memory) worksheets as they arrive, and the file is written on close().
+    Sheets that already exist in the output file are carried over, and new rows are appended to them.
+    """
+    durable_writes = False
+
+    def __init__(self, output_file: str) -> None:
+        """
+        Initialize the StreamingExcelRepository.
+
+        :param output_file: The name of the output Excel file.
+        """
+        self._output_file = output_file
+        self._workbook: Workbook | None = None
+        self._sheets: dict[str, WriteOnlyWorksheet] = {}
+
+
+    def _open(self) -> Workbook:
+        """
+        Create the write-only workbook and copy the sheets of an existing output file into it.
+        """
+        # openpyxlは最初の書き込みまで読み込まない
+        from openpyxl import Workbook, load_workbook
+
+        workbook = Workbook(write_only=True)
+        if os.path.exists(self._output_file):
+            existing = load_workbook(self._output_file, read_only=True)
+            try:
+                for worksheet in existing.worksheets:
+                    sheet = workbook.create_sheet(worksheet.title)
+                    for row in worksheet.iter_rows(values_only=True):
+                        sheet.append(row)
+                    self._sheets[worksheet.title] = sheet
+            finally:
+                existing.close()
+            logger.info(f"既存のエクセルファイル:{self._output_file}のシートを読み込みました。")
+        self._workbook = workbook
+        return workbook
+
+
+    def save_df_to_excel(self, df: pd.DataFrame, sheet_name: str, index: bool) -> None:
+        """
+        Stream a DataFrame into a sheet of the workbook.
+        The header is written only when the sheet is created; later calls for the same sheet append rows.
+
+        :param df: The DataFrame to save.
+        :param sheet_name: The name of the sheet in the Excel file.
+        :param index: Whether to include the DataFrame index in the Excel file.
+        """
+        from pandas import isna
+
+        sheet_name = sanitize_sheet_name(sheet_name)
+        workbook = self._workbook or self._open()
+
+        sheet = self._sheets.get(sheet_name)
+        if sheet is None:
+            sheet = workbook.create_sheet(sheet_name)
+            self._sheets[sheet_name] = sheet
+            header = ([df.index.name] if index else []) + list(df.columns)
+            sheet.append(header)
+
+        for row in df.itertuples(index=index, name=None):
+            # 欠損値は空セルとして書き込む
+            sheet.append([None if isna(value) else value for value in row])
+        logger.info(f"DataFrameをエクセルファイル:{self._output_file}のシート:{sheet_name}に書き込みました。")
+
+
+    def close(self) -> None:
+        """
+        Write the workbook to the output file.
+        The file is written to a temporary path first and then replaced, so an interrupted run leaves the old file intact.
+        """
+        if self._workbook is None:
+            return
+
+        temp_file = self._output_file + ".tmp"
+        self._workbook.save(temp_file)
+        os.replace(temp_file, self._output_file)
+        self._workbook = None
+        self._sheets = {}
+        logger.info(f"エクセルファイル:{self._output_file}を保存しました。")
+
+
+    def discard(self) -> None:
+        """
+        Drop the workbook without writing it, so the output file keeps its previous content.
+        """
+        if self._workbook is None:
+            return
+        # 書きかけのストリームを閉じてから手放す（一時ファイルはopenpyxlが終了時に消す）
+        for sheet in self._sheets.values():
+            sheet.close()
+        self._workbook = None
+        self._sheets = {}
+        logger.warning(f"エクセルファイル:{self._output_file}への書き込みを破棄しました。")
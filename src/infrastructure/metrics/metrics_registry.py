@@ -0,0 +1,198 @@
+# src/infrastructure/metrics/metrics_registry.py
+# -*- coding: utf-8 -*-
+
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, ContextManager
+
+from settings import METRICS_PATH
+
+
+# ヒストグラムのバケット境界（秒）
+DEFAULT_BUCKETS: tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = tuple[tuple[str, str], ...]
+
+# 無効時に返す共有のコンテキストマネージャ（計測のオーバーヘッドをなくす）
+_NULL_TIMER: ContextManager[None] = nullcontext()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, bucket_count: int) -> None:
+        self.counts = [0] * (bucket_count + 1)
+        self.total = 0.0
+        self.count = 0
+
+
+class _Timer:
+    """
+    Context manager observing the seconds spent in its block into a stage histogram.
+    """
+    __slots__ = ("_registry", "_labels", "_started")
+
+    def __init__(self, registry: "MetricsRegistry", labels: Labels) -> None:
+        self._registry = registry
+        self._labels = labels
+        self._started = 0.0
+
+    def __enter__(self) -> None:
+        self._started = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._registry._observe("stage_seconds", self._labels, time.perf_counter() - self._started)
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters and latency histograms of the scrape pipeline, labelled by stage and category.
+    When disabled, every call returns immediately and timer() hands out a shared no-op context manager.
+    """
+    def __init__(self, enabled: bool = False, prefix: str = "scraper", buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """
+        :param enabled: Whether metrics are recorded.
+        :param prefix: The prefix of the exported metric names.
+        :param buckets: The upper bounds of the histogram buckets in seconds.
+        """
+        self.enabled = enabled
+        self._prefix = prefix
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, Labels], float] = {}
+        self._histograms: dict[tuple[str, Labels], _Histogram] = {}
+
+
+    @staticmethod
+    def _labels(labels: dict[str, Any]) -> Labels:
+        return tuple(sorted((key, str(value)) for key, value in labels.items() if value is not None))
+
+
+    def timer(self, stage: str, **labels: Any) -> ContextManager[None]:
+        """
+        Return a context manager that records the duration of its block for the given stage.
+
+        Example:
+            with METRICS.timer("fetch"):
+                ...
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, self._labels({"stage": stage, **labels}))
+
+
+    def observe(self, stage: str, seconds: float, **labels: Any) -> None:
+        """
+        Record a duration measured by the caller for the given stage.
+        """
+        if self.enabled:
+            self._observe("stage_seconds", self._labels({"stage": stage, **labels}), seconds)
+
+
+    def count(self, name: str, value: float = 1, **labels: Any) -> None:
+        """
+        Increase the counter `name` by `value`.
+        """
+        if not self.enabled:
+            return
+        key = (name, self._labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+
+    def _observe(self, name: str, labels: Labels, seconds: float) -> None:
+        key = (name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(len(self._buckets))
+            histogram.counts[bisect.bisect_left(self._buckets, seconds)] += 1
+            histogram.total += seconds
+            histogram.count += 1
+
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+    @staticmethod
+    def _format_labels(labels: Labels, extra: tuple[str, str] | None = None) -> str:
+        pairs = labels + ((extra,) if extra else ())
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+    def to_prometheus(self) -> str:
+        """
+        Return the metrics in the Prometheus text exposition format.
+        """
+        lines: list[str] = []
+        with self._lock:
+            for name in sorted({name for name, _ in self._counters}):
+                metric = f"{self._prefix}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for (counter_name, labels), value in sorted(self._counters.items()):
+                    if counter_name == name:
+                        lines.append(f"{metric}{self._format_labels(labels)} {value:g}")
+            for name in sorted({name for name, _ in self._histograms}):
+                metric = f"{self._prefix}_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for (histogram_name, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0]):
+                    if histogram_name != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(self._buckets + (float("inf"),), histogram.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                        lines.append(f"{metric}_bucket{self._format_labels(labels, ('le', le))} {cumulative}")
+                    lines.append(f"{metric}_sum{self._format_labels(labels)} {histogram.total:.6f}")
+                    lines.append(f"{metric}_count{self._format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+    def to_summary(self) -> dict[str, Any]:
+        """
+        Return a JSON-serialisable summary: counters, and count / total / mean seconds per stage and labels.
+        """
+        with self._lock:
+            counters = [{"name": name, "labels": dict(labels), "value": value} for (name, labels), value in sorted(self._counters.items())]
+            stages = [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": histogram.count,
+                    "total_seconds": round(histogram.total, 6),
+                    "mean_ms": round(histogram.total * 1000 / histogram.count, 3) if histogram.count else 0.0,
+                }
+                for (name, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0])
+            ]
+        return {"counters": counters, "histograms": stages}
+
+
+    def export(self, path: str) -> None:
+        """
+        Write the metrics to a file: a JSON summary if the path ends with .json, the Prometheus text format otherwise.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            if path.endswith(".json"):
+                json.dump(self.to_summary(), f, ensure_ascii=False, indent=2)
+            else:
+                f.write(self.to_prometheus())
+
+
+# プロセス全体で共有するレジストリ（METRICS_PATHが空の場合は無効）
+METRICS = MetricsRegistry(enabled=bool(METRICS_PATH))
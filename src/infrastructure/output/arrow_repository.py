@@ -0,0 +1,61 @@
+# src/infrastructure/output/arrow_repository.py
+# # -*- coding: utf-8 -*-
+import pandas as pd
+import pyarrow as pa
+
+from infrastructure.output.file_output_repository import FileOutputRepository
+from settings import logger
+
+
+def _decode_dictionaries(table: pa.Table) -> pa.Table:
+    """
+    Replace the dictionary (categorical) columns of a table by plain columns of their value type.
+    """
+    for i, field in enumerate(table.schema):
+        if pa.types.is_dictionary(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(field.type.value_type))
+    return table
+
+
+class ArrowRepository(FileOutputRepository):
+    """
+    ArrowRepository writes each partition to its own Arrow IPC file (Feather v2).
+    The writer of a partition stays open until close(), so repeated writes become additional record batches.
+    Categorical columns are written as plain columns: the IPC file format allows only one dictionary per field,
+    and every DataFrame of a partition brings its own.
+    """
+    extension = ".arrow"
+    durable_writes = False
+
+    def __init__(self, output_path: str) -> None:
+        """
+        Initialize the ArrowRepository.
+
+        :param output_path: The output directory.
+        """
+        super().__init__(output_path)
+        self._writers: dict[str, tuple[pa.ipc.RecordBatchFileWriter, pa.Schema]] = {}
+
+    def save_df(self, df: pd.DataFrame, name: str, index: bool) -> None:
+        """
+        Save a DataFrame to the Arrow IPC file of the given name.
+
+        :param df: The DataFrame to save.
+        :param name: The name of the Arrow file (without extension).
+        :param index: Whether to include the DataFrame index in the file.
+        """
+        path = self._path(name)
+        table = _decode_dictionaries(pa.Table.from_pandas(df, preserve_index=index))
+        if path not in self._writers:
+            self._writers[path] = (pa.ipc.new_file(path, table.schema), table.schema)
+        writer, schema = self._writers[path]
+        writer.write_table(table.cast(schema))
+        logger.info(f"DataFrameをArrowファイル:{path}に保存しました。")
+
+    def close(self) -> None:
+        """
+        Close every open Arrow IPC writer.
+        """
+        for writer, _ in self._writers.values():
+            writer.close()
+        self._writers = {}
@@ -0,0 +1,43 @@
+# src/infrastructure/output/csv_repository.py
+# # -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from infrastructure.output.file_output_repository import FileOutputRepository
+from settings import logger
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class CsvRepository(FileOutputRepository):
+    """
+    CsvRepository writes each partition to its own CSV file, in chunks of `chunksize` rows.
+    """
+    extension = ".csv"
+
+    def __init__(self, output_path: str, chunksize: int = 10000) -> None:
+        """
+        Initialize the CsvRepository.
+
+        :param output_path: The output directory.
+        :param chunksize: The number of rows written at a time.
+        """
+        super().__init__(output_path)
+        self._chunksize = chunksize
+        self._written: set[str] = set()
+
+    def save_df(self, df: pd.DataFrame, name: str, index: bool) -> None:
+        """
+        Save a DataFrame to the CSV file of the given name.
+
+        :param df: The DataFrame to save.
+        :param name: The name of the CSV file (without extension).
+        :param index: Whether to include the DataFrame index in the file.
+        """
+        path = self._path(name)
+        first_write = path not in self._written
+        df.to_csv(path, mode='w' if first_write else 'a', header=first_write, index=index, chunksize=self._chunksize, encoding='utf-8')
+        self._written.add(path)
+        logger.info(f"DataFrameをCSVファイル:{path}に保存しました。")
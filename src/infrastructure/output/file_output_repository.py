@@ -0,0 +1,29 @@
+# src/infrastructure/output/file_output_repository.py
+# # -*- coding: utf-8 -*-
+import os
+
+from domain.helpers.sanitize_file_name import sanitize_file_name
+from domain.repositories.i_output_repository import IOutputRepository
+
+
+class FileOutputRepository(IOutputRepository):
+    """
+    Base class for output repositories that write one file per partition into an output directory.
+    Files are (re)created on the first write of a run; later writes of the same run append to them.
+    """
+    extension: str = ""
+
+    def __init__(self, output_path: str) -> None:
+        """
+        Initialize the FileOutputRepository.
+
+        :param output_path: The output directory. It is created if it does not exist.
+        """
+        self._output_dir = output_path
+        os.makedirs(self._output_dir, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        """
+        Return the file path of the partition of the given name.
+        """
+        return os.path.join(self._output_dir, sanitize_file_name(name) + self.extension)
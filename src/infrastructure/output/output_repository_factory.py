@@ -0,0 +1,40 @@
+# src/infrastructure/output/output_repository_factory.py
+# # -*- coding: utf-8 -*-
+
+from domain.repositories.i_output_repository import IOutputRepository
+
+
+OUTPUT_FORMATS: tuple[str, ...] = ("excel", "parquet", "arrow", "csv", "sqlite")
+
+
+def create_output_repository(output_format: str, output_path: str, excel_writer: str = "streaming") -> IOutputRepository:
+    """
+    Create the output repository for the given format.
+    The modules are imported lazily so that optional dependencies (pyarrow) are only needed when they are used.
+
+    :param output_format: One of "excel", "parquet", "arrow", "csv" or "sqlite".
+    :param output_path: The output Excel or SQLite file, or the output directory for the other formats.
+    :param excel_writer: "streaming", "append" or "parallel", only used for the "excel" format.
+    """
+    if output_format == "excel":
+        if excel_writer == "streaming":
+            from infrastructure.excel.streaming_excel_repository import StreamingExcelRepository
+            return StreamingExcelRepository(output_path)
+        if excel_writer == "parallel":
+            from infrastructure.excel.parallel_excel_repository import ParallelExcelRepository
+            return ParallelExcelRepository(output_path)
+        from infrastructure.excel.excel_repository import ExcelRepository
+        return ExcelRepository(output_path)
+    if output_format == "parquet":
+        from infrastructure.output.parquet_repository import ParquetRepository
+        return ParquetRepository(output_path)
+    if output_format == "arrow":
+        from infrastructure.output.arrow_repository import ArrowRepository
+        return ArrowRepository(output_path)
+    if output_format == "csv":
+        from infrastructure.output.csv_repository import CsvRepository
+        return CsvRepository(output_path)
+    if output_format == "sqlite":
+        from infrastructure.output.sqlite_product_repository import SqliteProductRepository
+        return SqliteProductRepository(output_path)
+    raise ValueError(f"Unknown output format: {output_format}. Choose from {OUTPUT_FORMATS}")
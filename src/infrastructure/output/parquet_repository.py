@@ -0,0 +1,53 @@
+# src/infrastructure/output/parquet_repository.py
+# # -*- coding: utf-8 -*-
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from infrastructure.output.file_output_repository import FileOutputRepository
+from settings import logger
+
+
+class ParquetRepository(FileOutputRepository):
+    """
+    ParquetRepository writes each partition to its own Parquet file.
+    The writer of a partition stays open until close(), so repeated writes become additional row groups.
+    """
+    extension = ".parquet"
+    durable_writes = False
+
+    def __init__(self, output_path: str, compression: str = "snappy") -> None:
+        """
+        Initialize the ParquetRepository.
+
+        :param output_path: The output directory.
+        :param compression: The Parquet compression codec.
+        """
+        super().__init__(output_path)
+        self._compression = compression
+        self._writers: dict[str, pq.ParquetWriter] = {}
+
+    def save_df(self, df: pd.DataFrame, name: str, index: bool) -> None:
+        """
+        Save a DataFrame to the Parquet file of the given name.
+
+        :param df: The DataFrame to save.
+        :param name: The name of the Parquet file (without extension).
+        :param index: Whether to include the DataFrame index in the file.
+        """
+        path = self._path(name)
+        table = pa.Table.from_pandas(df, preserve_index=index)
+        writer = self._writers.get(path)
+        if writer is None:
+            writer = pq.ParquetWriter(path, table.schema, compression=self._compression)
+            self._writers[path] = writer
+        writer.write_table(table.cast(writer.schema))
+        logger.info(f"DataFrameをParquetファイル:{path}に保存しました。")
+
+    def close(self) -> None:
+        """
+        Close every open Parquet writer.
+        """
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
@@ -0,0 +1,187 @@
+# src/infrastructure/output/sqlite_product_repository.py
+# # -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from typing import TYPE_CHECKING, Any
+
+from domain.repositories.i_output_repository import IOutputRepository
+from domain.repositories.i_product_repository import IProductRepository
+from settings import logger
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# 保存するProductの列（category2df.PRODUCT_COLUMNSと同じ）
+PRODUCT_FIELDS: tuple[str, ...] = (
+    "id", "name", "upc", "product_type", "price_excl_tax", "price_incl_tax", "tax",
+    "availability", "stock", "number_of_reviews", "star_rating", "description", "link",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawls (
+    crawl_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS products (
+    upc TEXT PRIMARY KEY,
+    id TEXT,
+    name TEXT,
+    category TEXT NOT NULL,
+    product_type TEXT,
+    price_excl_tax REAL,
+    price_incl_tax REAL,
+    tax REAL,
+    availability TEXT,
+    stock INTEGER,
+    number_of_reviews INTEGER,
+    star_rating INTEGER,
+    description TEXT,
+    link TEXT,
+    first_seen_crawl INTEGER NOT NULL,
+    last_seen_crawl INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS products_category ON products (category);
+CREATE TABLE IF NOT EXISTS product_categories (
+    upc TEXT NOT NULL,
+    category TEXT NOT NULL,
+    last_seen_crawl INTEGER NOT NULL,
+    PRIMARY KEY (upc, category)
+);
+CREATE INDEX IF NOT EXISTS product_categories_category ON product_categories (category, upc);
+CREATE INDEX IF NOT EXISTS products_price ON products (price_incl_tax);
+CREATE INDEX IF NOT EXISTS products_last_seen ON products (last_seen_crawl);
+CREATE TABLE IF NOT EXISTS price_history (
+    upc TEXT NOT NULL,
+    crawl_id INTEGER NOT NULL,
+    previous_price REAL,
+    price REAL,
+    changed_at REAL NOT NULL,
+    PRIMARY KEY (upc, crawl_id)
+);
+CREATE INDEX IF NOT EXISTS price_history_crawl ON price_history (crawl_id);
+CREATE TRIGGER IF NOT EXISTS products_price_changed AFTER UPDATE OF price_incl_tax ON products
+WHEN old.price_incl_tax IS NOT new.price_incl_tax
+BEGIN
+    INSERT OR REPLACE INTO price_history (upc, crawl_id, previous_price, price, changed_at)
+    VALUES (new.upc, new.last_seen_crawl, old.price_incl_tax, new.price_incl_tax, new.updated_at);
+END;
+"""
+
+_UPSERT = (
+    f"INSERT INTO products ({', '.join(PRODUCT_FIELDS)}, category, first_seen_crawl, last_seen_crawl, updated_at) "
+    f"VALUES ({', '.join('?' * len(PRODUCT_FIELDS))}, ?, ?, ?, ?) "
+    "ON CONFLICT (upc) DO UPDATE SET "
+    + ", ".join(f"{name} = excluded.{name}" for name in PRODUCT_FIELDS if name != "upc")
+    + ", category = excluded.category, last_seen_crawl = excluded.last_seen_crawl, updated_at = excluded.updated_at"
+)
+
+# 商品は複数のカテゴリに載るので、productsのcategory（最後に保存したカテゴリ）とは別に全ての組を残す
+_LINK = (
+    "INSERT INTO product_categories (upc, category, last_seen_crawl) VALUES (?, ?, ?) "
+    "ON CONFLICT (upc, category) DO UPDATE SET last_seen_crawl = excluded.last_seen_crawl"
+)
+
+# find_by_categoryの列（categoryは問い合わせたカテゴリにする）
+_CATEGORY_SELECT = (
+    "SELECT " + ", ".join(f"products.{name}" for name in PRODUCT_FIELDS)
+    + ", product_categories.category, products.first_seen_crawl, products.last_seen_crawl, products.updated_at "
+    "FROM product_categories JOIN products USING (upc) WHERE product_categories.category = ? ORDER BY upc"
+)
+
+
+class SqliteProductRepository(IOutputRepository, IProductRepository):
+    """
+    SqliteProductRepository stores the products in an SQLite database, one row per UPC, instead of one sheet per category.
+    Every run that writes products is recorded as a crawl; rows are upserted with the crawl that last saw them,
+    and every category a product is listed in is kept in product_categories (products.category is the last one saved),
+    and price changes are recorded in price_history by a trigger, so lookups and diffs between runs are index queries.
+    Opening the database only to query it does not start a crawl.
+    """
+
+    def __init__(self, output_path: str, batch_size: int = 1000) -> None:
+        """
+        Open (or create) the database.
+
+        :param output_path: The path of the SQLite file.
+        :param batch_size: The number of rows written per transaction.
+        """
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._output_path = output_path
+        self._batch_size = batch_size
+        self._conn = sqlite3.connect(output_path, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        migrate = self._conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products'").fetchone() is not None \
+            and self._conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'product_categories'").fetchone() is None
+        self._conn.executescript(_SCHEMA)
+        if migrate:
+            # 以前のデータベースでは、商品ごとに最後に保存したカテゴリだけが分かる
+            self._conn.execute("INSERT OR IGNORE INTO product_categories (upc, category, last_seen_crawl) SELECT upc, category, last_seen_crawl FROM products")
+        self.crawl_id: int | None = None
+
+    def save_df(self, df: pd.DataFrame, name: str, index: bool) -> None:
+        """
+        Upsert the products of a DataFrame, keyed by UPC. Rows without a UPC are skipped.
+
+        :param df: The DataFrame to save, with the columns of category2df.PRODUCT_COLUMNS.
+        :param name: The category of the products.
+        :param index: Not used, the DataFrame index is never stored.
+        """
+        # 列ごとにPythonの値へ変換する（欠損値はNone）
+        columns = [df[field].to_numpy(dtype=object, na_value=None).tolist() for field in PRODUCT_FIELDS]
+        if self.crawl_id is None:
+            self.crawl_id = self._conn.execute("INSERT INTO crawls (started_at) VALUES (?)", (time.time(),)).lastrowid
+        now = time.time()
+        rows = [(*values, name, self.crawl_id, self.crawl_id, now) for values in zip(*columns) if values[2]]
+        for start in range(0, len(rows), self._batch_size):
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(_UPSERT, rows[start:start + self._batch_size])
+                self._conn.executemany(_LINK, [(row[2], name, self.crawl_id) for row in rows[start:start + self._batch_size]])
+        logger.info(f"DataFrameをSQLite:{self._output_path}に保存しました。（{name}: {len(rows)}件）")
+
+    def close(self) -> None:
+        """
+        Record the end of the crawl, if one was started, and close the database.
+        """
+        if self.crawl_id is not None:
+            self._conn.execute("UPDATE crawls SET finished_at = ? WHERE crawl_id = ?", (time.time(), self.crawl_id))
+        self._conn.close()
+
+    def _query(self, sql: str, parameters: tuple[Any, ...] = ()) -> list[dict[str, Any]]:
+        return [dict(row) for row in self._conn.execute(sql, parameters)]
+
+    def get_by_upc(self, upc: str) -> dict[str, Any] | None:
+        rows = self._query("SELECT * FROM products WHERE upc = ?", (upc,))
+        return rows[0] if rows else None
+
+    def find_by_category(self, category: str) -> list[dict[str, Any]]:
+        return self._query(_CATEGORY_SELECT, (category,))
+
+    def find_by_price(self, min_price: float | None = None, max_price: float | None = None) -> list[dict[str, Any]]:
+        return self._query(
+            "SELECT * FROM products WHERE price_incl_tax BETWEEN ? AND ? ORDER BY price_incl_tax",
+            (float("-inf") if min_price is None else min_price, float("inf") if max_price is None else max_price)
+        )
+
+    def find_price_changes(self, crawl_id: int | None = None) -> list[dict[str, Any]]:
+        return self._query(
+            "SELECT products.*, price_history.previous_price, price_history.crawl_id AS changed_crawl FROM price_history "
+            "JOIN products USING (upc) WHERE price_history.crawl_id = ? ORDER BY products.upc",
+            (self.latest_crawl_id() if crawl_id is None else crawl_id,)
+        )
+
+    def latest_crawl_id(self) -> int | None:
+        """
+        Return the id of the latest crawl, or None if nothing has been written yet.
+        """
+        return self._conn.execute("SELECT MAX(crawl_id) FROM crawls").fetchone()[0]
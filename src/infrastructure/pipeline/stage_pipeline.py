@@ -0,0 +1,169 @@
+# src/infrastructure/pipeline/stage_pipeline.py
+# -*- coding: utf-8 -*-
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+from infrastructure.metrics.metrics_registry import METRICS
+from settings import logger
+
+
+# 段の終わりを下流へ伝える目印
+_END = object()
+# キューや待機を中断の確認のために区切る間隔（秒）
+_POLL_INTERVAL = 0.1
+
+Emit = Callable[[Any], None]
+
+
+class PipelineCancelled(Exception):
+    """
+    Raised inside a stage when the pipeline is shutting down because another stage failed.
+    """
+    pass
+
+
+@dataclass
+class Stage:
+    """
+    One stage of a StagePipeline: `workers` threads calling `function(item, emit)` for every item of the input queue.
+    The function passes zero or more results to the next stage with emit(); the results of the last stage are discarded.
+    """
+    name: str
+    function: Callable[[Any, Emit], None]
+    workers: int = 1
+
+
+class StagePipeline:
+    """
+    StagePipeline runs stages connected by bounded queues, every stage on its own threads.
+    A full queue blocks the stage that feeds it (backpressure), so a slow stage throttles the stages before it
+    instead of letting the queued items grow, and the total time approaches that of the slowest stage.
+    When a stage raises, the other stages are cancelled and run() raises that first error once every thread has stopped.
+    """
+
+    def __init__(self, stages: list[Stage], queue_size: int = 64) -> None:
+        """
+        :param stages: The stages in order. The first stage receives the items of the source passed to run().
+        :param queue_size: The maximum number of items waiting in front of each stage.
+        """
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage.")
+        self._stages = stages
+        self._queues: list[queue.Queue[Any]] = [queue.Queue(maxsize=max(1, queue_size)) for _ in stages]
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._error: BaseException | None = None
+        # 段ごとに実行中のワーカー数（最後のワーカーが下流へ終わりを伝える）
+        self._running = [max(1, stage.workers) for stage in stages]
+
+
+    @property
+    def stopped(self) -> bool:
+        """
+        Whether the pipeline is shutting down after an error.
+        """
+        return self._stopped.is_set()
+
+
+    def _fail(self, error: BaseException) -> None:
+        with self._lock:
+            if self._error is None:
+                self._error = error
+        self._stopped.set()
+
+
+    def _put(self, position: int, item: Any) -> None:
+        while True:
+            if self._stopped.is_set():
+                raise PipelineCancelled()
+            try:
+                self._queues[position].put(item, timeout=_POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+
+    def _get(self, position: int) -> Any:
+        while True:
+            if self._stopped.is_set():
+                raise PipelineCancelled()
+            try:
+                return self._queues[position].get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+
+
+    def acquire(self, semaphore: threading.Semaphore) -> None:
+        """
+        Acquire a semaphore from inside a stage, giving up when the pipeline is cancelled.
+        """
+        while not semaphore.acquire(timeout=_POLL_INTERVAL):
+            if self._stopped.is_set():
+                raise PipelineCancelled()
+
+
+    def _worker(self, position: int) -> None:
+        stage = self._stages[position]
+        last = position == len(self._stages) - 1
+        emit: Emit = (lambda item: None) if last else (lambda item: self._put(position + 1, item))
+        try:
+            while (item := self._get(position)) is not _END:
+                started = time.perf_counter()
+                stage.function(item, emit)
+                METRICS.observe(f"pipeline_{stage.name}", time.perf_counter() - started)
+        except PipelineCancelled:
+            return
+        except BaseException as e:
+            logger.error(f"Pipeline stage {stage.name} failed: {e}", exc_info=True)
+            self._fail(e)
+            return
+
+        with self._lock:
+            self._running[position] -= 1
+            finished = self._running[position] == 0
+        if finished and not last:
+            try:
+                for _ in range(max(1, self._stages[position + 1].workers)):
+                    self._put(position + 1, _END)
+            except PipelineCancelled:
+                pass
+
+
+    def run(self, source: Iterable[Any]) -> None:
+        """
+        Feed the items of `source` to the first stage on the calling thread and wait until every stage has finished.
+
+        :raises: The first exception raised by a stage or by the source.
+        """
+        threads = [
+            threading.Thread(target=self._worker, args=(position,), name=f"pipeline-{stage.name}-{i}", daemon=True)
+            for position, stage in enumerate(self._stages)
+            for i in range(max(1, stage.workers))
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            for item in source:
+                self._put(0, item)
+            for _ in range(max(1, self._stages[0].workers)):
+                self._put(0, _END)
+        except PipelineCancelled:
+            pass
+        except BaseException as e:
+            # ソースの失敗や中断（KeyboardInterrupt）でも全ての段を止めてから伝える
+            self._fail(e)
+        finally:
+            for thread in threads:
+                while thread.is_alive():
+                    try:
+                        thread.join(_POLL_INTERVAL)
+                    except KeyboardInterrupt as e:
+                        self._fail(e)
+
+        if self._error is not None:
+            raise self._error
@@ -0,0 +1,180 @@
+# src/infrastructure/scraping/async_scraper.py
+# -*- coding: utf-8 -*-
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncGenerator, Generator, Iterator
+
+import aiohttp
+
+from domain.entities.category import Category
+from domain.entities.product import Product
+from infrastructure.metrics.metrics_registry import METRICS
+from infrastructure.scraping import scraper
+from infrastructure.scraping.get_soup import GetSoup
+from infrastructure.scraping.rate_limiter import HostRateLimiter, parse_retry_after
+from settings import logger, SCRAPER_ADAPTIVE_RATE, SCRAPER_ASYNC_MAX_CATEGORIES, SCRAPER_MAX_CONCURRENCY, SCRAPER_PARSE_PROCESSES, SCRAPER_PARSER, SCRAPER_REQUESTS_PER_SECOND
+
+
+async def _fetch(client: aiohttp.ClientSession, url: str, semaphore: asyncio.Semaphore, rate_limiter: HostRateLimiter, retries: int = 3, backoff_factor: float = 0.5, status_forcelist: tuple[int, ...] = (429, 500, 502, 503, 504)) -> bytes:
+    """
+    Download the body of the given URL.
+    The retry policy mirrors RetryScheduler (a Retry-After header extends the backoff), the semaphore bounds the number of requests in flight.
+    The status code and latency of every attempt are reported back to the rate limiter.
+    """
+    for attempt in range(retries + 1):
+        with METRICS.timer("rate_limit_wait"):
+            await rate_limiter.acquire_async(url)
+        retry_after: float | None = None
+        started = time.monotonic()
+        try:
+            async with semaphore:
+                async with client.get(url) as response:
+                    logger.debug(f"URL: {url}, Status Code: {response.status}")
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    rate_limiter.record(url, response.status, time.monotonic() - started, retry_after)
+                    METRICS.count("http_responses", status=response.status)
+                    if response.status in status_forcelist and attempt < retries:
+                        raise aiohttp.ClientResponseError(response.request_info, response.history, status=response.status)
+                    response.raise_for_status()
+                    content = await response.read()
+                    METRICS.observe("fetch", time.monotonic() - started)
+                    return content
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if not isinstance(e, aiohttp.ClientResponseError):
+                rate_limiter.record(url, 0, time.monotonic() - started)
+            if attempt >= retries:
+                logger.error(f"Request error occurred. @async_fetch {url}: {e}", exc_info=True)
+                raise e
+            delay = backoff_factor * (2 ** attempt)
+            await asyncio.sleep(max(delay, retry_after) if retry_after is not None else delay)
+    raise RuntimeError(f"Unreachable retry state for {url}")
+
+
+async def _get_product_details(client: aiohttp.ClientSession, url: str, semaphore: asyncio.Semaphore, rate_limiter: HostRateLimiter, parse_pool: ProcessPoolExecutor | None = None, parser: str = SCRAPER_PARSER) -> Product:
+    """
+    Get product details from the given URL and return a Product object.
+    With a parse pool the page is parsed in a worker process, so parsing does not block the event loop.
+    """
+    try:
+        content = await _fetch(client, url, semaphore, rate_limiter)
+        if parse_pool is not None:
+            fields = await asyncio.get_running_loop().run_in_executor(parse_pool, scraper.parse_product_fields, content, url, parser)
+            return Product.from_fields(fields)
+        return Product.from_fields(scraper._extract_fields(content, url, parser))
+
+    except Exception as e:
+        logger.error(f"Error occurred while getting product details: {e}", exc_info=True)
+        return scraper._empty_product(url)
+
+
+async def _get_listing_page(client: aiohttp.ClientSession, url: str, semaphore: asyncio.Semaphore, rate_limiter: HostRateLimiter) -> tuple[str, list[str], str | None]:
+    """
+    Fetch and parse a listing page, and free its parse tree.
+
+    :returns: The URL of the page, the product detail URLs and the URL of the next page.
+    """
+    content = await _fetch(client, url, semaphore, rate_limiter)
+    soup = GetSoup.from_content(content)
+    detail_urls, next_page_url = scraper._parse_listing_page(soup, url)
+    soup.soup.decompose()
+    return url, detail_urls, next_page_url
+
+
+async def _get_product_data(client: aiohttp.ClientSession, category: Category, semaphore: asyncio.Semaphore, rate_limiter: HostRateLimiter, parse_pool: ProcessPoolExecutor | None = None, parser: str = SCRAPER_PARSER) -> Category:
+    """
+    Get every product of the category, following the listing pages.
+    The product detail pages of a listing page are fetched as concurrent tasks and added in listing order,
+    while the next listing page is already being fetched.
+    """
+    next_page: asyncio.Task[tuple[str, list[str], str | None]] | None = None
+    try:
+        next_page = asyncio.create_task(_get_listing_page(client, category.link, semaphore, rate_limiter))
+        while next_page is not None:
+            page_url, detail_urls, next_page_url = await next_page
+            category.set_link(page_url)
+            next_page = asyncio.create_task(_get_listing_page(client, next_page_url, semaphore, rate_limiter)) if next_page_url else None
+
+            products = await asyncio.gather(*(_get_product_details(client, url, semaphore, rate_limiter, parse_pool, parser) for url in detail_urls))
+            for product in products:
+                category.add_product(product)
+
+        return category
+
+    except Exception as e:
+        logger.error(f"Error occurred while getting product data: {e}", exc_info=True)
+        if next_page is not None:
+            next_page.cancel()
+        return category
+
+
+async def async_scrape_data(max_concurrency: int = SCRAPER_MAX_CONCURRENCY, requests_per_second: float = SCRAPER_REQUESTS_PER_SECOND, parse_processes: int = SCRAPER_PARSE_PROCESSES, parser: str = SCRAPER_PARSER, adaptive: bool = SCRAPER_ADAPTIVE_RATE, max_categories: int = SCRAPER_ASYNC_MAX_CATEGORIES) -> AsyncGenerator[Category, None]:
+    """
+    Scrape data from a website with asyncio and yield it as Category objects.
+    Up to `max_categories` categories are scraped as concurrent tasks over one pooled HTTP client, and they are yielded in site order:
+    each category is yielded once it and the ones before it are complete, and the next category is started in its place,
+    so that only a few categories are held in memory instead of the whole site.
+
+    :param max_concurrency: Maximum number of requests in flight.
+    :param requests_per_second: Politeness budget per host in requests per second. 0 or less disables it.
+    :param parse_processes: Number of worker processes parsing product detail pages. 0 parses them in the event loop.
+    :param parser: The parser used for product detail pages, "lxml" (fast) or "bs4" (BeautifulSoup).
+    :param adaptive: Adapt the request rate to the responses of the host, starting at `requests_per_second`.
+    :param max_categories: Maximum number of categories scraped at the same time.
+    """
+    if parser not in scraper.PARSERS:
+        raise ValueError(f"Unknown parser: {parser}")
+    parse_pool = ProcessPoolExecutor(max_workers=parse_processes) if parse_processes > 0 else None
+    semaphore = asyncio.Semaphore(max_concurrency)
+    rate_limiter = scraper.create_rate_limiter(requests_per_second, adaptive)
+    connector = aiohttp.TCPConnector(limit=max_concurrency)
+    timeout = aiohttp.ClientTimeout(total=10)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as client:
+        tasks: deque[asyncio.Task[Category]] = deque()
+        try:
+            url = scraper.BASE_URL + "index.html"
+            content = await _fetch(client, url, semaphore, rate_limiter)
+            remaining: Iterator[Category] = iter(scraper._parse_category_data(GetSoup.from_content(content)))
+
+            def start_next() -> None:
+                if (category := next(remaining, None)) is not None:
+                    tasks.append(asyncio.create_task(_get_product_data(client, category, semaphore, rate_limiter, parse_pool, parser)))
+
+            for _ in range(max(1, max_categories)):
+                start_next()
+            while tasks:
+                category = await tasks.popleft()
+                # 呼び出し元が書き込んでいる間も次のカテゴリを取得する
+                start_next()
+                logger.debug(f"Scraped category: {category.name}")
+                yield category
+
+        except Exception as e:
+            print(f"Error occurred while scraping data: {e}")
+            yield Category.new(id=0, name='', link='')
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if parse_pool is not None:
+                parse_pool.shutdown(wait=True)
+
+
+def scrape_data_async(max_concurrency: int = SCRAPER_MAX_CONCURRENCY, requests_per_second: float = SCRAPER_REQUESTS_PER_SECOND, parse_processes: int = SCRAPER_PARSE_PROCESSES, parser: str = SCRAPER_PARSER, adaptive: bool = SCRAPER_ADAPTIVE_RATE, max_categories: int = SCRAPER_ASYNC_MAX_CATEGORIES) -> Generator[Category, None, None]:
+    """
+    Drive async_scrape_data() from synchronous code, yielding Category objects like scrape_data().
+    """
+    loop = asyncio.new_event_loop()
+    categories = async_scrape_data(max_concurrency, requests_per_second, parse_processes, parser, adaptive, max_categories)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(categories.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(categories.aclose())
+        loop.close()
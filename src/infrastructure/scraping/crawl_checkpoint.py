@@ -0,0 +1,143 @@
+# src/infrastructure/scraping/crawl_checkpoint.py
+# -*- coding: utf-8 -*-
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from domain.entities.category import Category
+from domain.entities.product import Product
+
+
+class CrawlCheckpoint:
+    """
+    SQLite journal of the progress of a crawl, so that an interrupted run can resume where it stopped.
+    It records the fetched product URLs, the completed listing pages and the categories written to the output.
+    The journal is cleared with finish() once a run has completed.
+    """
+    def __init__(self, path: str) -> None:
+        """
+        Open (or create) the checkpoint journal.
+
+        :param path: The path of the SQLite file.
+        """
+        self._path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # 1件ごとにコミットしても遅くならないようWALを使う
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS done_categories (category_id INTEGER PRIMARY KEY, name TEXT NOT NULL, done_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS done_pages (seq INTEGER PRIMARY KEY AUTOINCREMENT, category_id INTEGER NOT NULL, url TEXT NOT NULL, next_url TEXT);"
+            # 複数のカテゴリに載っている商品も、それぞれの一覧ページの位置に記録する
+            "CREATE TABLE IF NOT EXISTS listed_products (category_id INTEGER NOT NULL, page_url TEXT NOT NULL, position INTEGER NOT NULL, url TEXT NOT NULL, product BLOB NOT NULL, PRIMARY KEY (category_id, page_url, position));"
+            "CREATE INDEX IF NOT EXISTS listed_products_url ON listed_products (url);"
+        )
+        self._migrate()
+
+
+    def _migrate(self) -> None:
+        """
+        Move the products of a journal written by an older version, which kept each product URL only once.
+        """
+        if self._conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'fetched_products'").fetchone() is None:
+            return
+        self._conn.executescript(
+            "BEGIN;"
+            "INSERT OR IGNORE INTO listed_products (category_id, page_url, position, url, product) SELECT category_id, page_url, position, url, product FROM fetched_products;"
+            "DROP TABLE fetched_products;"
+            "COMMIT;"
+        )
+
+
+    def is_category_done(self, category_id: int) -> bool:
+        """
+        Whether the category has already been written to the output by an earlier, interrupted run.
+        """
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM done_categories WHERE category_id = ?", (category_id,)).fetchone() is not None
+
+
+    def mark_category_done(self, category: Category) -> None:
+        """
+        Record that the category has been written to the output.
+        """
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO done_categories (category_id, name, done_at) VALUES (?, ?, ?)", (category.id, category.name, time.time()))
+
+
+    def resume_category(self, category: Category) -> str | None:
+        """
+        Restore the products of the completed listing pages of the category.
+
+        :param category: The category to restore. Its products are added in their original order.
+        :returns: The URL of the listing page to continue with, or None if every page has been completed.
+        """
+        with self._lock:
+            pages = self._conn.execute("SELECT url, next_url FROM done_pages WHERE category_id = ? ORDER BY seq", (category.id,)).fetchall()
+            for page_url, _ in pages:
+                rows = self._conn.execute("SELECT product FROM listed_products WHERE category_id = ? AND page_url = ? ORDER BY position", (category.id, page_url)).fetchall()
+                for (product,) in rows:
+                    category.add_product(pickle.loads(product))
+        return pages[-1][1] if pages else category.link
+
+
+    def fetched_products(self, urls: list[str]) -> dict[str, Product]:
+        """
+        Return the already fetched products among the given URLs, whichever category they were listed in.
+        """
+        with self._lock:
+            found: dict[str, Product] = {}
+            for url in urls:
+                row = self._conn.execute("SELECT product FROM listed_products WHERE url = ? LIMIT 1", (url,)).fetchone()
+                if row is not None:
+                    found[url] = pickle.loads(row[0])
+        return found
+
+
+    def record_product(self, category_id: int, page_url: str, position: int, product: Product) -> None:
+        """
+        Record a fetched product at its position on a listing page, so that it is not fetched again after an interruption.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO listed_products (category_id, page_url, position, url, product) VALUES (?, ?, ?, ?, ?)",
+                (category_id, page_url, position, product.link, pickle.dumps(product))
+            )
+
+
+    def mark_page_done(self, category_id: int, page_url: str, next_url: str | None, products: list[Product]) -> None:
+        """
+        Record that every product of a listing page has been fetched, together with the products of the page in listing order.
+        Products fetched for another category are recorded for this page too, so that resuming the category restores them.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO listed_products (category_id, page_url, position, url, product) VALUES (?, ?, ?, ?, ?)",
+                    [(category_id, page_url, position, product.link, pickle.dumps(product)) for position, product in enumerate(products)]
+                )
+                self._conn.execute("INSERT INTO done_pages (category_id, url, next_url) VALUES (?, ?, ?)", (category_id, page_url, next_url))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+
+    def finish(self) -> None:
+        """
+        Clear the journal after a completed run, so that the next run starts from the beginning.
+        """
+        self.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self._path + suffix):
+                os.remove(self._path + suffix)
+
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
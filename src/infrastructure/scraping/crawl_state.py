@@ -0,0 +1,99 @@
+# src/infrastructure/scraping/crawl_state.py
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+from domain.entities.product import ProductFields
+
+
+def content_hash(content: bytes | str) -> str:
+    """
+    Return a short, stable hash of a page or a page fragment.
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+@dataclass(frozen=True)
+class ProductState:
+    """
+    What the previous run knew about a product detail page.
+    """
+    url: str
+    listing_hash: str
+    content_hash: str
+    fields: ProductFields
+    checked_at: float
+
+
+class CrawlStateIndex:
+    """
+    Local SQLite index of the products seen by previous runs, used by the incremental crawl mode.
+    For every product URL it keeps the hash of its listing entry, the hash of its detail page and the parsed fields.
+    """
+    def __init__(self, path: str, shared: bool = False) -> None:
+        """
+        Open (or create) the state index.
+
+        :param path: The path of the SQLite file.
+        :param shared: Whether other processes of this machine write the same index, e.g. the workers of a sharded crawl.
+            Every put() is then committed at once in WAL mode and waits for the other writers, instead of holding
+            the write lock until commit(). WAL needs shared memory, so the processes must run on the same host.
+        """
+        self._lock = threading.Lock()
+        if shared:
+            # 他のプロセスの書き込みを長く待ち、書き込みロックはput()ごとにすぐ手放す
+            self._conn = sqlite3.connect(path, timeout=60, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        else:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS product_state ("
+            " url TEXT PRIMARY KEY,"
+            " listing_hash TEXT NOT NULL,"
+            " content_hash TEXT NOT NULL,"
+            " fields TEXT NOT NULL,"
+            " checked_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+
+    def get(self, url: str) -> ProductState | None:
+        """
+        Return the state of the product URL, or None if it has not been seen before.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT listing_hash, content_hash, fields, checked_at FROM product_state WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        listing_hash, page_hash, fields, checked_at = row
+        return ProductState(url=url, listing_hash=listing_hash, content_hash=page_hash, fields=tuple(json.loads(fields)), checked_at=checked_at)  # type: ignore
+
+
+    def put(self, url: str, listing_hash: str, page_hash: str, fields: ProductFields) -> None:
+        """
+        Record the current state of a product URL. Changes are persisted by commit(), or at once in a shared index.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO product_state (url, listing_hash, content_hash, fields, checked_at) VALUES (?, ?, ?, ?, ?)",
+                (url, listing_hash, page_hash, json.dumps(fields, ensure_ascii=False), time.time())
+            )
+
+
+    def commit(self) -> None:
+        with self._lock:
+            self._conn.commit()
+
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
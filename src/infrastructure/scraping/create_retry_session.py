@@ -1,5 +1,9 @@
 import requests
 from requests.adapters import HTTPAdapter, Retry
+from requests.hooks import dispatch_hook
+
+from infrastructure.scraping.http_cache import HttpCache
+from infrastructure.scraping.page_archive import PageArchive, PageArchiveWriter
 
 
 class TimeoutHTTPAdapter(HTTPAdapter):
@@ -15,19 +19,114 @@ class TimeoutHTTPAdapter(HTTPAdapter):
         return super().send(request, **kwargs)
 
 
-def create_retry_session(retries: int = 3, backoff_factor: float = 0.5, status_forcelist: tuple[int, ...] = (500, 502, 503, 504), timeout: int = 10) -> requests.Session:
+class CachedSession(requests.Session):
+    """
+    Session that serves GET requests from an HttpCache.
+    Fresh entries are returned without a request, stale entries are revalidated with a conditional request.
+    """
+    def __init__(self, cache: HttpCache):
+        super().__init__()
+        self.cache = cache
+
+    def _cached_response(self, request_url: str, body: bytes, content_type: str | None) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.url = request_url
+        response._content = body
+        if content_type:
+            response.headers['Content-Type'] = content_type
+        response.from_cache = True  # type: ignore
+        # キャッシュから返す応答にもフック（ページのアーカイブなど）を適用する
+        return dispatch_hook('response', self.hooks, response)
+
+    def is_fresh(self, url: str) -> bool:
+        """
+        Whether a GET of the URL will be served from the cache without a request.
+        """
+        entry = self.cache.lookup(url)
+        return entry is not None and self.cache.is_fresh(entry)
+
+    def request(self, method, url, *args, **kwargs):
+        if method.upper() != 'GET':
+            return super().request(method, url, *args, **kwargs)
+
+        entry = self.cache.lookup(url)
+        if entry is not None and self.cache.is_fresh(entry):
+            return self._cached_response(url, self.cache.read_body(entry), entry.content_type)
+
+        if entry is not None:
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), **self.cache.conditional_headers(entry)}
+        response = super().request(method, url, *args, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(entry)
+            return self._cached_response(url, self.cache.read_body(entry), entry.content_type)
+        if response.status_code == 200:
+            self.cache.store(url, response.content, response.headers.get('ETag'), response.headers.get('Last-Modified'), response.headers.get('Content-Type'))
+        return response
+
+
+def create_retry_session(retries: int = 3, backoff_factor: float = 0.5, status_forcelist: tuple[int, ...] = (500, 502, 503, 504), timeout: int = 10, cache: HttpCache | None = None, pool_size: int = 10, pool_block: bool = False, http2: bool = False, archive: PageArchiveWriter | None = None, replay: PageArchive | None = None) -> requests.Session:
     """
     Create a requests session with retry logic.
+    When a cache is given, GET responses are cached on disk and revalidated with conditional requests.
+
+    :param pool_size: Maximum number of keep-alive connections per host. Size it to the number of threads sending requests,
+        otherwise connections are discarded ("Connection pool is full") and opened again for later requests.
+    :param pool_block: Make threads wait for a free connection instead of opening one beyond `pool_size`.
+    :param http2: Send the requests through an httpx client with HTTP/2 (see Http2Adapter).
+        Only connection failures are retried by the transport in this mode.
+    :param archive: Write the body of every successful GET response to this page archive.
+    :param replay: Serve every request from this page archive instead of the network (see ReplayAdapter).
+        The cache and the transport options are not used in this mode.
     """
-    session = requests.Session()
-    retry = Retry(
-        total=retries,
-        read=retries,
-        connect=retries,
-        backoff_factor=backoff_factor,
-        status_forcelist=status_forcelist
-    )
-    adapter = TimeoutHTTPAdapter(max_retries=retry, timeout=timeout)
+    if replay is not None:
+        from infrastructure.scraping.replay_adapter import ReplayAdapter
+        session = requests.Session()
+        replay_adapter = ReplayAdapter(replay)
+        session.mount('http://', replay_adapter)
+        session.mount('https://', replay_adapter)
+        return session
+
+    session = CachedSession(cache) if cache is not None else requests.Session()
+    if archive is not None:
+        from infrastructure.scraping.replay_adapter import archive_responses
+        archive_responses(session, archive)
+    adapter: HTTPAdapter
+    if http2:
+        # httpxはHTTP/2を使う場合のみ必要
+        from infrastructure.scraping.http2_adapter import Http2Adapter
+        adapter = Http2Adapter(retries=retries, timeout=timeout, pool_size=pool_size)  # type: ignore
+    else:
+        retry = Retry(
+            total=retries,
+            read=retries,
+            connect=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist
+        )
+        adapter = TimeoutHTTPAdapter(max_retries=retry, timeout=timeout, pool_connections=10, pool_maxsize=pool_size, pool_block=pool_block)
     session.mount('http://', adapter)
     session.mount('https://', adapter)
     return session
+
+
+def connection_pool_stats(session: requests.Session) -> dict[str, int]:
+    """
+    Return the number of requests sent and of connections opened by the session so far.
+    The difference is the number of requests that reused a keep-alive connection.
+    """
+    requests_sent = 0
+    connections_opened = 0
+    for adapter in {id(adapter): adapter for adapter in session.adapters.values()}.values():
+        if isinstance(adapter, HTTPAdapter):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    requests_sent += pool.num_requests
+                    connections_opened += pool.num_connections
+        elif hasattr(adapter, 'num_connections'):
+            requests_sent += adapter.num_requests  # type: ignore
+            connections_opened += adapter.num_connections  # type: ignore
+    return {"requests": requests_sent, "connections": connections_opened, "reused": max(0, requests_sent - connections_opened)}
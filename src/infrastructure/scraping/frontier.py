@@ -0,0 +1,208 @@
+# src/infrastructure/scraping/frontier.py
+# -*- coding: utf-8 -*-
+
+import hashlib
+import heapq
+import itertools
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urldefrag, urlparse
+
+from domain.helpers.safe_urljoin import safe_urljoin
+
+
+# 優先度（小さいほど先に取得する）。一覧ページを詳細ページより優先し、商品の発見が止まらないようにする
+PRIORITY_LISTING: int = 0
+PRIORITY_DETAIL: int = 1
+
+
+def _digest(url: str) -> bytes:
+    return hashlib.blake2b(url.encode('utf-8'), digest_size=16).digest()
+
+
+class SeenSet:
+    """
+    Exact set of visited URLs that stores a 64-bit hash per URL instead of the URL string.
+    """
+    def __init__(self) -> None:
+        self._hashes: set[int] = set()
+
+    def add(self, url: str) -> bool:
+        """
+        Add the URL and return True if it had not been seen before.
+        """
+        key = int.from_bytes(_digest(url)[:8], 'little')
+        if key in self._hashes:
+            return False
+        self._hashes.add(key)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+
+class BloomFilter:
+    """
+    Probabilistic set of visited URLs with a fixed memory footprint.
+    A URL may be reported as seen although it was not (with probability about `error_rate`), never the opposite.
+    """
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001) -> None:
+        """
+        :param capacity: The expected number of URLs.
+        :param error_rate: The acceptable false positive rate at `capacity` URLs.
+        """
+        self._size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self._hash_count = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+        self._count = 0
+
+    def add(self, url: str) -> bool:
+        """
+        Add the URL and return True if it had (probably) not been seen before.
+        """
+        digest = _digest(url)
+        # ダブルハッシュでk個の位置を求める
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        new = False
+        for i in range(self._hash_count):
+            position = (h1 + i * h2) % self._size
+            byte, bit = divmod(position, 8)
+            if not self._bits[byte] & (1 << bit):
+                self._bits[byte] |= 1 << bit
+                new = True
+        if new:
+            self._count += 1
+        return new
+
+    def __len__(self) -> int:
+        return self._count
+
+
+@dataclass(order=True)
+class FrontierItem:
+    """
+    A URL waiting in the frontier. Items are ordered by priority, then by insertion order.
+    """
+    priority: int
+    seq: int
+    url: str = field(compare=False)
+    depth: int = field(compare=False)
+    data: Any = field(compare=False, default=None)
+
+
+class CrawlFrontier:
+    """
+    Priority queue of URLs to crawl, with one queue per host, a compact seen-set and a depth limit.
+    Every URL is accepted at most once, so a page linked from several places is fetched once.
+    The hosts are served in turn (round robin), each from its own priority queue, and a host with `max_per_host`
+    popped items that have not been released yet is skipped (politeness), so one host cannot take every worker.
+    """
+    def __init__(self, max_depth: int = 0, use_bloom_filter: bool = False, capacity: int = 1_000_000, max_per_host: int = 0) -> None:
+        """
+        :param max_depth: Maximum number of link hops from a seed. 0 means unlimited.
+        :param use_bloom_filter: Use a BloomFilter instead of an exact SeenSet for very large crawls.
+        :param capacity: The expected number of URLs, used to size the Bloom filter.
+        :param max_per_host: Maximum number of items of one host popped and not released yet. 0 means unlimited.
+        """
+        self._max_depth = max_depth
+        self._max_per_host = max_per_host
+        self._seen: SeenSet | BloomFilter = BloomFilter(capacity) if use_bloom_filter else SeenSet()
+        self._queues: dict[str, list[FrontierItem]] = {}
+        # 待ち行列のあるホストを順番に回す
+        self._hosts: deque[str] = deque()
+        self._active: dict[str, int] = {}
+        self._seq = itertools.count()
+        self._size = 0
+
+
+    def within_depth(self, depth: int) -> bool:
+        """
+        Whether a URL at the given number of link hops from the seed is within the depth limit.
+        """
+        return not self._max_depth or depth <= self._max_depth
+
+
+    @staticmethod
+    def normalize(url: str, base: str | None = None) -> str:
+        """
+        Resolve the URL against `base` with safe_urljoin and drop the fragment.
+
+        :raises ValueError: If the relative path escapes the base URL.
+        """
+        if base is not None:
+            url = safe_urljoin(base, url)
+        return urldefrag(url)[0]
+
+
+    def add(self, url: str, priority: int, depth: int = 0, base: str | None = None, data: Any = None) -> bool:
+        """
+        Queue a URL unless it was seen before or is deeper than the depth limit.
+
+        :param url: The URL, absolute or relative to `base`.
+        :param priority: PRIORITY_LISTING or PRIORITY_DETAIL (lower is fetched first).
+        :param depth: The number of link hops from the seed.
+        :param base: The URL of the page the link was found on.
+        :param data: Any data to hand back with the item when it is popped.
+        :returns: True if the URL was queued.
+        """
+        if not self.within_depth(depth):
+            return False
+        try:
+            url = self.normalize(url, base)
+        except ValueError:
+            return False
+        if not self._seen.add(url):
+            return False
+
+        host = urlparse(url).netloc
+        if host not in self._queues:
+            self._queues[host] = []
+            self._hosts.append(host)
+        heapq.heappush(self._queues[host], FrontierItem(priority, next(self._seq), url, depth, data))
+        self._size += 1
+        return True
+
+
+    def pop(self) -> FrontierItem | None:
+        """
+        Return the most urgent queued item of the next host in turn that is below its `max_per_host` limit,
+        or None if the frontier is empty or every host with queued items is at its limit.
+        Every popped item must be handed back with release() once it has been fetched.
+        """
+        for _ in range(len(self._hosts)):
+            host = self._hosts[0]
+            # 取り出したホストは末尾に回す
+            self._hosts.rotate(-1)
+            if self._max_per_host and self._active.get(host, 0) >= self._max_per_host:
+                continue
+            queue = self._queues[host]
+            item = heapq.heappop(queue)
+            if not queue:
+                del self._queues[host]
+                self._hosts.pop()
+            self._active[host] = self._active.get(host, 0) + 1
+            self._size -= 1
+            return item
+        return None
+
+
+    def release(self, item: FrontierItem) -> None:
+        """
+        Record that a popped item has been fetched, so that its host may be served again.
+        """
+        host = urlparse(item.url).netloc
+        self._active[host] -= 1
+        if not self._active[host]:
+            del self._active[host]
+
+
+    def __len__(self) -> int:
+        return self._size
+
+
+    @property
+    def seen_count(self) -> int:
+        return len(self._seen)
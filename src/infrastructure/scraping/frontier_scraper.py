@@ -0,0 +1,243 @@
+# src/infrastructure/scraping/frontier_scraper.py
+# -*- coding: utf-8 -*-
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from requests import Session
+from typing import Generator
+
+from domain.entities.category import Category
+from domain.entities.product import Product
+from infrastructure.scraping.create_retry_session import connection_pool_stats, create_retry_session
+from infrastructure.scraping.frontier import PRIORITY_DETAIL, PRIORITY_LISTING, CrawlFrontier, FrontierItem
+from infrastructure.scraping.get_soup import GetSoup, fetch_content
+from infrastructure.scraping.rate_limiter import HostRateLimiter
+from infrastructure.scraping.retry_scheduler import RetryScheduler
+from infrastructure.scraping import scraper
+from settings import logger, FRONTIER_BLOOM_CAPACITY, FRONTIER_MAX_DEPTH, FRONTIER_MAX_PER_HOST, SCRAPER_ADAPTIVE_RATE, SCRAPER_HTTP2, SCRAPER_MAX_WORKERS, SCRAPER_PARSER, SCRAPER_REQUESTS_PER_SECOND
+
+
+@dataclass
+class _CategoryCrawl:
+    """
+    The listing pages of a category discovered so far.
+    """
+    category: Category
+    pages: dict[int, tuple[str, list[str]]] = field(default_factory=dict)
+    last_page: int | None = None
+
+    def is_listed(self) -> bool:
+        return self.last_page is not None and len(self.pages) == self.last_page
+
+    def detail_urls(self) -> list[str]:
+        return [url for number in sorted(self.pages) for url in self.pages[number][1]]
+
+
+@dataclass(frozen=True)
+class _Page:
+    """
+    What a frontier item is: the top page, a listing page of a category, or a product detail page.
+    """
+    kind: str
+    category_index: int = -1
+    page_number: int = 0
+
+
+_INDEX = _Page("index")
+_DETAIL = _Page("detail")
+
+
+class _FrontierCrawl:
+    """
+    One frontier-driven crawl. The fetches run on the executor threads; everything else
+    (parsing, the frontier and the crawl state) stays on the thread consuming the generator.
+    """
+    def __init__(self, session: Session, rate_limiter: HostRateLimiter, executor: ThreadPoolExecutor, frontier: CrawlFrontier, parser: str, retry_scheduler: RetryScheduler | None = None) -> None:
+        self._session = session
+        self._rate_limiter = rate_limiter
+        self._executor = executor
+        self._frontier = frontier
+        self._parser = parser
+        self._retry_scheduler = retry_scheduler
+        # 返したカテゴリはNoneにして解放する
+        self._crawls: list[_CategoryCrawl | None] = []
+        # 複数カテゴリに掲載されている商品も一度だけ取得し、結果を使い回す
+        self._products: dict[str, Product] = {}
+        # 商品ごとに、まだ返していないカテゴリの一覧に載っている数
+        self._needed: dict[str, int] = {}
+        # 全カテゴリの一覧を読み終えるまで解放を保留する商品
+        self._unneeded: list[str] = []
+
+    def _submit(self, url: str) -> Future[bytes]:
+        if self._retry_scheduler is not None:
+            return self._retry_scheduler.submit(fetch_content, url, self._session, 5, self._rate_limiter)
+        return self._executor.submit(fetch_content, url, self._session, 5, self._rate_limiter)
+
+    @staticmethod
+    def _result(url: str, future: Future[bytes]) -> bytes | None:
+        try:
+            return future.result()
+        except Exception as e:
+            logger.error(f"Error occurred while fetching {url}: {e}", exc_info=True)
+            return None
+
+    def _handle(self, item: FrontierItem, content: bytes | None) -> None:
+        """
+        Parse a fetched page and queue the links found on it.
+        """
+        page: _Page = item.data
+        if page.kind == "detail":
+            self._products[item.url] = Product.from_fields(scraper.parse_product_fields(content, item.url, self._parser))
+            return
+
+        if page.kind == "index":
+            if content is None:
+                raise RuntimeError(f"Failed to fetch the top page: {item.url}")
+            for category in scraper._parse_category_data(GetSoup.from_content(content)):
+                self._crawls.append(_CategoryCrawl(category))
+                self._frontier.add(category.link, PRIORITY_LISTING, item.depth + 1, data=_Page("listing", len(self._crawls) - 1, 1))
+            return
+
+        crawl = self._crawls[page.category_index]
+        assert crawl is not None
+        if content is None:
+            # 一覧ページが取得できない場合は、そのカテゴリの一覧をそこで打ち切る
+            crawl.last_page = page.page_number - 1
+            return
+        soup = GetSoup.from_content(content)
+        detail_urls, next_url = scraper._parse_listing_page(soup, item.url)
+        soup.soup.decompose()
+        if not self._frontier.within_depth(item.depth + 1):
+            # 深さの上限を超える詳細ページはカテゴリに含めない
+            detail_urls = []
+        crawl.pages[page.page_number] = (item.url, detail_urls)
+        if next_url is None or not self._frontier.add(next_url, PRIORITY_LISTING, item.depth + 1, data=_Page("listing", page.category_index, page.page_number + 1)):
+            crawl.last_page = page.page_number
+        for url in detail_urls:
+            self._needed[url] = self._needed.get(url, 0) + 1
+            self._frontier.add(url, PRIORITY_DETAIL, item.depth + 1, data=_DETAIL)
+
+    def _is_complete(self, crawl: _CategoryCrawl) -> bool:
+        return crawl.is_listed() and all(url in self._products for url in crawl.detail_urls())
+
+    def _finish(self, crawl: _CategoryCrawl) -> Category:
+        """
+        Add the products of a fully crawled category in listing order.
+        """
+        category = crawl.category
+        for number in sorted(crawl.pages):
+            page_url, detail_urls = crawl.pages[number]
+            category.set_link(page_url)
+            for url in detail_urls:
+                category.add_product(self._products[url])
+        return category
+
+    def _release(self, index: int) -> None:
+        """
+        Drop a category that has been yielded, and the products that no category still to be yielded lists.
+        Products are only dropped once every listing page has been read, since a later listing page could still list them.
+        """
+        crawl = self._crawls[index]
+        self._crawls[index] = None
+        assert crawl is not None
+        for url in crawl.detail_urls():
+            self._needed[url] -= 1
+            if not self._needed[url]:
+                del self._needed[url]
+                self._unneeded.append(url)
+        if all(other is None or other.is_listed() for other in self._crawls):
+            for url in self._unneeded:
+                if url not in self._needed:
+                    self._products.pop(url, None)
+            self._unneeded = []
+
+    def _fetch_missing(self, crawl: _CategoryCrawl) -> None:
+        """
+        Fetch the detail pages of a category that the frontier rejected although they are within the depth limit,
+        i.e. Bloom filter false positives.
+        """
+        if crawl.last_page is None:
+            crawl.last_page = len(crawl.pages)
+        crawl.pages = {number: crawl.pages[number] for number in range(1, crawl.last_page + 1) if number in crawl.pages}
+        for url in crawl.detail_urls():
+            if url not in self._products:
+                content = self._result(url, self._submit(url))
+                self._products[url] = Product.from_fields(scraper.parse_product_fields(content, url, self._parser))
+
+    def run(self, start_url: str, max_in_flight: int) -> Generator[Category, None, None]:
+        """
+        Crawl from the top page and yield each category, in site order, as soon as all its products are fetched.
+        A yielded category is no longer held by the crawl.
+        """
+        self._frontier.add(start_url, PRIORITY_LISTING, 0, data=_INDEX)
+        in_flight: dict[Future[bytes], FrontierItem] = {}
+        next_index = 0
+        while True:
+            while len(in_flight) < max_in_flight and (item := self._frontier.pop()) is not None:
+                in_flight[self._submit(item.url)] = item
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = in_flight.pop(future)
+                self._frontier.release(item)
+                self._handle(item, self._result(item.url, future))
+
+            # 取得の済んだカテゴリから順に返し、保持しているカテゴリと商品を解放する
+            while next_index < len(self._crawls) and (crawl := self._crawls[next_index]) is not None and self._is_complete(crawl):
+                yield self._finish(crawl)
+                self._release(next_index)
+                next_index += 1
+
+        for index in range(next_index, len(self._crawls)):
+            crawl = self._crawls[index]
+            assert crawl is not None
+            self._fetch_missing(crawl)
+            yield self._finish(crawl)
+            self._release(index)
+
+
+def scrape_data_frontier(max_workers: int = SCRAPER_MAX_WORKERS, requests_per_second: float = SCRAPER_REQUESTS_PER_SECOND, parser: str = SCRAPER_PARSER, max_depth: int = FRONTIER_MAX_DEPTH, bloom_capacity: int = FRONTIER_BLOOM_CAPACITY, adaptive: bool = SCRAPER_ADAPTIVE_RATE, http2: bool = SCRAPER_HTTP2, max_per_host: int = FRONTIER_MAX_PER_HOST) -> Generator[Category, None, None]:
+    """
+    Scrape the website through a crawl frontier instead of the fixed category → listing → detail flow.
+    Every URL is fetched at most once, so a book listed in several categories is fetched once
+    and the same Product is added to each of them. Listing pages are fetched before detail pages.
+
+    :param max_workers: Number of pages fetched concurrently.
+    :param requests_per_second: Politeness budget per host in requests per second. 0 or less disables it.
+    :param parser: The parser used for product detail pages, "lxml" (fast) or "bs4" (BeautifulSoup).
+    :param max_depth: Maximum number of link hops from the top page. 0 means unlimited.
+        Products whose detail page is beyond the limit are left out of their category.
+    :param bloom_capacity: The expected number of URLs when a Bloom filter should be used as the seen-set. 0 uses an exact hash set.
+    :param adaptive: Adapt the request rate to the host and retry failed requests with a RetryScheduler, see scrape_data.
+    :param http2: Send the requests over HTTP/2 through httpx (see Http2Adapter).
+    :param max_per_host: Maximum number of requests in flight to one host, so that the workers are shared between hosts. 0 means unlimited.
+    """
+    if parser not in scraper.PARSERS:
+        raise ValueError(f"Unknown parser: {parser}")
+    archive, replay = scraper.create_page_archive()
+    if replay is not None:
+        requests_per_second, adaptive = 0, False
+    session = create_retry_session(retries=0 if adaptive else 3, timeout=10, cache=scraper.create_http_cache(), pool_size=max(10, max_workers), pool_block=True, http2=http2, archive=archive, replay=replay)
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="frontier")
+    frontier = CrawlFrontier(max_depth=max_depth, use_bloom_filter=bloom_capacity > 0, capacity=max(1, bloom_capacity), max_per_host=max_per_host)
+    retry_scheduler = RetryScheduler(executor) if adaptive else None
+    crawl = _FrontierCrawl(session, scraper.create_rate_limiter(requests_per_second, adaptive), executor, frontier, parser, retry_scheduler)
+
+    try:
+        yield from crawl.run(scraper.BASE_URL + "index.html", max_in_flight=max(1, max_workers) * 2)
+
+    except Exception as e:
+        print(f"Error occurred while scraping data: {e}")
+        yield Category.new(id=0, name='', link='')
+    finally:
+        if retry_scheduler is not None:
+            retry_scheduler.close()
+        executor.shutdown(wait=True)
+        stats = connection_pool_stats(session)
+        logger.info(f"HTTP connections: {stats['connections']} opened for {stats['requests']} requests.")
+        session.close()
+        if archive is not None:
+            archive.close()
+        logger.debug(f"Frontier saw {frontier.seen_count} URLs.")
@@ -2,48 +2,97 @@
 # -*- coding: utf-8 -*-
 
 import time
+
 from requests import Session
 from requests.exceptions import RequestException, Timeout, ConnectionError, HTTPError
 
 from bs4 import BeautifulSoup
 from bs4.element import ResultSet, Tag
 
-from settings import logger
+from infrastructure.metrics.metrics_registry import METRICS
+from infrastructure.scraping.create_retry_session import CachedSession
+from infrastructure.scraping.rate_limiter import HostRateLimiter, parse_retry_after
+from settings import logger, SCRAPER_REQUESTS_PER_SECOND
+
+
+# rate_limiterが指定されない場合に共有されるホスト単位の制限
+DEFAULT_RATE_LIMITER = HostRateLimiter(SCRAPER_REQUESTS_PER_SECOND)
+
+
+def fetch_content(url: str, session: Session, timeout: int = 10, rate_limiter: HostRateLimiter | None = None) -> bytes:
+    """
+    Download the raw response body of the URL.
+    The request waits for the per-host politeness budget of `rate_limiter` before it is sent,
+    unless it is served from the response cache of a CachedSession.
+    The status code and latency of the request are reported back to the rate limiter.
+    """
+    local_url = url
+    rate_limiter = rate_limiter or DEFAULT_RATE_LIMITER
+    try:
+        cached = isinstance(session, CachedSession) and session.is_fresh(local_url)
+        if not cached:
+            with METRICS.timer("rate_limit_wait"):
+                rate_limiter.acquire(local_url)
+        started = time.monotonic()
+        try:
+            with METRICS.timer("fetch"):
+                response = session.get(local_url, timeout=timeout)
+        except (ConnectionError, Timeout):
+            rate_limiter.record(local_url, 0, time.monotonic() - started)
+            METRICS.count("http_responses", status=0)
+            raise
+        METRICS.count("http_responses", status=response.status_code)
+        if not cached:
+            rate_limiter.record(local_url, response.status_code, time.monotonic() - started, parse_retry_after(response.headers.get('Retry-After')))
+        logger.debug(f"URL: {local_url}, Status Code: {response.status_code}")
+        response.raise_for_status()  # Raise an error for bad responses
+        return response.content
+    except HTTPError as e:
+        logger.error(f"HTTP error occurred. @get_soup {local_url}: {e}", exc_info=True)
+        raise e
+    except ConnectionError as e:
+        logger.error(f"Connection error occurred. @get_soup {local_url}: {e}", exc_info=True)
+        raise e
+    except Timeout as e:
+        logger.error(f"Timeout error occurred. @get_soup {local_url}: {e}", exc_info=True)
+        raise e
+    except RequestException as e:
+        logger.error(f"Request error occurred. @get_soup {local_url}: {e}", exc_info=True)
+        raise e
+    except Exception as e:
+        logger.error(f"An unexpected error occurred. @get_soup {local_url}: {e}", exc_info=True)
+        raise e
 
 
 class GetSoup:
     """
     Class to handle the creation of a BeautifulSoup object from a URL.
     """
-    def __init__(self, url: str, session: Session, timeout: int = 10):
+    def __init__(self, url: str, session: Session, timeout: int = 10, rate_limiter: HostRateLimiter | None = None):
         """
         Get the BeautifulSoup object from the URL.
+        The request waits for the per-host politeness budget of `rate_limiter` before it is sent.
         """
-        local_url = url
+        content = fetch_content(url, session, timeout, rate_limiter)
         try:
-            response = session.get(local_url, timeout=timeout)
-            logger.debug(f"URL: {local_url}, Status Code: {response.status_code}")
-            time.sleep(1)
-            response.raise_for_status()  # Raise an error for bad responses
-            soup = BeautifulSoup(response.content, 'lxml')
-            self.soup = soup
-        except HTTPError as e:
-            logger.error(f"HTTP error occurred. @get_soup {local_url}: {e}", exc_info=True)
-            raise e
-        except ConnectionError as e:
-            logger.error(f"Connection error occurred. @get_soup {local_url}: {e}", exc_info=True)
-            raise e
-        except Timeout as e:
-            logger.error(f"Timeout error occurred. @get_soup {local_url}: {e}", exc_info=True)
-            raise e
-        except RequestException as e:
-            logger.error(f"Request error occurred. @get_soup {local_url}: {e}", exc_info=True)
-            raise e
+            with METRICS.timer("soup_parse"):
+                self.soup = BeautifulSoup(content, 'lxml')
         except Exception as e:
-            logger.error(f"An unexpected error occurred. @get_soup {local_url}: {e}", exc_info=True)
+            logger.error(f"An unexpected error occurred. @get_soup {url}: {e}", exc_info=True)
             raise e
 
 
+    @classmethod
+    def from_content(cls, content: bytes) -> "GetSoup":
+        """
+        Create a GetSoup object from an already downloaded response body.
+        """
+        instance = cls.__new__(cls)
+        with METRICS.timer("soup_parse"):
+            instance.soup = BeautifulSoup(content, 'lxml')
+        return instance
+
+
     def select(self, selectors: list[str]) -> ResultSet[Tag] | list[None]:
         """
         Select elements from the soup using a CSS selector.
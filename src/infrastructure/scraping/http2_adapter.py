@@ -0,0 +1,82 @@
+# src/infrastructure/scraping/http2_adapter.py
+# -*- coding: utf-8 -*-
+
+import logging
+import threading
+
+import httpx
+import requests
+from requests.adapters import BaseAdapter
+from requests.exceptions import ConnectionError, RequestException, Timeout
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+# httpxはリクエストごとにINFOログを出すため抑制する
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+class Http2Adapter(BaseAdapter):
+    """
+    Transport adapter that sends the requests of a requests.Session through an httpx client with HTTP/2 enabled.
+    Over HTTPS all requests to a host are multiplexed over a single connection; hosts without HTTP/2
+    fall back to pooled HTTP/1.1 keep-alive connections. Status retries are left to the caller (RetryScheduler).
+    Requires the optional dependency `httpx[http2]`.
+    """
+    def __init__(self, retries: int = 3, timeout: float = 10, pool_size: int = 10) -> None:
+        """
+        :param retries: Number of retries of failed connection attempts.
+        :param timeout: The default timeout in seconds.
+        :param pool_size: Maximum number of connections kept open.
+        """
+        super().__init__()
+        self.timeout = timeout
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        self._client = httpx.Client(http2=True, limits=limits, transport=httpx.HTTPTransport(http2=True, retries=retries, limits=limits))
+        self._lock = threading.Lock()
+        self.num_requests = 0
+        self.num_connections = 0
+
+
+    def _trace(self, event_name: str, info: dict) -> None:
+        # 新しいTCP接続が張られた回数を数える
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.num_connections += 1
+
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        try:
+            response = self._client.request(
+                request.method,
+                request.url,
+                headers={name: value for name, value in request.headers.items() if name.lower() != 'connection'},
+                content=request.body,
+                timeout=timeout if timeout is not None else self.timeout,
+                extensions={"trace": self._trace}
+            )
+        except httpx.TimeoutException as e:
+            raise Timeout(e, request=request)
+        except httpx.TransportError as e:
+            raise ConnectionError(e, request=request)
+        except httpx.HTTPError as e:
+            raise RequestException(e, request=request)
+        with self._lock:
+            self.num_requests += 1
+
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.headers = CaseInsensitiveDict(response.headers)
+        result.encoding = get_encoding_from_headers(result.headers)
+        result.reason = response.reason_phrase
+        result.url = request.url
+        result.request = request
+        result.connection = self
+        result._content = response.content
+        return result
+
+
+    def close(self) -> None:
+        self._client.close()
@@ -0,0 +1,181 @@
+# src/infrastructure/scraping/http_cache.py
+# -*- coding: utf-8 -*-
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from settings import logger
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """
+    Metadata of a cached response. The body is stored separately and read on demand.
+    """
+    url: str
+    etag: str | None
+    last_modified: str | None
+    content_type: str | None
+    stored_at: float
+    key: str
+
+
+class HttpCache:
+    """
+    On-disk response cache keyed by URL.
+    Each entry is a small JSON metadata file plus a gzip-compressed body file, so single entries
+    are read back without loading the cache into memory. When the total size exceeds `max_bytes`,
+    the least recently used entries are evicted.
+    """
+    def __init__(self, cache_dir: str, ttl: float = 86400.0, max_bytes: int = 512 * 1024 * 1024) -> None:
+        """
+        Initialize the HttpCache.
+
+        :param cache_dir: The directory of the cache. It is created if it does not exist.
+        :param ttl: Seconds an entry is served without revalidation. 0 always revalidates.
+        :param max_bytes: Maximum total size of the cache files in bytes.
+        """
+        self._cache_dir = cache_dir
+        self._ttl = ttl
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._scan())
+
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+    def _path(self, key: str, suffix: str) -> str:
+        # 1ディレクトリのファイル数が増えすぎないよう先頭2文字で分ける
+        return os.path.join(self._cache_dir, key[:2], key + suffix)
+
+
+    def _scan(self) -> list[tuple[str, int, float]]:
+        """
+        Return (key, size of the entry files, last access time) for every entry on disk.
+        """
+        entries: dict[str, tuple[int, float]] = {}
+        for directory in os.scandir(self._cache_dir):
+            if not directory.is_dir():
+                continue
+            for file in os.scandir(directory.path):
+                key, _ = os.path.splitext(file.name)
+                stat = file.stat()
+                size, accessed = entries.get(key, (0, 0.0))
+                entries[key] = (size + stat.st_size, max(accessed, stat.st_mtime))
+        return [(key, size, accessed) for key, (size, accessed) in entries.items()]
+
+
+    def lookup(self, url: str) -> CacheEntry | None:
+        """
+        Return the metadata of the cached response of the URL, or None if it is not cached.
+        """
+        key = self._key(url)
+        try:
+            with open(self._path(key, ".json"), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url or not os.path.exists(self._path(key, ".gz")):
+            return None
+        return CacheEntry(url=url, etag=meta.get("etag"), last_modified=meta.get("last_modified"), content_type=meta.get("content_type"), stored_at=meta["stored_at"], key=key)
+
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """
+        Whether the entry is younger than the TTL and can be served without revalidation.
+        """
+        return time.time() - entry.stored_at < self._ttl
+
+
+    @staticmethod
+    def conditional_headers(entry: CacheEntry) -> dict[str, str]:
+        """
+        Return the If-None-Match / If-Modified-Since headers to revalidate the entry.
+        """
+        headers: dict[str, str] = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+
+    def read_body(self, entry: CacheEntry) -> bytes:
+        """
+        Read and decompress the body of the entry, and mark it as recently used.
+        """
+        path = self._path(entry.key, ".gz")
+        with gzip.open(path, 'rb') as f:
+            body = f.read()
+        os.utime(path)
+        return body
+
+
+    def _write_meta(self, key: str, meta: dict[str, object]) -> None:
+        path = self._path(key, ".json")
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(temp_path, path)
+
+
+    def touch(self, entry: CacheEntry) -> None:
+        """
+        Restart the TTL of an entry after a successful revalidation (304 Not Modified).
+        """
+        self._write_meta(entry.key, {"url": entry.url, "etag": entry.etag, "last_modified": entry.last_modified, "content_type": entry.content_type, "stored_at": time.time()})
+
+
+    def store(self, url: str, body: bytes, etag: str | None, last_modified: str | None, content_type: str | None = None) -> None:
+        """
+        Store a response body and its validators.
+        """
+        key = self._key(url)
+        os.makedirs(os.path.join(self._cache_dir, key[:2]), exist_ok=True)
+        body_path = self._path(key, ".gz")
+        old_size = sum(os.path.getsize(path) for path in (body_path, self._path(key, ".json")) if os.path.exists(path))
+
+        temp_path = f"{body_path}.{threading.get_ident()}.tmp"
+        with gzip.open(temp_path, 'wb', compresslevel=6) as f:
+            f.write(body)
+        os.replace(temp_path, body_path)
+        self._write_meta(key, {"url": url, "etag": etag, "last_modified": last_modified, "content_type": content_type, "stored_at": time.time()})
+
+        new_size = os.path.getsize(body_path) + os.path.getsize(self._path(key, ".json"))
+        with self._lock:
+            self._total_bytes += new_size - old_size
+            over_limit = self._total_bytes > self._max_bytes
+        if over_limit:
+            self._evict()
+
+
+    def _evict(self) -> None:
+        """
+        Remove the least recently used entries until the cache is below 90% of `max_bytes`.
+        """
+        with self._lock:
+            entries = sorted(self._scan(), key=lambda entry: entry[2])
+            total = sum(size for _, size, _ in entries)
+            target = self._max_bytes * 0.9
+            removed = 0
+            for key, size, _ in entries:
+                if total <= target:
+                    break
+                for suffix in (".json", ".gz"):
+                    try:
+                        os.remove(self._path(key, suffix))
+                    except FileNotFoundError:
+                        pass
+                total -= size
+                removed += 1
+            self._total_bytes = total
+        logger.debug(f"Evicted {removed} entries from the HTTP cache.")
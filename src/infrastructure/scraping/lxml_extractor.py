@@ -0,0 +1,75 @@
+# src/infrastructure/scraping/lxml_extractor.py
+# -*- coding: utf-8 -*-
+
+import re
+import threading
+
+from lxml import etree
+
+from domain.entities.product import ProductFields
+
+
+# セレクタはインポート時に一度だけコンパイルする
+_ID_PATTERN = re.compile(r'\w+_(\d+)\/index\.html$')
+_PRODUCT_MAIN = etree.XPath('(//div[contains(concat(" ", normalize-space(@class), " "), " product_main ")])[1]')
+_NAME = etree.XPath('string(.//h1)')
+_STAR_RATING_CLASS = etree.XPath('string(.//p[contains(concat(" ", normalize-space(@class), " "), " star-rating ")]/@class)')
+_TABLE_ROWS = etree.XPath('(//table[contains(concat(" ", normalize-space(@class), " "), " table ")])[1]//tr')
+_DESCRIPTION = etree.XPath('string(//*[@id="product_description"]/following-sibling::p[1])')
+
+# lxmlのパーサーはスレッド間で共有できないため、スレッドごとに生成する
+_local = threading.local()
+
+
+def _parser() -> etree.HTMLParser:
+    parser = getattr(_local, "parser", None)
+    if parser is None:
+        parser = etree.HTMLParser(encoding="utf-8")
+        _local.parser = parser
+    return parser
+
+
+def extract_product_fields(content: bytes, url: str) -> ProductFields:
+    """
+    Extract the raw fields of a product detail page in the argument order of Product.new.
+    The page is parsed once and the information table is walked in a single pass into a header to value map.
+
+    :param content: The raw response body of the detail page.
+    :param url: The URL of the detail page.
+    :raises ValueError: If the page does not look like a product detail page.
+    """
+    root = etree.fromstring(content, _parser())
+    if root is None:
+        raise ValueError(f"Empty document: {url}")
+
+    product_main = _PRODUCT_MAIN(root)
+    if not product_main:
+        raise ValueError(f"Product main section not found: {url}")
+
+    table: dict[str, str] = {}
+    for row in _TABLE_ROWS(root):
+        th = row.find("th")
+        td = row.find("td")
+        if th is not None and td is not None:
+            table["".join(th.itertext()).strip()] = "".join(td.itertext()).strip()
+
+    match = _ID_PATTERN.search(url)
+    id = match.group(1) if match else ''
+    name = _NAME(product_main[0]).strip()
+    star_rating = next((c for c in _STAR_RATING_CLASS(product_main[0]).split() if c != 'star-rating'), '')
+    description = _DESCRIPTION(root).strip()
+
+    return (
+        id,
+        name,
+        table["UPC"],
+        table["Product Type"],
+        table["Price (excl. tax)"],
+        table["Price (incl. tax)"],
+        table["Tax"],
+        table["Availability"],
+        table["Number of reviews"],
+        star_rating,
+        description,
+        url,
+    )
@@ -0,0 +1,214 @@
+# src/infrastructure/scraping/page_archive.py
+# -*- coding: utf-8 -*-
+
+import email.utils
+import gzip
+import mmap
+import os
+import threading
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore
+
+
+COMPRESSIONS: tuple[str, ...] = ("gzip", "zstd")
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _zstandard():
+    # zstdはzstandardパッケージがある場合のみ使える
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstd compression requires the zstandard package (pip install zstandard).") from e
+    return zstandard
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        return _zstandard().ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def _decompress(data: bytes) -> bytes:
+    if data[:4] == _ZSTD_MAGIC:
+        return _zstandard().ZstdDecompressor().decompress(data)
+    if data[:2] == _GZIP_MAGIC:
+        return gzip.decompress(data)
+    raise ValueError("Unknown compression of an archive record.")
+
+
+@dataclass(frozen=True)
+class ArchivedPage:
+    """
+    A response body stored in a page archive, with the headers needed to serve it again.
+    """
+    url: str
+    status_code: int
+    content_type: str | None
+    fetched_at: str
+    body: bytes
+
+
+def _encode_record(page: ArchivedPage) -> bytes:
+    # WARCに倣い、レコードごとにヘッダーと本文を並べる
+    headers = [
+        "WARC/1.0",
+        "WARC-Type: response",
+        f"WARC-Target-URI: {page.url}",
+        f"WARC-Date: {page.fetched_at}",
+        f"X-Status-Code: {page.status_code}",
+    ]
+    if page.content_type:
+        headers.append(f"Content-Type: {page.content_type}")
+    headers.append(f"Content-Length: {len(page.body)}")
+    return ("\r\n".join(headers) + "\r\n\r\n").encode('utf-8') + page.body
+
+
+def _decode_record(data: bytes) -> ArchivedPage:
+    head, _, body = data.partition(b"\r\n\r\n")
+    fields: dict[str, str] = {}
+    for line in head.decode('utf-8').split("\r\n")[1:]:
+        name, _, value = line.partition(": ")
+        fields[name] = value
+    return ArchivedPage(
+        url=fields["WARC-Target-URI"],
+        status_code=int(fields.get("X-Status-Code", "200")),
+        content_type=fields.get("Content-Type"),
+        fetched_at=fields.get("WARC-Date", ""),
+        body=body[:int(fields["Content-Length"])] if "Content-Length" in fields else body
+    )
+
+
+def _index_path(path: str) -> str:
+    return path + ".idx"
+
+
+class PageArchiveWriter:
+    """
+    Append-only archive of raw response bodies, in a WARC-like layout.
+    Every record is compressed on its own (gzip, or zstd with the zstandard package), so that it can be read back
+    without decompressing the rest of the file, and its offset and length are appended to an index file next to it.
+    Writes are serialised with a file lock, so the same archive can be written by several threads and processes.
+    """
+    def __init__(self, path: str, compression: str = "gzip") -> None:
+        """
+        Open (or create) the archive for appending.
+
+        :param path: The archive file. The index is written to `path` + ".idx".
+        :param compression: "gzip" or "zstd".
+        """
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {compression}. Choose from {COMPRESSIONS}")
+        if compression == "zstd":
+            _zstandard()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._compression = compression
+        self._lock = threading.Lock()
+        self._data = open(path, 'ab')
+        self._index = open(_index_path(path), 'ab')
+
+
+    def write(self, url: str, body: bytes, status_code: int = 200, content_type: str | None = None, aliases: Iterable[str] = ()) -> None:
+        """
+        Append a response body to the archive. A later record of the same URL replaces the earlier one on replay.
+
+        :param aliases: Other URLs indexed to the same record, e.g. the URL requested before a redirect.
+        """
+        page = ArchivedPage(url, status_code, content_type, email.utils.formatdate(usegmt=True), body)
+        record = _compress(_encode_record(page), self._compression)
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(self._data.fileno(), fcntl.LOCK_EX)
+            try:
+                offset = self._data.seek(0, os.SEEK_END)
+                self._data.write(record)
+                self._data.flush()
+                # インデックスは本文の書き込み後に追記するので、途中で止まっても壊れたレコードを指さない
+                self._index.write("".join(f"{offset}\t{len(record)}\t{key}\n" for key in dict.fromkeys((url, *aliases))).encode('utf-8'))
+                self._index.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._data.fileno(), fcntl.LOCK_UN)
+
+
+    def close(self) -> None:
+        with self._lock:
+            self._data.close()
+            self._index.close()
+
+
+class PageArchive:
+    """
+    Read-only view of a page archive. The archive file is memory-mapped, and a page is read by decompressing
+    only its own record, found through the offset index.
+    """
+    def __init__(self, path: str) -> None:
+        """
+        Open the archive written by PageArchiveWriter.
+
+        :param path: The archive file.
+        """
+        self.path = path
+        self._offsets: dict[str, tuple[int, int]] = {}
+        with open(_index_path(path), 'rb') as f:
+            for line in f:
+                fields = line.rstrip(b"\n").split(b"\t", 2)
+                if len(fields) == 3:
+                    self._offsets[fields[2].decode('utf-8')] = (int(fields[0]), int(fields[1]))
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._offsets
+
+
+    def urls(self) -> Iterator[str]:
+        """
+        Iterate over the archived URLs, in the order they were first written.
+        """
+        return iter(self._offsets)
+
+
+    def get(self, url: str) -> ArchivedPage | None:
+        """
+        Return the latest archived response of the URL, or None if it has not been archived.
+        """
+        location = self._offsets.get(url)
+        if location is None or self._mmap is None:
+            return None
+        offset, length = location
+        return _decode_record(_decompress(self._mmap[offset:offset + length]))
+
+
+    def __iter__(self) -> Iterator[ArchivedPage]:
+        # 別名で索引されたレコードは一度だけ返す
+        seen: set[tuple[int, int]] = set()
+        for url, location in self._offsets.items():
+            if location in seen:
+                continue
+            seen.add(location)
+            page = self.get(url)
+            if page is not None:
+                yield page
+
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
@@ -0,0 +1,180 @@
+# src/infrastructure/scraping/rate_limiter.py
+# -*- coding: utf-8 -*-
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+
+# 混雑を示すステータスコード。受け取ったら送信レートを下げる
+THROTTLE_STATUSES: tuple[int, ...] = (429, 503)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a Retry-After header, given either in seconds or as an HTTP date, into seconds from now.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostRateLimiter:
+    """
+    Thread-safe politeness budget that spaces out requests to the same host.
+    Each host is allowed at most `requests_per_second` requests; different hosts do not block each other.
+    """
+    def __init__(self, requests_per_second: float = 1.0) -> None:
+        """
+        Initialize the HostRateLimiter.
+
+        :param requests_per_second: Maximum requests per second per host. 0 or less disables the limit.
+        """
+        self._interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+
+    def _reserve(self, url: str) -> float:
+        """
+        Reserve the next slot for the host of the given URL and return the seconds to wait for it.
+        """
+        if self._interval <= 0:
+            return 0.0
+
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self._interval
+        return slot - now
+
+
+    def acquire(self, url: str) -> None:
+        """
+        Block until a request to the host of the given URL is allowed.
+        """
+        wait = self._reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+
+
+    async def acquire_async(self, url: str) -> None:
+        """
+        Wait without blocking the event loop until a request to the host of the given URL is allowed.
+        """
+        wait = self._reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+    def record(self, url: str, status_code: int, latency: float, retry_after: float | None = None) -> None:
+        """
+        Report the outcome of a request to the host of the given URL. The fixed budget ignores it.
+        """
+        return None
+
+
+@dataclass
+class _HostBucket:
+    rate: float
+    tokens: float
+    updated: float
+    blocked_until: float = 0.0
+    baseline_latency: float | None = None
+
+
+class AdaptiveRateLimiter(HostRateLimiter):
+    """
+    Per-host token bucket whose rate adapts to the health of the host (additive increase, multiplicative decrease).
+    The rate grows by `increase` requests per second after every healthy response, up to `max_requests_per_second`.
+    It is halved on 429/503, reduced slightly when the latency rises well above its baseline,
+    and no request is sent to the host before the time given by a Retry-After header.
+    """
+    def __init__(self, requests_per_second: float = 1.0, max_requests_per_second: float = 20.0, min_requests_per_second: float = 0.2, increase: float = 0.5, burst: float = 1.0) -> None:
+        """
+        Initialize the AdaptiveRateLimiter.
+
+        :param requests_per_second: The initial rate per host.
+        :param max_requests_per_second: The rate is never raised above this.
+        :param min_requests_per_second: The rate is never lowered below this.
+        :param increase: Requests per second added after each healthy response.
+        :param burst: The bucket size, i.e. how many requests may be sent at once after an idle period.
+        """
+        super().__init__(requests_per_second)
+        self._initial = max(requests_per_second, min_requests_per_second)
+        self._max = max_requests_per_second
+        self._min = min_requests_per_second
+        self._increase = increase
+        self._burst = burst
+        self._buckets: dict[str, _HostBucket] = {}
+
+
+    def _bucket(self, host: str, now: float) -> _HostBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _HostBucket(rate=self._initial, tokens=self._burst, updated=now)
+        return bucket
+
+
+    def _reserve(self, url: str) -> float:
+        """
+        Take a token for the host of the given URL and return the seconds to wait until it is available.
+        The token count may go negative; later callers then queue up behind the earlier reservations.
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+            bucket.tokens = min(self._burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+            bucket.updated = now
+            bucket.tokens -= 1.0
+            wait = -bucket.tokens / bucket.rate if bucket.tokens < 0 else 0.0
+            return max(wait, bucket.blocked_until - now)
+
+
+    def record(self, url: str, status_code: int, latency: float, retry_after: float | None = None) -> None:
+        """
+        Adapt the rate of the host of the given URL to the outcome of a request.
+
+        :param status_code: The HTTP status code, or 0 if the request failed without a response.
+        :param latency: The seconds the request took.
+        :param retry_after: The delay requested by a Retry-After header, if any.
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+            if retry_after is not None:
+                bucket.blocked_until = max(bucket.blocked_until, now + retry_after)
+
+            if status_code in THROTTLE_STATUSES or status_code == 0 or status_code >= 500:
+                bucket.rate = max(self._min, bucket.rate / 2)
+            elif bucket.baseline_latency is not None and latency > bucket.baseline_latency * 2:
+                # 応答が遅くなってきたら少しだけ下げる
+                bucket.rate = max(self._min, bucket.rate * 0.9)
+            else:
+                bucket.rate = min(self._max, bucket.rate + self._increase)
+
+            # 指数移動平均で平常時の応答時間を覚えておく
+            if 200 <= status_code < 400:
+                baseline = bucket.baseline_latency
+                bucket.baseline_latency = latency if baseline is None else baseline * 0.9 + latency * 0.1
+
+
+    def rate(self, url: str) -> float:
+        """
+        The current rate in requests per second for the host of the given URL.
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            return self._bucket(host, time.monotonic()).rate
@@ -0,0 +1,81 @@
+# src/infrastructure/scraping/replay_adapter.py
+# -*- coding: utf-8 -*-
+
+import threading
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from infrastructure.scraping.page_archive import PageArchive, PageArchiveWriter
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Transport adapter that serves the requests of a requests.Session from a PageArchive instead of the network.
+    URLs missing from the archive are answered with 404 Not Found, so that they fail like a broken link.
+    """
+    def __init__(self, archive: PageArchive) -> None:
+        """
+        :param archive: The archive to serve the pages from.
+        """
+        super().__init__()
+        self.archive = archive
+        self._lock = threading.Lock()
+        self.num_requests = 0
+        self.num_connections = 0
+
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        page = self.archive.get(request.url) if request.method == 'GET' else None
+        with self._lock:
+            self.num_requests += 1
+
+        result = requests.Response()
+        result.url = request.url
+        result.request = request
+        result.connection = self
+        if page is None:
+            result.status_code = 404
+            result.reason = "Not Archived"
+            result._content = b""
+            return result
+        result.status_code = page.status_code
+        result.reason = "OK" if page.status_code == 200 else ""
+        result.headers = CaseInsensitiveDict({"Content-Type": page.content_type} if page.content_type else {})
+        result.encoding = get_encoding_from_headers(result.headers)
+        result._content = page.body
+        return result
+
+
+    def close(self) -> None:
+        self.archive.close()
+
+
+def archive_responses(session: requests.Session, writer: PageArchiveWriter) -> None:
+    """
+    Write the body of every successful GET response of the session to the archive, through a response hook.
+    A redirected response is indexed under the URL that was requested as well as its final URL,
+    since a replay asks for the requested URL.
+    """
+    # リダイレクト先のURLから最初に要求したURLへの対応（フックの時点ではresponse.historyがまだ空のため）
+    redirected: dict[str, set[str]] = {}
+    lock = threading.Lock()
+
+    def hook(response: requests.Response, *args, **kwargs) -> None:
+        if response.request is not None and response.request.method != 'GET':
+            return
+        if response.is_redirect:
+            target = urljoin(response.url, session.get_redirect_target(response))
+            with lock:
+                requested = redirected.pop(response.url, set()) | {response.url}
+                redirected.setdefault(target, set()).update(requested)
+            return
+        with lock:
+            requested = redirected.pop(response.url, set())
+        if response.status_code == 200:
+            writer.write(response.url, response.content, response.status_code, response.headers.get('Content-Type'), aliases=sorted(requested))
+
+    session.hooks['response'].append(hook)
@@ -0,0 +1,126 @@
+# src/infrastructure/scraping/retry_scheduler.py
+# -*- coding: utf-8 -*-
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from requests.exceptions import ConnectionError, HTTPError, Timeout
+
+from infrastructure.scraping.rate_limiter import parse_retry_after
+from settings import logger
+
+
+class RetryScheduler:
+    """
+    Runs requests on an executor and retries failed ones after an exponential backoff.
+    A failed attempt does not sleep on its worker thread: the retry is put on a timer queue
+    and resubmitted to the executor when it is due, so the worker is free for other requests meanwhile.
+    """
+    def __init__(self, executor: ThreadPoolExecutor, retries: int = 3, backoff_factor: float = 0.5, status_forcelist: tuple[int, ...] = (429, 500, 502, 503, 504)) -> None:
+        """
+        Initialize the RetryScheduler.
+
+        :param executor: The executor running the attempts.
+        :param retries: Maximum number of retries after the first attempt.
+        :param backoff_factor: The n-th retry waits backoff_factor * 2 ** (n - 1) seconds, or longer if the server sent Retry-After.
+        :param status_forcelist: HTTP status codes that are retried. Connection errors and timeouts are always retried.
+        """
+        self._executor = executor
+        self._retries = retries
+        self._backoff_factor = backoff_factor
+        self._status_forcelist = status_forcelist
+        # (期限, 順番, 再送する処理, 呼び出し元に返したFuture)
+        self._timers: list[tuple[float, int, Callable[[], None], Future[Any]]] = []
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run_timers, name="retry-scheduler", daemon=True)
+        self._thread.start()
+
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float | None:
+        """
+        Return the seconds to wait before retrying after the given error, or None if it should not be retried.
+        """
+        if attempt >= self._retries:
+            return None
+        delay = self._backoff_factor * (2 ** attempt)
+        if isinstance(error, HTTPError):
+            response = error.response
+            if response is None or response.status_code not in self._status_forcelist:
+                return None
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            return max(delay, retry_after) if retry_after is not None else delay
+        if isinstance(error, (ConnectionError, Timeout)):
+            return delay
+        return None
+
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future[Any]:
+        """
+        Run fn(*args, **kwargs) on the executor, retrying it on retryable errors.
+
+        :returns: A future with the result of the first successful attempt, or the error of the last attempt.
+        """
+        result: Future[Any] = Future()
+
+        def attempt(number: int) -> None:
+            try:
+                result.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                delay = self._retry_delay(e, number)
+                if delay is None:
+                    result.set_exception(e)
+                    return
+                logger.debug(f"Retrying in {delay:.2f}s (retry {number + 1}/{self._retries}): {e}")
+                self._schedule(delay, lambda: self._executor.submit(attempt, number + 1), result)
+
+        self._executor.submit(attempt, 0)
+        return result
+
+
+    def _schedule(self, delay: float, callback: Callable[[], None], result: Future[Any]) -> None:
+        with self._condition:
+            if self._closed:
+                result.set_exception(CancelledError("The retry scheduler was closed before the retry was due."))
+                return
+            heapq.heappush(self._timers, (time.monotonic() + delay, next(self._seq), callback, result))
+            self._condition.notify()
+
+
+    def _run_timers(self) -> None:
+        with self._condition:
+            while not self._closed:
+                if not self._timers:
+                    self._condition.wait()
+                    continue
+                due, _, callback, result = self._timers[0]
+                now = time.monotonic()
+                if due > now:
+                    self._condition.wait(due - now)
+                    continue
+                heapq.heappop(self._timers)
+                try:
+                    callback()
+                except RuntimeError as e:
+                    # executorが既に停止している。待っている呼び出し元に失敗を伝える
+                    logger.warning(f"Could not resubmit a retry: {e}")
+                    result.set_exception(e)
+
+
+    def close(self) -> None:
+        """
+        Stop the timer thread. Retries that are not yet due are dropped,
+        and their futures fail with CancelledError so that no caller waits on them forever.
+        """
+        with self._condition:
+            self._closed = True
+            pending, self._timers = self._timers, []
+            self._condition.notify()
+        self._thread.join()
+        for _, _, _, result in pending:
+            result.set_exception(CancelledError("The retry scheduler was closed before the retry was due."))
@@ -1,152 +1,468 @@
 # src/infrastructure/scraping/scraper.py
 # -*- coding: utf-8 -*-
 import re
+import time
 
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
 from lxml import etree
 from requests import Session
-from typing import Generator
+from typing import Generator, Iterator
 from urllib.parse import urljoin, urlparse, urlunparse
 
 from domain.entities.category import Category
-from domain.entities.product import Product
+from domain.entities.product import Product, ProductFields
 from domain.helpers.safe_urljoin import safe_urljoin
-from infrastructure.scraping.create_retry_session import create_retry_session
-from infrastructure.scraping.get_soup import GetSoup
-from settings import logger
+from infrastructure.metrics.metrics_registry import METRICS
+from infrastructure.scraping.crawl_checkpoint import CrawlCheckpoint
+from infrastructure.scraping.crawl_state import CrawlStateIndex, ProductState, content_hash
+from infrastructure.scraping.create_retry_session import connection_pool_stats, create_retry_session
+from infrastructure.scraping.get_soup import GetSoup, fetch_content
+from infrastructure.scraping.http_cache import HttpCache
+from infrastructure.scraping.lxml_extractor import extract_product_fields
+from infrastructure.scraping.page_archive import PageArchive, PageArchiveWriter
+from infrastructure.scraping.rate_limiter import AdaptiveRateLimiter, HostRateLimiter
+from infrastructure.scraping.retry_scheduler import RetryScheduler
+from settings import logger, HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES, HTTP_CACHE_TTL, INCREMENTAL_MAX_AGE, INCREMENTAL_STATE_PATH, PAGE_ARCHIVE_COMPRESSION, PAGE_ARCHIVE_PATH, PAGE_ARCHIVE_REPLAY, SCRAPER_ADAPTIVE_RATE, SCRAPER_BASE_URL, SCRAPER_HTTP2, SCRAPER_MAX_REQUESTS_PER_SECOND, SCRAPER_MAX_WORKERS, SCRAPER_PARSE_PROCESSES, SCRAPER_PARSER, SCRAPER_REQUESTS_PER_SECOND, SCRAPER_SHARED_PRODUCTS
 
 
-BASE_URL: str = "https://books.toscrape.com/"
+BASE_URL: str = SCRAPER_BASE_URL
+PARSERS: tuple[str, ...] = ("lxml", "bs4")
 
 
-def _get_category_data(session: Session, url: str) -> list[Category]:
+def _parse_category_data(soup: GetSoup) -> list[Category]:
     """
-    Get category data from the given URL and return a list of Category objects.
+    Parse the category list of the top page and return a list of Category objects.
     """
-    try:
-        soup = GetSoup(url, session, timeout=5)
-        elements = soup.select(['.nav-list>li>ul>li>a'])
+    elements = soup.select(['.nav-list>li>ul>li>a'])
 
-        categories: list[Category] = []
-        for element in elements:
-            if element is None:
-                continue
-            title = element.text.strip()
-            link = element.get('href')
-            id_match = re.search(r'\w+_(\d+)\/index\.html$', link)
-            if title and link and id_match:
-                link = BASE_URL + link
-                category = Category.new(id=int(id_match.group(1)), name=title, link=link)
-                categories.append(category)
-
-        return categories
+    categories: list[Category] = []
+    for element in elements:
+        if element is None:
+            continue
+        title = element.text.strip()
+        link = element.get('href')
+        id_match = re.search(r'\w+_(\d+)\/index\.html$', link)
+        if title and link and id_match:
+            link = BASE_URL + link
+            category = Category.new(id=int(id_match.group(1)), name=title, link=link)
+            categories.append(category)
 
-    except Exception as e:
-        logger.error(f"Error occurred while getting category data: {e}", exc_info=True)
-        raise e
+    return categories
 
 
-def _get_product_details(session: Session, url: str) -> Product:
+def _extract_product_fields(soup: GetSoup, url: str) -> ProductFields:
     """
-    Get product details from the given URL and return a Product object.
+    Extract the raw fields of a product detail page in the argument order of Product.new.
     """
-    try:
-        soup = GetSoup(url, session, timeout=5)
-        match = re.search(r'\w+_(\d+)\/index\.html$', url)
-        id = match.group(1) if match else ''
-        name = soup.select_one(['.product_main h1']).text.strip() # type: ignore
-
-        # Extracting Table Data
-        table = soup.select_one(['table.table'])
-        dom = etree.HTML(str(table)) # type: ignore
-        upc = dom.xpath('//tr[th[contains(text(), "UPC")]]/td/text()')[0].strip()
-        product_type = dom.xpath('//tr[th[contains(text(), "Product Type")]]/td/text()')[0].strip()
-        price_excl_tax = dom.xpath('//tr[th[contains(text(), "Price (excl. tax)")]]/td/text()')[0].strip()
-        price_incl_tax = dom.xpath('//tr[th[contains(text(), "Price (incl. tax)")]]/td/text()')[0].strip()
-        tax = dom.xpath('//tr[th[contains(text(), "Tax")]]/td/text()')[0].strip()
-        availability = dom.xpath('//tr[th[contains(text(), "Availability")]]/td/text()')[0].strip()
-        number_of_reviews = dom.xpath('//tr[th[contains(text(), "Number of reviews")]]/td/text()')[0].strip()
-
-        # Extracting star rating number
-        elm = soup.select_one(['.product_main p.star-rating'])
-        classes = elm.get('class', "") if elm else ""
-        star_rating = [c for c in classes if c != 'star-rating'][0] if classes else ''
-
-        description_element = soup.select_one(['#product_description'])
-        description = description_element.find_next_sibling("p").text.strip() if description_element else ''
-
-        link = url
-
-        return Product.new(
-            id=id,
-            name=name,
-            upc=upc,
-            product_type=product_type,
-            price_excl_tax=price_excl_tax,
-            price_incl_tax=price_incl_tax,
-            tax=tax,
-            availability=availability,
-            number_of_reviews=number_of_reviews,
-            star_rating=star_rating,
-            description=description,
-            link=link
-        )
+    match = re.search(r'\w+_(\d+)\/index\.html$', url)
+    id = match.group(1) if match else ''
+    name = soup.select_one(['.product_main h1']).text.strip() # type: ignore
+
+    # Extracting Table Data
+    table = soup.select_one(['table.table'])
+    dom = etree.HTML(str(table)) # type: ignore
+    upc = dom.xpath('//tr[th[contains(text(), "UPC")]]/td/text()')[0].strip()
+    product_type = dom.xpath('//tr[th[contains(text(), "Product Type")]]/td/text()')[0].strip()
+    price_excl_tax = dom.xpath('//tr[th[contains(text(), "Price (excl. tax)")]]/td/text()')[0].strip()
+    price_incl_tax = dom.xpath('//tr[th[contains(text(), "Price (incl. tax)")]]/td/text()')[0].strip()
+    tax = dom.xpath('//tr[th[contains(text(), "Tax")]]/td/text()')[0].strip()
+    availability = dom.xpath('//tr[th[contains(text(), "Availability")]]/td/text()')[0].strip()
+    number_of_reviews = dom.xpath('//tr[th[contains(text(), "Number of reviews")]]/td/text()')[0].strip()
+
+    # Extracting star rating number
+    elm = soup.select_one(['.product_main p.star-rating'])
+    classes = elm.get('class', "") if elm else ""
+    star_rating = [c for c in classes if c != 'star-rating'][0] if classes else ''
+
+    description_element = soup.select_one(['#product_description'])
+    description = description_element.find_next_sibling("p").text.strip() if description_element else ''
+
+    link = url
+
+    return (id, name, upc, product_type, price_excl_tax, price_incl_tax, tax, availability, number_of_reviews, star_rating, description, link)
+
+
+def _empty_fields(url: str) -> ProductFields:
+    """
+    Return the placeholder fields used when a detail page could not be scraped.
+    """
+    return ('', '', '', '', '', '', '', '', '', '', '', url)
+
+
+def _extract_fields(content: bytes, url: str, parser: str = SCRAPER_PARSER) -> ProductFields:
+    """
+    Extract the raw fields of a downloaded product detail page with the selected parser.
+
+    :param content: The raw response body of the detail page.
+    :param url: The URL of the detail page.
+    :param parser: "lxml" for the single-pass lxml extractor, "bs4" for the BeautifulSoup path.
+        The BeautifulSoup path is also used as a fallback when the lxml extractor fails.
+    """
+    if parser == "lxml":
+        try:
+            with METRICS.timer("extract", parser="lxml"):
+                return extract_product_fields(content, url)
+        except Exception as e:
+            logger.warning(f"lxml extractor failed, falling back to BeautifulSoup. {url}: {e}")
+            METRICS.count("extract_fallbacks")
+    soup = GetSoup.from_content(content)
+    with METRICS.timer("extract", parser="bs4"):
+        return _extract_product_fields(soup, url)
 
+
+def _empty_product(url: str) -> Product:
+    """
+    Return the placeholder Product used when a detail page could not be scraped.
+    """
+    return Product.from_fields(_empty_fields(url))
+
+
+def parse_product_fields(content: bytes | None, url: str, parser: str = SCRAPER_PARSER) -> ProductFields:
+    """
+    Parse a downloaded product detail page into plain fields.
+    This is a module level function so that it can be run in a process pool; it never raises.
+
+    :param content: The raw response body, or None if the download failed.
+    :param url: The URL of the detail page.
+    :param parser: The parser to use, see _extract_fields.
+    """
+    if content is None:
+        return _empty_fields(url)
+    try:
+        return _extract_fields(content, url, parser)
     except Exception as e:
-        logger.error(f"Error occurred while getting product details: {e}", exc_info=True)
-        return Product.new(
-            id='',
-            name='',
-            upc='',
-            product_type='',
-            price_excl_tax='',
-            price_incl_tax='',
-            tax='',
-            availability='',
-            number_of_reviews='',
-            star_rating='',
-            description='',
-            link=url
-        )
-
-
-def _get_product_data(session: Session, category: Category) -> Category:
+        logger.error(f"Error occurred while parsing product details: {e}", exc_info=True)
+        return _empty_fields(url)
+
+
+def _parse_listing_page(soup: GetSoup, page_url: str) -> tuple[list[str], str | None]:
     """
-    Get product data from the given URL and return a list of Product objects.
+    Parse a category listing page.
 
     Args:
-        session (_type_): _description_
-        category (Category): The category object containing the link to scrape.
+        soup (GetSoup): The parsed listing page.
+        page_url (str): The URL of the listing page, used to resolve relative links.
 
     Returns:
-        Category: The category object with the products added.
+        tuple[list[str], str | None]: The product detail URLs and the URL of the next page (None on the last page).
     """
-    try:
-        url = category.link
-        soup = GetSoup(url, session, timeout=5)
+    with METRICS.timer("listing_parse"):
         elements = soup.select(['h3:has(a)'])
 
+        detail_urls: list[str] = []
         for element in elements:
             detail_url = element.select_one('a').get('href')
             if detail_url and type(detail_url) is str:
-                url = safe_urljoin(category.link, detail_url)
-                product = _get_product_details(session, url)
-                category.add_product(product)
+                detail_urls.append(safe_urljoin(page_url, detail_url))
 
         page_nav = soup.select_one(['.pager'])
         dom = etree.HTML(str(page_nav)) # type: ignore
         next_page = dom.xpath('//a[contains(text(), "next")]/@href')
         logger.debug("Next page is " + ('exist' if next_page else 'not exist'))
 
+        next_page_url = None
         if next_page and isinstance(next_page, list) and isinstance(next_page[0], str):
-            parsed = urlparse(category.link)
+            parsed = urlparse(page_url)
             path_segments = parsed.path.split('/')
             path_segments[-1] = next_page[0]
             new_path = '/'.join(path_segments)
             next_page_url = urlunparse(parsed._replace(path=new_path))
-            category.set_link(next_page_url)
             logger.debug(f"Next page URL: {next_page_url}")
-            return _get_product_data(session, category)
 
+        return detail_urls, next_page_url
+
+
+def _parse_listing_hashes(soup: GetSoup, page_url: str) -> dict[str, str]:
+    """
+    Hash the listing entry (title, price, availability, rating) of every product on a listing page.
+    Used by the incremental mode to detect changed products without fetching their detail pages.
+
+    Returns:
+        dict[str, str]: The hash of the listing entry by product detail URL.
+    """
+    hashes: dict[str, str] = {}
+    for article in soup.select(['article.product_pod']):
+        link = article.select_one('h3 a')
+        href = link.get('href') if link else None
+        if href and type(href) is str:
+            hashes[safe_urljoin(page_url, href)] = content_hash(str(article))
+    return hashes
+
+
+def _get_category_data(session: Session, url: str, rate_limiter: HostRateLimiter | None = None, retry_scheduler: RetryScheduler | None = None) -> list[Category]:
+    """
+    Get category data from the given URL and return a list of Category objects.
+    """
+    try:
+        if retry_scheduler is not None:
+            soup = GetSoup.from_content(retry_scheduler.submit(fetch_content, url, session, 5, rate_limiter).result())
+        else:
+            soup = GetSoup(url, session, timeout=5, rate_limiter=rate_limiter)
+        return _parse_category_data(soup)
+
+    except Exception as e:
+        logger.error(f"Error occurred while getting category data: {e}", exc_info=True)
+        raise e
+
+
+@dataclass
+class ScrapeContext:
+    """
+    The resources shared by every request of one scrape_data() run.
+    """
+    session: Session
+    rate_limiter: HostRateLimiter | None = None
+    executor: ThreadPoolExecutor | None = None
+    parse_pool: ProcessPoolExecutor | None = None
+    parser: str = SCRAPER_PARSER
+    state: CrawlStateIndex | None = None
+    state_max_age: float = INCREMENTAL_MAX_AGE
+    checkpoint: CrawlCheckpoint | None = None
+    prefetcher: ThreadPoolExecutor | None = None
+    retry_scheduler: RetryScheduler | None = None
+    archive: PageArchiveWriter | None = None
+    products: OrderedDict[str, Product] | None = None
+    products_limit: int = SCRAPER_SHARED_PRODUCTS
+
+
+def _get_product_details(context: ScrapeContext, url: str) -> Product:
+    """
+    Get product details from the given URL and return a Product object.
+    """
+    try:
+        content = fetch_content(url, context.session, timeout=5, rate_limiter=context.rate_limiter)
+        return Product.from_fields(_extract_fields(content, url, context.parser))
+
+    except Exception as e:
+        logger.error(f"Error occurred while getting product details: {e}", exc_info=True)
+        return _empty_product(url)
+
+
+def _is_unchanged(context: ScrapeContext, previous: ProductState | None, listing_hash: str) -> bool:
+    """
+    Whether the product can be carried forward without fetching its detail page:
+    its listing entry is unchanged and it was checked within `state_max_age`.
+    """
+    return previous is not None and previous.listing_hash == listing_hash and time.time() - previous.checked_at < context.state_max_age
+
+
+def _get_product_details_incremental(context: ScrapeContext, state: CrawlStateIndex, url: str, listing_hash: str) -> Product:
+    """
+    Get product details, reusing the result of the previous run when the product has not changed.
+    The detail page is not fetched when its listing entry is unchanged and it was checked within `state_max_age`,
+    and it is not parsed when the page content is unchanged.
+    """
+    previous = state.get(url)
+    if _is_unchanged(context, previous, listing_hash):
+        return Product.from_fields(previous.fields)  # type: ignore
+
+    try:
+        content = fetch_content(url, context.session, timeout=5, rate_limiter=context.rate_limiter)
+        page_hash = content_hash(content)
+        if previous is not None and previous.content_hash == page_hash:
+            fields = previous.fields
+        else:
+            fields = _extract_fields(content, url, context.parser)
+        state.put(url, listing_hash, page_hash, fields)
+        return Product.from_fields(fields)
+
+    except Exception as e:
+        logger.error(f"Error occurred while getting product details: {e}", exc_info=True)
+        return _empty_product(url)
+
+
+def _download_and_submit(context: ScrapeContext, url: str, parse_pool: ProcessPoolExecutor) -> Future[ProductFields]:
+    """
+    Download a product detail page and hand the raw body to the parse pool.
+    """
+    try:
+        content = fetch_content(url, context.session, timeout=5, rate_limiter=context.rate_limiter)
+    except Exception as e:
+        logger.error(f"Error occurred while getting product details: {e}", exc_info=True)
+        content = None
+    return parse_pool.submit(parse_product_fields, content, url, context.parser)
+
+
+def _fetch_product_details_scheduled(context: ScrapeContext, retry_scheduler: RetryScheduler, urls: list[str], listing_hashes: dict[str, str] | None = None) -> Iterator[Product]:
+    """
+    Fetch the product details of the given URLs through the retry scheduler.
+    Every download is submitted at once and retried without holding a worker thread; the pages are parsed
+    by the consuming thread (or the parse pool) in the order of `urls`. Supports the incremental mode as well.
+    """
+    state = context.state
+    hashes = listing_hashes or {}
+    downloads: list[tuple[str, ProductState | None, Future[bytes] | None]] = []
+    for url in urls:
+        previous = state.get(url) if state is not None else None
+        if _is_unchanged(context, previous, hashes.get(url, '')):
+            downloads.append((url, previous, None))
+        else:
+            downloads.append((url, previous, retry_scheduler.submit(fetch_content, url, context.session, 5, context.rate_limiter)))
+
+    results: list[Product | Future[ProductFields]] = []
+    for url, previous, download in downloads:
+        if download is None:
+            results.append(Product.from_fields(previous.fields))  # type: ignore
+            continue
+        try:
+            content = download.result()
+        except Exception as e:
+            logger.error(f"Error occurred while getting product details: {e}", exc_info=True)
+            results.append(_empty_product(url))
+            continue
+
+        if state is not None:
+            # 解析に失敗したページは記録しない（空の値が次回に引き継がれないように）
+            try:
+                page_hash = content_hash(content)
+                if previous is not None and previous.content_hash == page_hash:
+                    fields = previous.fields
+                else:
+                    fields = _extract_fields(content, url, context.parser)
+                state.put(url, hashes.get(url, ''), page_hash, fields)
+                results.append(Product.from_fields(fields))
+            except Exception as e:
+                logger.error(f"Error occurred while getting product details: {e}", exc_info=True)
+                results.append(_empty_product(url))
+        elif context.parse_pool is not None:
+            results.append(context.parse_pool.submit(parse_product_fields, content, url, context.parser))
+        else:
+            results.append(Product.from_fields(parse_product_fields(content, url, context.parser)))
+
+    for result in results:
+        yield Product.from_fields(result.result()) if isinstance(result, Future) else result
+
+
+def _fetch_product_details(context: ScrapeContext, urls: list[str], listing_hashes: dict[str, str] | None = None) -> Iterator[Product]:
+    """
+    Fetch the product details of the given URLs.
+    When an executor is given the pages are fetched concurrently, but the products are still yielded in the order of `urls`.
+    When a parse pool is given the downloads only fetch raw bodies and the parsing runs in the pool's worker processes.
+    In incremental mode (a state index is given) unchanged products are carried forward from the previous run.
+    With a retry scheduler (adaptive mode) the downloads are retried without blocking the workers during the backoff.
+    """
+    executor = context.executor
+    state = context.state
+    parse_pool = context.parse_pool
+    if context.retry_scheduler is not None:
+        yield from _fetch_product_details_scheduled(context, context.retry_scheduler, urls, listing_hashes)
+    elif state is not None:
+        hashes = listing_hashes or {}
+        fetch = (lambda url: _get_product_details_incremental(context, state, url, hashes.get(url, '')))
+        yield from (executor.map(fetch, urls) if executor is not None else map(fetch, urls))
+    elif parse_pool is not None:
+        download = (lambda url: _download_and_submit(context, url, parse_pool))
+        parse_futures = executor.map(download, urls) if executor is not None else map(download, urls)
+        for parse_future in parse_futures:
+            yield Product.from_fields(parse_future.result())
+    elif executor is None:
+        for url in urls:
+            yield _get_product_details(context, url)
+    else:
+        yield from executor.map(lambda url: _get_product_details(context, url), urls)
+
+
+@dataclass
+class ListingPage:
+    """
+    What is kept of a parsed listing page; the parse tree itself is released right after parsing.
+    """
+    url: str
+    detail_urls: list[str]
+    next_url: str | None
+    listing_hashes: dict[str, str] | None
+
+
+def _load_listing_page(context: ScrapeContext, url: str) -> ListingPage:
+    """
+    Fetch and parse a listing page, then free its parse tree.
+    """
+    if context.retry_scheduler is not None:
+        soup = GetSoup.from_content(context.retry_scheduler.submit(fetch_content, url, context.session, 5, context.rate_limiter).result())
+    else:
+        soup = GetSoup(url, context.session, timeout=5, rate_limiter=context.rate_limiter)
+    detail_urls, next_url = _parse_listing_page(soup, url)
+    listing_hashes = _parse_listing_hashes(soup, url) if context.state is not None else None
+    soup.soup.decompose()
+    return ListingPage(url=url, detail_urls=detail_urls, next_url=next_url, listing_hashes=listing_hashes)
+
+
+def _iter_listing_pages(context: ScrapeContext, url: str) -> Iterator[ListingPage]:
+    """
+    Iterate over the listing pages of a category, following the "next" links.
+    While the caller processes page N, page N+1 is already being fetched on the prefetcher thread.
+    """
+    future: Future[ListingPage] | None = None
+    page: ListingPage | None = _load_listing_page(context, url)
+    while page is not None:
+        if page.next_url and context.prefetcher is not None:
+            future = context.prefetcher.submit(_load_listing_page, context, page.next_url)
+        yield page
+
+        if not page.next_url:
+            page = None
+        elif future is not None:
+            page, future = future.result(), None
+        else:
+            page = _load_listing_page(context, page.next_url)
+
+
+def _iter_category_products(context: ScrapeContext, category: Category) -> Iterator[Product]:
+    """
+    Yield the products of the category in listing order, one listing page at a time.
+    In checkpoint mode a page is recorded as done once all its products have been consumed.
+    With `context.products`, a book already fetched for another category is not fetched again, and the same Product is yielded.
+    Only the `context.products_limit` most recently listed books are remembered, so the memory of a run stays bounded.
+    """
+    for page in _iter_listing_pages(context, category.link):
+        category.set_link(page.url)
+        logger.debug(f"Listing page: {page.url}")
+
+        if context.checkpoint is None and context.products is None:
+            yield from _fetch_product_details(context, page.detail_urls, page.listing_hashes)
+        elif context.checkpoint is None:
+            # 複数のカテゴリに載っている商品は一度だけ取得し、同じProductを共有する
+            fetched = context.products
+            products = {url: fetched[url] for url in page.detail_urls if url in fetched}
+            remaining_urls = [url for url in page.detail_urls if url not in products]
+            for url, product in zip(remaining_urls, _fetch_product_details(context, remaining_urls, page.listing_hashes)):
+                products[url] = product
+            for url in page.detail_urls:
+                # 最近一覧に載った商品ほど後ろに置き、上限を超えたら古いものから忘れる
+                fetched[url] = products[url]
+                fetched.move_to_end(url)
+                yield products[url]
+            while len(fetched) > context.products_limit:
+                fetched.popitem(last=False)
+        else:
+            # 前回の実行で取得済みの商品は再取得しない
+            products = context.checkpoint.fetched_products(page.detail_urls)
+            positions = {url: position for position, url in enumerate(page.detail_urls)}
+            remaining_urls = [url for url in page.detail_urls if url not in products]
+            for url, product in zip(remaining_urls, _fetch_product_details(context, remaining_urls, page.listing_hashes)):
+                context.checkpoint.record_product(category.id, page.url, positions[url], product)
+                products[url] = product
+            for url in page.detail_urls:
+                yield products[url]
+            context.checkpoint.mark_page_done(category.id, page.url, page.next_url, [products[url] for url in page.detail_urls])
+
+
+def _get_product_data(context: ScrapeContext, category: Category) -> Category:
+    """
+    Get product data from the given URL and return a list of Product objects.
+
+    Args:
+        context (ScrapeContext): The session, executors and options of the run.
+        category (Category): The category object containing the link to scrape.
+
+    Returns:
+        Category: The category object with the products added.
+    """
+    try:
+        for product in _iter_category_products(context, category):
+            category.add_product(product)
         return category
 
     except Exception as e:
@@ -154,23 +470,194 @@ def _get_product_data(session: Session, category: Category) -> Category:
         return category
 
 
-def scrape_data() -> Generator[Category, None, None]:
+def create_http_cache() -> HttpCache | None:
+    """
+    Create the response cache configured by HTTP_CACHE_DIR, or None if caching is disabled.
+    """
+    if not HTTP_CACHE_DIR:
+        return None
+    return HttpCache(HTTP_CACHE_DIR, ttl=HTTP_CACHE_TTL, max_bytes=HTTP_CACHE_MAX_BYTES)
+
+
+def create_page_archive() -> tuple[PageArchiveWriter | None, PageArchive | None]:
+    """
+    Open the page archive configured by PAGE_ARCHIVE_PATH: (writer, None) to archive the fetched pages,
+    (None, archive) to replay them instead of the network with PAGE_ARCHIVE_REPLAY, or (None, None) if it is disabled.
+    """
+    if not PAGE_ARCHIVE_PATH:
+        return None, None
+    if PAGE_ARCHIVE_REPLAY:
+        return None, PageArchive(PAGE_ARCHIVE_PATH)
+    return PageArchiveWriter(PAGE_ARCHIVE_PATH, PAGE_ARCHIVE_COMPRESSION), None
+
+
+def create_rate_limiter(requests_per_second: float = SCRAPER_REQUESTS_PER_SECOND, adaptive: bool = SCRAPER_ADAPTIVE_RATE) -> HostRateLimiter:
+    """
+    Create the per-host rate limiter: a fixed budget, or an adaptive one starting at `requests_per_second`
+    and raised up to SCRAPER_MAX_REQUESTS_PER_SECOND while the host responds well.
+    """
+    if adaptive:
+        return AdaptiveRateLimiter(requests_per_second, max_requests_per_second=SCRAPER_MAX_REQUESTS_PER_SECOND)
+    return HostRateLimiter(requests_per_second)
+
+
+def scrape_data(max_workers: int = SCRAPER_MAX_WORKERS, requests_per_second: float = SCRAPER_REQUESTS_PER_SECOND, parse_processes: int = SCRAPER_PARSE_PROCESSES, parser: str = SCRAPER_PARSER, state_path: str = INCREMENTAL_STATE_PATH, checkpoint: CrawlCheckpoint | None = None, adaptive: bool = SCRAPER_ADAPTIVE_RATE, http2: bool = SCRAPER_HTTP2) -> Generator[Category, None, None]:
     """
     Scrape data from a website and return it as a Category object.
+
+    :param max_workers: Number of product detail pages fetched concurrently. 1 fetches them one by one.
+    :param requests_per_second: Politeness budget per host in requests per second. 0 or less disables it.
+    :param parse_processes: Number of worker processes parsing product detail pages. 0 parses them on the fetching thread.
+    :param parser: The parser used for product detail pages, "lxml" (fast) or "bs4" (BeautifulSoup).
+    :param state_path: The state index of the incremental mode. Empty scrapes every product from scratch.
+        In incremental mode product details are parsed on the fetching thread, the parse pool is not used.
+    :param checkpoint: The journal of an interruptible run. Categories already written are skipped,
+        and fetched products and completed listing pages are restored instead of fetched again.
+        The caller marks categories as written with checkpoint.mark_category_done().
+    :param adaptive: Adapt the request rate to the responses of the host (see AdaptiveRateLimiter), starting at `requests_per_second`.
+        Failed requests are then retried by a RetryScheduler instead of urllib3, so backoffs do not block the workers.
+    :param http2: Send the requests over HTTP/2 through httpx (see Http2Adapter).
     """
-    session = create_retry_session(timeout=10)
+    context = _create_context(max_workers, requests_per_second, parse_processes, parser, state_path, checkpoint, adaptive, http2)
 
     try:
         url = BASE_URL + "index.html"
-        categories = _get_category_data(session, url)
+        categories = _get_category_data(context.session, url, context.rate_limiter, context.retry_scheduler)
 
         for category in categories:
+            if checkpoint is not None:
+                if checkpoint.is_category_done(category.id):
+                    logger.info(f"Skipping category already written: {category.name}")
+                    continue
+                resume_url = checkpoint.resume_category(category)
+                if resume_url is None:
+                    yield category
+                    continue
+                category.set_link(resume_url)
+
             logger.debug(f"Scraping category: {category.name}")
-            _get_product_data(session, category)
+            _get_product_data(context, category)
+            if context.state is not None:
+                context.state.commit()
             yield category
 
     except Exception as e:
         print(f"Error occurred while scraping data: {e}")
         yield Category.new(id=0, name='', link='')
     finally:
-        session.close()
+        _close_context(context)
+
+
+def _create_context(max_workers: int, requests_per_second: float, parse_processes: int, parser: str, state_path: str, checkpoint: CrawlCheckpoint | None, adaptive: bool, http2: bool, shared_state: bool = False) -> ScrapeContext:
+    """
+    Create the session, executors and state shared by one run, see scrape_data for the parameters.
+    `shared_state` opens the state index for writers in several processes, see CrawlStateIndex.
+    """
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown parser: {parser}")
+    archive, replay = create_page_archive()
+    if replay is not None:
+        # アーカイブから読む場合はホストへの配慮が要らないので制限しない
+        requests_per_second, adaptive = 0, False
+    # セッションを先に作る（失敗してもスレッドやプロセスを残さない）
+    try:
+        # ワーカー、先読みスレッド、呼び出し元スレッドの全てが接続を使い回せるプールの大きさにする
+        session = create_retry_session(retries=0 if adaptive else 3, timeout=10, cache=create_http_cache(), pool_size=max(10, max_workers + 2), pool_block=True, http2=http2, archive=archive, replay=replay)
+    except BaseException:
+        for page_archive in (archive, replay):
+            if page_archive is not None:
+                page_archive.close()
+        raise
+
+    context = ScrapeContext(
+        session=session,
+        rate_limiter=create_rate_limiter(requests_per_second, adaptive),
+        parser=parser,
+        checkpoint=checkpoint,
+        archive=archive,
+        products=OrderedDict() if SCRAPER_SHARED_PRODUCTS > 0 else None
+    )
+    try:
+        # 適応制御ではurllib3の再試行を無効にし、RetrySchedulerで再試行する
+        context.executor = ThreadPoolExecutor(max_workers=max(1, max_workers)) if max_workers > 1 or adaptive else None
+        context.parse_pool = ProcessPoolExecutor(max_workers=parse_processes) if parse_processes > 0 else None
+        context.state = CrawlStateIndex(state_path, shared=shared_state) if state_path else None
+        context.prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="listing-prefetch")
+        context.retry_scheduler = RetryScheduler(context.executor) if adaptive and context.executor is not None else None
+    except BaseException:
+        # 途中まで作ったものを閉じてから伝える
+        _close_context(context)
+        raise
+    return context
+
+
+def _close_context(context: ScrapeContext) -> None:
+    """
+    Shut down the executors and close the state and the session of a run.
+    """
+    if context.retry_scheduler is not None:
+        context.retry_scheduler.close()
+    if context.executor is not None:
+        context.executor.shutdown(wait=True)
+    if context.parse_pool is not None:
+        context.parse_pool.shutdown(wait=True)
+    if context.prefetcher is not None:
+        context.prefetcher.shutdown(wait=True)
+    if context.state is not None:
+        context.state.close()
+    stats = connection_pool_stats(context.session)
+    logger.info(f"HTTP connections: {stats['connections']} opened for {stats['requests']} requests.")
+    context.session.close()
+    if context.archive is not None:
+        context.archive.close()
+    # 共有していた商品は実行の終わりに手放す
+    context.products = None
+
+
+@dataclass
+class ProductBatch:
+    """
+    A chunk of the products of a category, in listing order, yielded by scrape_product_batches().
+    The category itself holds no products; `last` is set on the final batch of each category.
+    """
+    category: Category
+    products: list[Product]
+    last: bool
+
+
+def scrape_product_batches(batch_size: int, max_workers: int = SCRAPER_MAX_WORKERS, requests_per_second: float = SCRAPER_REQUESTS_PER_SECOND, parse_processes: int = SCRAPER_PARSE_PROCESSES, parser: str = SCRAPER_PARSER, state_path: str = INCREMENTAL_STATE_PATH, adaptive: bool = SCRAPER_ADAPTIVE_RATE, http2: bool = SCRAPER_HTTP2) -> Generator[ProductBatch, None, None]:
+    """
+    Scrape data from a website and yield the products in batches of at most `batch_size` as they are parsed,
+    instead of whole categories. Memory use depends on the batch size, not on the size of the categories.
+    The other parameters are those of scrape_data(); checkpoints are not supported in this mode.
+    """
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be positive: {batch_size}")
+    context = _create_context(max_workers, requests_per_second, parse_processes, parser, state_path, None, adaptive, http2)
+    # 取得済みの商品を実行全体で保持すると、メモリ使用量がバッチの大きさで決まらなくなる
+    context.products = None
+
+    try:
+        url = BASE_URL + "index.html"
+        categories = _get_category_data(context.session, url, context.rate_limiter, context.retry_scheduler)
+
+        for category in categories:
+            logger.debug(f"Scraping category: {category.name}")
+            batch: list[Product] = []
+            try:
+                for product in _iter_category_products(context, category):
+                    batch.append(product)
+                    if len(batch) >= batch_size:
+                        yield ProductBatch(category, batch, last=False)
+                        batch = []
+            except Exception as e:
+                logger.error(f"Error occurred while getting product data: {e}", exc_info=True)
+            if context.state is not None:
+                context.state.commit()
+            yield ProductBatch(category, batch, last=True)
+
+    except Exception as e:
+        print(f"Error occurred while scraping data: {e}")
+        yield ProductBatch(Category.new(id=0, name='', link=''), [], last=True)
+    finally:
+        _close_context(context)
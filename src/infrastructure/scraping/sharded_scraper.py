@@ -0,0 +1,200 @@
+# src/infrastructure/scraping/sharded_scraper.py
+# -*- coding: utf-8 -*-
+"""
+Sharded crawl: the categories are scraped by several worker processes, each with its own session,
+and merged into a single output by the process that consumes scrape_data_sharded().
+
+Workers on other machines can join a crawl by sharing the work list file on a filesystem with working POSIX locks
+(e.g. NFSv4; otherwise keep all the workers on one host) and running, from the src directory:
+
+    python -m infrastructure.scraping.sharded_scraper /shared/work_list.sqlite --processes 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import socket
+import tempfile
+import threading
+import time
+from typing import Generator
+
+from domain.entities.category import Category
+from infrastructure.scraping import scraper
+from infrastructure.scraping.create_retry_session import create_retry_session
+from infrastructure.scraping.work_list import SqliteWorkList
+from settings import logger, INCREMENTAL_STATE_PATH, SCRAPER_ADAPTIVE_RATE, SCRAPER_HTTP2, SCRAPER_MAX_WORKERS, SCRAPER_PARSER, SCRAPER_REQUESTS_PER_SECOND, SCRAPER_SHARD_LEASE, SCRAPER_SHARD_PROCESSES, SCRAPER_WORK_LIST_PATH
+
+
+# 作業リストを確認する間隔（秒）
+POLL_INTERVAL: float = 0.2
+
+
+def _renew_lease(work_list_path: str, lease_seconds: float, category_id: int, owner: str, stop: threading.Event) -> None:
+    # 長いカテゴリを処理している間に他のワーカーへ引き継がれないよう、リースを延長し続ける
+    work_list = SqliteWorkList(work_list_path, lease_seconds)
+    try:
+        while not stop.wait(lease_seconds / 3):
+            work_list.renew(category_id, owner)
+    finally:
+        work_list.close()
+
+
+def run_worker(work_list_path: str, base_url: str, max_workers: int = SCRAPER_MAX_WORKERS, requests_per_second: float = SCRAPER_REQUESTS_PER_SECOND, parser: str = SCRAPER_PARSER, state_path: str = INCREMENTAL_STATE_PATH, adaptive: bool = SCRAPER_ADAPTIVE_RATE, http2: bool = SCRAPER_HTTP2, lease_seconds: float = SCRAPER_SHARD_LEASE) -> int:
+    """
+    Claim categories from the work list and scrape them until the crawl is finished or nothing is left.
+    Categories claimed by other workers are waited for, so that an abandoned claim can be taken over once its lease expires.
+
+    :param work_list_path: The SqliteWorkList shared by the workers.
+    :param base_url: The base URL of the site, as seen by the coordinator.
+    :param max_workers: Number of product detail pages fetched concurrently by this worker.
+    :param requests_per_second: The politeness budget of this worker per host.
+    :param parser: The parser used for product detail pages.
+    :param state_path: The state index of the incremental mode, shared by the worker processes of this machine. Empty disables it.
+    :param adaptive: Adapt the request rate of this worker to the responses of the host.
+    :param http2: Send the requests over HTTP/2.
+    :param lease_seconds: Seconds after which the claim of a worker that stopped renewing it is taken over.
+    :returns: The number of categories scraped by this worker.
+    """
+    scraper.BASE_URL = base_url
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    work_list = SqliteWorkList(work_list_path, lease_seconds)
+    context = scraper._create_context(max_workers, requests_per_second, 0, parser, state_path, None, adaptive, http2, shared_state=True)
+    scraped = 0
+
+    try:
+        while not work_list.is_finished():
+            category = work_list.claim(owner) if work_list.is_seeded() else None
+            if category is None:
+                if work_list.is_seeded() and work_list.remaining() == 0:
+                    break
+                time.sleep(POLL_INTERVAL)
+                continue
+
+            logger.debug(f"Scraping category: {category.name} ({owner})")
+            stop = threading.Event()
+            renewer = threading.Thread(target=_renew_lease, args=(work_list_path, lease_seconds, category.id, owner, stop), daemon=True)
+            renewer.start()
+            try:
+                scraper._get_product_data(context, category)
+                if context.state is not None:
+                    context.state.commit()
+                work_list.complete(category)
+                scraped += 1
+            finally:
+                stop.set()
+                renewer.join()
+    finally:
+        scraper._close_context(context)
+        work_list.close()
+    return scraped
+
+
+def _worker_main(work_list_path: str, base_url: str, max_workers: int, requests_per_second: float, parser: str, state_path: str, adaptive: bool, http2: bool, lease_seconds: float) -> None:
+    try:
+        scraped = run_worker(work_list_path, base_url, max_workers, requests_per_second, parser, state_path, adaptive, http2, lease_seconds)
+        logger.info(f"Shard worker {os.getpid()} scraped {scraped} categories.")
+    except Exception as e:
+        logger.error(f"Error occurred in shard worker: {e}", exc_info=True)
+        raise
+
+
+def scrape_data_sharded(processes: int = SCRAPER_SHARD_PROCESSES, work_list_path: str = SCRAPER_WORK_LIST_PATH, max_workers: int = SCRAPER_MAX_WORKERS, requests_per_second: float = SCRAPER_REQUESTS_PER_SECOND, parser: str = SCRAPER_PARSER, state_path: str = INCREMENTAL_STATE_PATH, adaptive: bool = SCRAPER_ADAPTIVE_RATE, http2: bool = SCRAPER_HTTP2, lease_seconds: float = SCRAPER_SHARD_LEASE) -> Generator[Category, None, None]:
+    """
+    Scrape the categories in `processes` worker processes and yield them in the order of the site, like scrape_data().
+    The caller is the only writer: workers store their results in the work list and never touch the output.
+    If every local worker has exited while categories are left, the remaining ones are scraped in this process.
+
+    :param processes: Number of worker processes. Workers on other machines may join through the work list.
+    :param work_list_path: The SqliteWorkList file. Empty uses a temporary file, removed after the run.
+    :param max_workers: Number of product detail pages fetched concurrently by each worker.
+    :param requests_per_second: Politeness budget per host for the whole run, divided among the local workers. 0 or less disables it.
+    :param parser: The parser used for product detail pages, "lxml" (fast) or "bs4" (BeautifulSoup).
+    :param state_path: The state index of the incremental mode, shared by the local workers. Empty scrapes every product from scratch.
+        Workers on other machines use the INCREMENTAL_STATE_PATH (or --state-path) of their own machine.
+    :param adaptive: Adapt the request rate of each worker to the responses of the host, see scrape_data.
+    :param http2: Send the requests over HTTP/2 through httpx (see Http2Adapter).
+    :param lease_seconds: Seconds after which the claim of a crashed worker is taken over by another one.
+    """
+    if parser not in scraper.PARSERS:
+        raise ValueError(f"Unknown parser: {parser}")
+    if processes < 1:
+        raise ValueError(f"processes must be positive: {processes}")
+    temporary = not work_list_path
+    if temporary:
+        fd, work_list_path = tempfile.mkstemp(prefix="work_list_", suffix=".sqlite")
+        os.close(fd)
+    work_list = SqliteWorkList(work_list_path, lease_seconds)
+    # ワーカーを増やしてもホストへの総リクエスト数が変わらないよう、予算を分ける
+    worker_rate = requests_per_second / processes if requests_per_second > 0 else requests_per_second
+    workers: list[multiprocessing.Process] = []
+
+    try:
+        archive, replay = scraper.create_page_archive()
+        session = create_retry_session(retries=3, timeout=10, archive=archive, replay=replay)
+        try:
+            categories = scraper._get_category_data(session, scraper.BASE_URL + "index.html", scraper.create_rate_limiter(requests_per_second if replay is None else 0, adaptive=False))
+        finally:
+            session.close()
+            if archive is not None:
+                archive.close()
+        work_list.seed(categories)
+
+        # スレッドを持つ親プロセスをforkしないよう、spawnで起動する
+        spawn = multiprocessing.get_context("spawn")
+        for i in range(processes):
+            worker = spawn.Process(
+                target=_worker_main,
+                args=(work_list_path, scraper.BASE_URL, max_workers, worker_rate, parser, state_path, adaptive, http2, lease_seconds),
+                name=f"shard-{i}", daemon=True
+            )
+            worker.start()
+            workers.append(worker)
+
+        for position in range(len(categories)):
+            while (category := work_list.take_result(position)) is None:
+                if not any(worker.is_alive() for worker in workers):
+                    logger.warning("Every shard worker has exited, scraping the remaining categories in this process.")
+                    run_worker(work_list_path, scraper.BASE_URL, max_workers, worker_rate, parser, state_path, adaptive, http2, lease_seconds)
+                    workers = []
+                time.sleep(POLL_INTERVAL)
+            yield category
+
+    except Exception as e:
+        print(f"Error occurred while scraping data: {e}")
+        yield Category.new(id=0, name='', link='')
+    finally:
+        work_list.finish()
+        for worker in workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                worker.terminate()
+        if temporary:
+            work_list.remove()
+        else:
+            work_list.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Join a sharded crawl as worker processes of this machine.")
+    parser.add_argument("work_list", help="the work list file shared with the coordinator")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes to run")
+    parser.add_argument("--base-url", default=scraper.BASE_URL, help="base URL of the site")
+    parser.add_argument("--workers", type=int, default=SCRAPER_MAX_WORKERS, help="concurrent requests per process")
+    parser.add_argument("--rps", type=float, default=SCRAPER_REQUESTS_PER_SECOND, help="requests per second per process")
+    parser.add_argument("--state-path", default=INCREMENTAL_STATE_PATH, help="state index of the incremental mode on this machine, empty disables it")
+    args = parser.parse_args(argv)
+
+    spawn = multiprocessing.get_context("spawn")
+    workers = [
+        spawn.Process(target=_worker_main, args=(args.work_list, args.base_url, args.workers, args.rps, SCRAPER_PARSER, args.state_path, SCRAPER_ADAPTIVE_RATE, SCRAPER_HTTP2, SCRAPER_SHARD_LEASE))
+        for _ in range(args.processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+if __name__ == "__main__":
+    main()
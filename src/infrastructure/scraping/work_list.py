@@ -0,0 +1,161 @@
+# src/infrastructure/scraping/work_list.py
+# -*- coding: utf-8 -*-
+
+import os
+import pickle
+import sqlite3
+import time
+
+from domain.entities.category import Category
+
+
+PENDING = "pending"
+CLAIMED = "claimed"
+DONE = "done"
+
+
+class SqliteWorkList:
+    """
+    SQLite work list of a sharded crawl: one row per category, claimed by one worker at a time.
+    Workers in several processes (or on several machines sharing the file) claim categories with a lease,
+    store the scraped category as its result, and a claim whose lease has expired can be taken over by another worker.
+    Every method opens its own short transaction, so the work list can be shared by any number of processes.
+    It uses a rollback journal rather than WAL, whose shared-memory index only works between processes of one host,
+    and takes the write lock (BEGIN IMMEDIATE) before reading what it updates. A work list shared by several machines
+    needs a network filesystem with working POSIX locks (e.g. NFSv4); otherwise run the workers on a single host.
+    """
+    def __init__(self, path: str, lease_seconds: float = 300.0) -> None:
+        """
+        Open (or create) the work list.
+
+        :param path: The path of the SQLite file.
+        :param lease_seconds: Seconds after which a claim that has not been renewed is considered abandoned.
+        """
+        self.path = path
+        self._lease_seconds = lease_seconds
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        # WALの共有メモリは別のホストから見えないので、ファイルロックだけで済むDELETEモードを使う
+        self._conn.execute("PRAGMA journal_mode=DELETE")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS work ("
+            " category_id INTEGER PRIMARY KEY,"
+            " position INTEGER NOT NULL,"
+            " name TEXT NOT NULL,"
+            " link TEXT NOT NULL,"
+            " state TEXT NOT NULL,"
+            " owner TEXT,"
+            " claimed_at REAL,"
+            " result BLOB"
+            ");"
+            "CREATE INDEX IF NOT EXISTS work_state ON work (state, position);"
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+        )
+
+
+    def seed(self, categories: list[Category]) -> None:
+        """
+        Replace the content of the work list with the given categories, in output order, and open it to workers.
+        """
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute("DELETE FROM work")
+            self._conn.execute("DELETE FROM meta")
+            self._conn.executemany(
+                "INSERT INTO work (category_id, position, name, link, state) VALUES (?, ?, ?, ?, ?)",
+                [(category.id, position, category.name, category.link, PENDING) for position, category in enumerate(categories)]
+            )
+            self._conn.execute("INSERT INTO meta (key, value) VALUES ('seeded', '1')")
+
+
+    def finish(self) -> None:
+        """
+        Mark the crawl as finished, so that workers waiting for work exit.
+        """
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('finished', '1')")
+
+
+    def _meta(self, key: str) -> bool:
+        return self._conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone() is not None
+
+
+    def is_seeded(self) -> bool:
+        return self._meta("seeded")
+
+
+    def is_finished(self) -> bool:
+        return self._meta("finished")
+
+
+    def claim(self, owner: str) -> Category | None:
+        """
+        Claim the next pending category, or one whose claim has expired.
+
+        :param owner: An identifier of the worker, e.g. "host:pid".
+        :returns: The category to scrape (without products), or None if nothing can be claimed now.
+        """
+        now = time.time()
+        with self._conn:
+            # 取得と更新の間に他のワーカーが割り込まないよう、書き込みロックを先に取る
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute(
+                "SELECT category_id, name, link FROM work WHERE state = ? OR (state = ? AND claimed_at < ?) ORDER BY position LIMIT 1",
+                (PENDING, CLAIMED, now - self._lease_seconds)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE work SET state = ?, owner = ?, claimed_at = ? WHERE category_id = ?", (CLAIMED, owner, now, row[0]))
+        return Category.new(id=row[0], name=row[1], link=row[2])
+
+
+    def renew(self, category_id: int, owner: str) -> None:
+        """
+        Extend the lease of a category still being scraped by `owner`.
+        """
+        self._conn.execute("UPDATE work SET claimed_at = ? WHERE category_id = ? AND state = ? AND owner = ?", (time.time(), category_id, CLAIMED, owner))
+
+
+    def complete(self, category: Category) -> None:
+        """
+        Store the scraped category as the result of its work item.
+        """
+        self._conn.execute("UPDATE work SET state = ?, result = ? WHERE category_id = ?", (DONE, pickle.dumps(category, pickle.HIGHEST_PROTOCOL), category.id))
+
+
+    def remaining(self) -> int:
+        """
+        The number of categories not scraped yet, claimed or not.
+        """
+        return self._conn.execute("SELECT COUNT(*) FROM work WHERE state != ?", (DONE,)).fetchone()[0]
+
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM work").fetchone()[0]
+
+
+    def take_result(self, position: int) -> Category | None:
+        """
+        Return the scraped category at the given output position and drop its stored result,
+        or None if it has not been completed yet.
+        """
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute("SELECT category_id, result FROM work WHERE position = ? AND state = ?", (position, DONE)).fetchone()
+            if row is None or row[1] is None:
+                return None
+            self._conn.execute("UPDATE work SET result = NULL WHERE category_id = ?", (row[0],))
+        return pickle.loads(row[1])
+
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+    def remove(self) -> None:
+        """
+        Close the work list and delete its files.
+        """
+        self.close()
+        for suffix in ("", "-journal"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
@@ -1,10 +1,11 @@
 # src/main.py
 # -*- coding: utf-8 -*-
 
-from application.services.excel_service import ExcelService
+from application.services.output_service import OutputService
 from application.services.scraping_service import ScrapingService
-from infrastructure.excel.excel_repository import ExcelRepository
-from settings import logger
+from infrastructure.metrics.metrics_registry import METRICS
+from infrastructure.output.output_repository_factory import create_output_repository
+from settings import logger, EXCEL_WRITER, METRICS_PATH, OUTPUT_FORMAT, OUTPUT_PATH, PIPELINE_ENABLED
 
 
 def main() -> None:
@@ -13,20 +14,35 @@ def main() -> None:
     """
     logger.info("Starting the scraping and saving process.")
 
-    # Define the output file name
-    output_file = 'booklist_sample.xlsx'
+    # Define the output file name (a directory for the columnar formats)
+    output_path = OUTPUT_PATH or {"excel": 'booklist_sample.xlsx', "sqlite": 'booklist_sample.sqlite'}.get(OUTPUT_FORMAT, 'booklist_sample')
 
-    # Create an instance of ExcelRepository
-    excel_repository = ExcelRepository(output_file)
+    # Create an instance of the output repository selected by OUTPUT_FORMAT
+    # For Excel, "streaming" opens the workbook once, "append" rewrites the file for every category,
+    # "parallel" renders the sheets in worker processes and assembles the workbook on close
+    output_repository = create_output_repository(OUTPUT_FORMAT, output_path, EXCEL_WRITER)
 
-    # Create an instance of ExcelService (you need to implement IExcelRepository)
-    excel_service = ExcelService(excel_repository)
+    # Create an instance of OutputService
+    output_service = OutputService(output_repository)
 
-    # Create an instance of ScrapingService
-    scraping_service = ScrapingService(excel_service)
+    # Create an instance of ScrapingService, or of PipelineService to fetch, parse, build and write concurrently
+    if PIPELINE_ENABLED:
+        from application.services.pipeline_service import PipelineService
+        scraping_service: ScrapingService | PipelineService = PipelineService(output_service)
+    else:
+        scraping_service = ScrapingService(output_service)
 
     # Run the scraping and saving process
-    scraping_service.scrape_and_save()
+    try:
+        scraping_service.scrape_and_save()
+    finally:
+        with METRICS.timer("close"):
+            output_service.close()
+
+        # Export the per-stage metrics (enabled by METRICS_PATH)
+        if METRICS.enabled:
+            METRICS.export(METRICS_PATH)
+            logger.info(f"Metrics written to {METRICS_PATH}")
 
     logger.info("Scraping and saving process completed.")
 
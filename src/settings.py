@@ -1,26 +1,118 @@
 # src/settings.py
 
+import json
 import logging.config
 import os
-import yaml
 from pathlib import Path
 
 
 CWD: Path = Path(__file__).resolve().parent
 LOG_CONFIG_PATH: str = os.path.normpath(os.path.join(CWD, "log/log_config.yaml"))
+# 解析済みのログ設定のキャッシュ（YAMLが更新されると作り直す。空の場合は使わない）
+LOG_CONFIG_CACHE_PATH: str = os.environ.get("LOG_CONFIG_CACHE_PATH", os.path.normpath(os.path.join(CWD, "log/log_config.cache.json")))
 
-def setup_logging() -> None:
+# スクレイピング設定（環境変数で上書き可能）
+SCRAPER_BASE_URL: str = os.environ.get("SCRAPER_BASE_URL", "https://books.toscrape.com/")  # ベンチマーク用のレプリカなどに向ける場合に変更
+SCRAPER_MAX_WORKERS: int = int(os.environ.get("SCRAPER_MAX_WORKERS", "1"))
+SCRAPER_REQUESTS_PER_SECOND: float = float(os.environ.get("SCRAPER_REQUESTS_PER_SECOND", "1.0"))
+SCRAPER_PARSE_PROCESSES: int = int(os.environ.get("SCRAPER_PARSE_PROCESSES", "0"))  # 0はフェッチしたスレッドでパース
+SCRAPER_PARSER: str = os.environ.get("SCRAPER_PARSER", "lxml")  # "lxml" または "bs4"
+SCRAPER_ENGINE: str = os.environ.get("SCRAPER_ENGINE", "sync")  # "sync", "async", "frontier" または "sharded"
+SCRAPER_MAX_CONCURRENCY: int = int(os.environ.get("SCRAPER_MAX_CONCURRENCY", "100"))
+SCRAPER_ASYNC_MAX_CATEGORIES: int = int(os.environ.get("SCRAPER_ASYNC_MAX_CATEGORIES", "4"))  # asyncエンジンで同時に取得するカテゴリ数の上限（メモリ使用量を抑える）
+SCRAPER_ADAPTIVE_RATE: bool = os.environ.get("SCRAPER_ADAPTIVE_RATE", "0") == "1"  # 1の場合、SCRAPER_REQUESTS_PER_SECONDから応答状況に合わせて増減
+SCRAPER_MAX_REQUESTS_PER_SECOND: float = float(os.environ.get("SCRAPER_MAX_REQUESTS_PER_SECOND", "20.0"))  # 適応制御時の上限
+SCRAPER_HTTP2: bool = os.environ.get("SCRAPER_HTTP2", "0") == "1"  # 1の場合、httpxでHTTP/2を使う（httpx[http2]が必要）
+SCRAPER_SHARED_PRODUCTS: int = int(os.environ.get("SCRAPER_SHARED_PRODUCTS", "10000"))  # 複数のカテゴリに載る商品を再取得しないために覚えておく商品数の上限（古いものから忘れる）。0は無効
+
+# クロールフロンティア設定（frontierエンジンで使用）
+FRONTIER_MAX_DEPTH: int = int(os.environ.get("FRONTIER_MAX_DEPTH", "0"))  # 0は無制限
+FRONTIER_BLOOM_CAPACITY: int = int(os.environ.get("FRONTIER_BLOOM_CAPACITY", "0"))  # 0は正確なハッシュ集合、正の値は想定URL数でBloomフィルタを使う
+FRONTIER_MAX_PER_HOST: int = int(os.environ.get("FRONTIER_MAX_PER_HOST", "0"))  # ホストごとの同時リクエスト数の上限。0は無制限
+
+# 分散クロール設定（shardedエンジンで使用）
+SCRAPER_SHARD_PROCESSES: int = int(os.environ.get("SCRAPER_SHARD_PROCESSES", str(os.cpu_count() or 1)))  # カテゴリを分担するワーカープロセス数
+SCRAPER_WORK_LIST_PATH: str = os.environ.get("SCRAPER_WORK_LIST_PATH", "")  # 空の場合は一時ファイル。複数台で共有する場合に指定
+SCRAPER_SHARD_LEASE: float = float(os.environ.get("SCRAPER_SHARD_LEASE", "300"))  # 更新されない割り当てを他のワーカーが引き継ぐまでの秒数
+
+# HTTPキャッシュ設定（HTTP_CACHE_DIRが空の場合は無効）
+HTTP_CACHE_DIR: str = os.environ.get("HTTP_CACHE_DIR", "")
+HTTP_CACHE_TTL: float = float(os.environ.get("HTTP_CACHE_TTL", "86400"))
+HTTP_CACHE_MAX_BYTES: int = int(os.environ.get("HTTP_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# 取得したページのアーカイブ（PAGE_ARCHIVE_PATHが空の場合は無効）
+PAGE_ARCHIVE_PATH: str = os.environ.get("PAGE_ARCHIVE_PATH", "")
+PAGE_ARCHIVE_COMPRESSION: str = os.environ.get("PAGE_ARCHIVE_COMPRESSION", "gzip")  # "gzip" または "zstd"（zstandardが必要）
+PAGE_ARCHIVE_REPLAY: bool = os.environ.get("PAGE_ARCHIVE_REPLAY", "0") == "1"  # 1の場合、ネットワークではなくアーカイブからページを読む
+
+# 差分クロール設定（INCREMENTAL_STATE_PATHが空の場合は無効）
+INCREMENTAL_STATE_PATH: str = os.environ.get("INCREMENTAL_STATE_PATH", "")
+INCREMENTAL_MAX_AGE: float = float(os.environ.get("INCREMENTAL_MAX_AGE", str(7 * 86400)))  # 一覧が変わらなくても詳細を再確認する間隔（秒）
+
+# 中断再開用チェックポイント（CHECKPOINT_PATHが空の場合は無効）
+CHECKPOINT_PATH: str = os.environ.get("CHECKPOINT_PATH", "")
+
+# 計測設定（METRICS_PATHが空の場合は無効。拡張子が.jsonならJSON、それ以外はPrometheus形式で出力）
+METRICS_PATH: str = os.environ.get("METRICS_PATH", "")
+
+# 出力設定
+OUTPUT_FORMAT: str = os.environ.get("OUTPUT_FORMAT", "excel")  # "excel", "parquet", "arrow", "csv", "sqlite"
+OUTPUT_PATH: str = os.environ.get("OUTPUT_PATH", "")  # 空の場合は形式ごとの既定値
+EXCEL_WRITER: str = os.environ.get("EXCEL_WRITER", "streaming")  # "streaming", "append" または "parallel"
+EXCEL_WRITER_PROCESSES: int = int(os.environ.get("EXCEL_WRITER_PROCESSES", str(os.cpu_count() or 1)))  # parallelでシートを書き出すプロセス数
+OUTPUT_BATCH_SIZE: int = int(os.environ.get("OUTPUT_BATCH_SIZE", "0"))  # 正の値の場合、カテゴリ全体ではなくこの件数ごとに書き込む
+
+# パイプライン設定（PIPELINE_ENABLEDが1の場合、取得・パース・DataFrame作成・書き込みを別々のスレッドで並行して行う）
+PIPELINE_ENABLED: bool = os.environ.get("PIPELINE_ENABLED", "0") == "1"
+PIPELINE_FETCH_WORKERS: int = int(os.environ.get("PIPELINE_FETCH_WORKERS", "4"))  # 詳細ページを同時に取得するスレッド数
+PIPELINE_PARSE_WORKERS: int = int(os.environ.get("PIPELINE_PARSE_WORKERS", "2"))  # パースするスレッド数（SCRAPER_PARSE_PROCESSESが正の場合はプロセスへ渡す）
+PIPELINE_FRAME_WORKERS: int = int(os.environ.get("PIPELINE_FRAME_WORKERS", "2"))  # DataFrameを作るスレッド数
+PIPELINE_QUEUE_SIZE: int = int(os.environ.get("PIPELINE_QUEUE_SIZE", "64"))  # 段の間のキューの上限（超えると上流が待つ）
+PIPELINE_MAX_PENDING_CATEGORIES: int = int(os.environ.get("PIPELINE_MAX_PENDING_CATEGORIES", "4"))  # 書き込み前に同時に扱うカテゴリ数の上限
+
+def _load_log_config() -> dict:
+    """
+    Return the parsed log config. The result of parsing the YAML file is cached as JSON next to it,
+    so that yaml is neither imported nor run at startup until the YAML file changes.
+    """
+    stat = os.stat(LOG_CONFIG_PATH)
+    key = [stat.st_mtime_ns, stat.st_size]
+    if LOG_CONFIG_CACHE_PATH:
+        try:
+            with open(LOG_CONFIG_CACHE_PATH, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('key') == key:
+                return cached['config']
+        except (OSError, ValueError):
+            pass
+
+    import yaml
     with open(LOG_CONFIG_PATH, 'r', encoding='utf-8') as f:
         log_config = yaml.safe_load(f)
 
-        # GitHub Actionsや他のCI環境での実行を検出
-        if os.environ.get('CI'):  # CI環境であればTrue
-            # ファイルハンドラを削除し、コンソールハンドラのみを使用
-            log_config['handlers'].pop('file', None)
-            for logger in log_config['loggers'].values():
-                logger['handlers'] = [handler for handler in logger['handlers'] if handler != 'file']
+    if LOG_CONFIG_CACHE_PATH:
+        # 書き込めない環境（読み取り専用のコンテナなど）ではキャッシュせずに続ける
+        try:
+            temp_path = f"{LOG_CONFIG_CACHE_PATH}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'key': key, 'config': log_config}, f)
+            os.replace(temp_path, LOG_CONFIG_CACHE_PATH)
+        except OSError:
+            pass
+    return log_config
+
+
+def setup_logging() -> None:
+    log_config = _load_log_config()
+
+    # GitHub Actionsや他のCI環境での実行を検出
+    if os.environ.get('CI'):  # CI環境であればTrue
+        # ファイルハンドラを削除し、コンソールハンドラのみを使用
+        log_config['handlers'].pop('file', None)
+        for logger in log_config['loggers'].values():
+            logger['handlers'] = [handler for handler in logger['handlers'] if handler != 'file']
 
-        logging.config.dictConfig(log_config)  # type: ignore
+    logging.config.dictConfig(log_config)  # type: ignore
 
 
 setup_logging()
@@ -0,0 +1,9 @@
+# tests/conftest.py
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+# ログはファイルではなくコンソールに出す（settingsの読み込み前に設定する）
+os.environ.setdefault("CI", "1")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
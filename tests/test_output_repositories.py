@@ -0,0 +1,42 @@
+# tests/test_output_repositories.py
+# -*- coding: utf-8 -*-
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from benchmark.bench_dataframe import _make_products
+from domain.entities.category import Category
+from domain.services.category2df import create_dataframe_from_category
+from infrastructure.output.arrow_repository import ArrowRepository
+from infrastructure.output.parquet_repository import ParquetRepository
+
+
+def _category_frame(start: int, count: int, tax: float) -> pd.DataFrame:
+    category = Category.new(id=1, name="Books", link="")
+    for product in _make_products(start + count)[start:]:
+        category.add_product(product)
+    df = create_dataframe_from_category(category)
+    # カテゴリ型の列の値がDataFrameごとに異なるようにする
+    df["tax"] = pd.Series([tax] * count, dtype="Float64").astype("category")
+    return df
+
+
+@pytest.mark.parametrize("repository_class", [ArrowRepository, ParquetRepository])
+def test_second_frame_is_appended_to_the_same_partition(tmp_path, repository_class):
+    first, second = _category_frame(0, 10, 0.0), _category_frame(10, 5, 1.5)
+    repository = repository_class(str(tmp_path))
+    repository.save_df(first, "Books", index=False)
+    repository.save_df(second, "Books", index=False)
+    repository.close()
+
+    path = tmp_path / ("Books" + repository_class.extension)
+    if repository_class is ArrowRepository:
+        with pa.ipc.open_file(path) as reader:
+            table = reader.read_all()
+    else:
+        table = pq.read_table(path)
+    assert table.num_rows == 15
+    assert table.column("upc").to_pylist() == first["upc"].tolist() + second["upc"].tolist()
+    assert table.column("tax").to_pylist() == [0.0] * 10 + [1.5] * 5
@@ -0,0 +1,38 @@
+# tests/test_scraper_incremental.py
+# -*- coding: utf-8 -*-
+
+from benchmark.replica_server import ReplicaServer, ReplicaSite
+from infrastructure.scraping import scraper
+from infrastructure.scraping.crawl_state import CrawlStateIndex
+
+
+# 解析できない詳細ページを返す商品
+BROKEN_PRODUCT_ID = 1001
+
+
+class BrokenDetailSite(ReplicaSite):
+    def detail_page(self, product_id: int) -> str | None:
+        if product_id == BROKEN_PRODUCT_ID:
+            return "<html><body><p>Temporarily unavailable</p></body></html>"
+        return super().detail_page(product_id)
+
+
+def test_scheduled_incremental_does_not_record_unparsable_pages(tmp_path, monkeypatch):
+    state_path = str(tmp_path / "state.sqlite")
+    with ReplicaServer(BrokenDetailSite(categories=1, pages=1, page_size=4)) as server:
+        monkeypatch.setattr(scraper, "BASE_URL", server.base_url)
+        # SCRAPER_ADAPTIVE_RATE=1 と INCREMENTAL_STATE_PATH を指定した場合と同じ
+        categories = list(scraper.scrape_data(max_workers=2, requests_per_second=0, parse_processes=0, state_path=state_path, adaptive=True))
+
+    products = categories[0].products
+    assert len(products) == 4
+    broken_url = products[1].link
+    assert f"book-{BROKEN_PRODUCT_ID}_" in broken_url
+    assert products[1].upc == ""
+
+    state = CrawlStateIndex(state_path)
+    try:
+        assert state.get(broken_url) is None
+        assert all(state.get(product.link) is not None for product in products if product.link != broken_url)
+    finally:
+        state.close()